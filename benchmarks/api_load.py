@@ -0,0 +1,402 @@
+# api_load.py - FastAPI 서버 부하 테스트 (대시보드 폴링 API 처리량/지연 측정)
+#
+# 사용법:
+#   python benchmarks/api_load.py                      # 모든 시나리오
+#   python benchmarks/api_load.py --scenario active    # 실행 중인 RPA가 있을 때
+#   python benchmarks/api_load.py --scenario stop      # 중단 요청 처리 중
+#   python benchmarks/api_load.py --scenario reload    # 마스터 데이터 재로드 중
+#   python benchmarks/api_load.py --concurrency 32 --endpoints status,history --duration 20
+#   python benchmarks/api_load.py --json --output baseline.json          # 기준값 저장
+#   python benchmarks/api_load.py --baseline baseline.json --max-regression 0.25   # p95가 25% 넘게 느려지면 종료 코드 1
+#
+# 동시 클라이언트들이 ENDPOINTS(/api/status, /api/history, /api/channels/search, /api/excel-data, /api/config)를
+# 번갈아 요청하며, 시나리오별로 전체/엔드포인트별 처리량과 p50/p95/p99 지연을 보고합니다.
+# 서버는 임시 작업 폴더에 복사한 프로젝트에서 별도 uvicorn 프로세스로 실행됩니다.
+# (실제 설정/업로드/로그 파일을 건드리지 않음)
+import os
+import sys
+import json
+import math
+import time
+import shutil
+import socket
+import argparse
+import tempfile
+import threading
+import subprocess
+import http.client
+import urllib.parse
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# 부하 대상 엔드포인트 (대시보드가 폴링하는 조회 API)
+ENDPOINTS = {
+    "status": "/api/status",
+    "history": "/api/history",
+    "channels_search": "/api/channels/search?q={query}",
+    "excel_data": "/api/excel-data",
+    "config": "/api/config",
+}
+# 채널 검색어 (요청마다 번갈아 사용, 빈 문자열은 전체 목록)
+CHANNEL_QUERIES = ["", "a", "투어", "호텔", "net"]
+SCENARIOS = ["idle", "active", "stop", "reload"]
+
+# 실행 중/중단 시나리오용 RPA 워커 대체 스크립트: 주문 1건에 3초가 걸리는 것처럼 동작하며 주문 사이에서 중단 요청 파일 확인
+SLOW_STOP_WORKER_SCRIPT = '''# 부하 테스트용 RPA 워커 대체 스크립트 (협조적 중단)
+import os
+import sys
+import json
+import time
+
+line = sys.stdin.readline()
+if not line.strip():
+    sys.exit(0)
+stop_file = json.loads(line).get("env", {}).get("STOP_FILE_PATH")
+for _ in range(20):
+    if stop_file and os.path.exists(stop_file):
+        sys.exit(3)
+    time.sleep(3)
+'''
+
+
+def percentile(values, pct):
+    """nearest-rank 백분위수 (순위 = ceil(pct/100 × n))"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, math.ceil(pct / 100.0 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def find_free_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def write_order_sheet(path, order_count, first_order=100000):
+    """주문 시트 생성 (1행 제목, 2행 빈행, 3행 컬럼명, 4행부터 주문번호/확정번호)"""
+    import openpyxl
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.title = "list"
+    sheet.append(["확정번호 업로드"])
+    sheet.append([])
+    sheet.append(["주문번호", "확정번호"])
+    for i in range(order_count):
+        sheet.append([str(first_order + i), f"CF{first_order + i}"])
+    workbook.save(path)
+    return path
+
+
+def prepare_workspace(worker_script=None):
+    """프로젝트를 임시 폴더에 복사하고 예제 설정으로 설정 파일 생성"""
+    workspace = Path(tempfile.mkdtemp(prefix="admin_confirm_load_"))
+    ignore = shutil.ignore_patterns("uploads", "logs", "results", "temp_configs", "__pycache__", ".git", "*.lock")
+    shutil.copytree(PROJECT_ROOT, workspace, dirs_exist_ok=True, ignore=ignore)
+    shutil.copy(PROJECT_ROOT / "admin_confirm_config.example.json", workspace / "admin_confirm_config.json")
+    write_order_sheet(workspace / "uploads" / "order_confirmnum_list.xlsx", 20)
+    if worker_script is not None:
+        (workspace / "rpa" / "worker.py").write_text(worker_script, encoding="utf-8")
+    return workspace
+
+
+class ServerProcess:
+    """임시 작업 폴더에서 uvicorn 서버 실행"""
+
+    def __init__(self, workspace, port):
+        self.workspace = workspace
+        self.port = port
+        self.process = None
+
+    def __enter__(self):
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(self.port), "--log-level", "warning"],
+            cwd=str(self.workspace),
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+        deadline = time.time() + 30
+        while time.time() < deadline:
+            try:
+                status, _ = request(self.port, "GET", "/api/health")
+                if status == 200:
+                    return self
+            except OSError:
+                time.sleep(0.2)
+        raise RuntimeError("서버가 30초 안에 시작되지 않았습니다")
+
+    def __exit__(self, *exc):
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+
+
+def request(port, method, path, body=None, timeout=60):
+    """단일 HTTP 요청 (상태 코드, 응답 JSON 반환)"""
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=timeout)
+    try:
+        headers = {"Content-Type": "application/json"} if body is not None else {}
+        conn.request(method, path, body=json.dumps(body) if body is not None else None, headers=headers)
+        response = conn.getresponse()
+        data = response.read()
+        return response.status, json.loads(data) if data else None
+    finally:
+        conn.close()
+
+
+def endpoint_paths(name):
+    """엔드포인트 이름 → 요청 경로 목록 (채널 검색은 검색어별 경로)"""
+    template = ENDPOINTS[name]
+    if "{query}" not in template:
+        return [template]
+    return [template.format(query=urllib.parse.quote(query)) for query in CHANNEL_QUERIES]
+
+
+def poll_latency(port, endpoints, offset, stop_event, latencies, errors):
+    """stop_event가 설정될 때까지 keep-alive 연결로 엔드포인트를 번갈아 요청하며 엔드포인트별 지연 시간(초) 기록"""
+    paths = {name: endpoint_paths(name) for name in endpoints}
+    index = offset
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+    while not stop_event.is_set():
+        name = endpoints[index % len(endpoints)]
+        path = paths[name][(index // len(endpoints)) % len(paths[name])]
+        index += 1
+        started = time.perf_counter()
+        try:
+            conn.request("GET", path)
+            response = conn.getresponse()
+            response.read()
+            if response.status >= 400:
+                errors[name].append(response.status)
+            else:
+                latencies[name].append(time.perf_counter() - started)
+        except Exception:
+            errors[name].append(1)
+            conn.close()
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+    conn.close()
+
+
+def latency_stats(latencies, error_count, elapsed):
+    return {
+        "requests": len(latencies),
+        "errors": error_count,
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "max_ms": round(max(latencies) * 1000, 2) if latencies else 0.0
+    }
+
+
+def measure_during(port, endpoints, concurrency, background):
+    """background()가 실행되는 동안 엔드포인트별 지연 시간 측정 (클라이언트마다 시작 엔드포인트를 달리하여 고르게 섞음)"""
+    latencies = {name: [] for name in endpoints}
+    errors = {name: [] for name in endpoints}
+    stop_event = threading.Event()
+    pollers = [
+        threading.Thread(target=poll_latency, args=(port, endpoints, i, stop_event, latencies, errors), daemon=True)
+        for i in range(concurrency)
+    ]
+    started = time.perf_counter()
+    for poller in pollers:
+        poller.start()
+    try:
+        background()
+    finally:
+        stop_event.set()
+        for poller in pollers:
+            poller.join()
+    elapsed = time.perf_counter() - started
+
+    all_latencies = [value for name in endpoints for value in latencies[name]]
+    report = latency_stats(all_latencies, sum(len(errors[name]) for name in endpoints), elapsed)
+    report["seconds"] = round(elapsed, 2)
+    report["endpoints"] = {name: latency_stats(latencies[name], len(errors[name]), elapsed) for name in endpoints}
+    return report
+
+
+def start_run(port):
+    """실행 시작 (워커는 SLOW_STOP_WORKER_SCRIPT로 대체됨)"""
+    _, result = request(port, "POST", "/api/start", body={})
+    if not result or not result.get("success"):
+        raise RuntimeError(f"실행 시작 실패: {result}")
+
+
+def wait_stopped(port, timeout=30):
+    """/api/status가 stopped(또는 실행 없음)가 될 때까지 대기"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        _, status = request(port, "GET", "/api/status")
+        if not status.get("status") or status["status"]["status"] == "stopped":
+            return True
+        time.sleep(0.2)
+    return False
+
+
+def scenario_idle(port, args):
+    """기준선: 다른 작업 없이 폴링"""
+    return measure_during(port, args.endpoints, args.concurrency, lambda: time.sleep(args.duration))
+
+
+def scenario_active(port, args):
+    """RPA 실행이 진행 중인 동안 폴링 (모니터링 스레드, 상태 계산 포함)"""
+    start_run(port)
+    time.sleep(1)
+    try:
+        report = measure_during(port, args.endpoints, args.concurrency, lambda: time.sleep(args.duration))
+        _, status = request(port, "GET", "/api/status")
+        report["run_status"] = (status.get("status") or {}).get("status")
+    finally:
+        request(port, "POST", "/api/stop")
+        wait_stopped(port)
+    return report
+
+
+def scenario_stop(port, args):
+    """실행 중단 요청 후 RPA가 처리 중인 주문을 마치고 종료할 때까지 폴링"""
+    start_run(port)
+    time.sleep(1)
+
+    stop_result = {}
+
+    def stop():
+        started = time.perf_counter()
+        _, stop_result["response"] = request(port, "POST", "/api/stop")
+        stop_result["seconds"] = round(time.perf_counter() - started, 2)
+        # 중단 완료(stopped) 확인까지 대기
+        wait_stopped(port)
+        stop_result["confirm_seconds"] = round(time.perf_counter() - started, 2)
+
+    report = measure_during(port, args.endpoints, args.concurrency, stop)
+    report["stop_request_seconds"] = stop_result.get("seconds")
+    report["stop_confirm_seconds"] = stop_result.get("confirm_seconds")
+    return report
+
+
+def scenario_reload(port, args, workspace):
+    """master_data.xlsx 변경(재로드 유발)과 /api/excel-data 요청이 반복되는 동안 폴링"""
+    master_data = workspace / "data" / "master_data.xlsx"
+    reload_count = [0]
+
+    def reload_loop():
+        deadline = time.time() + args.duration
+        while time.time() < deadline:
+            now = time.time()
+            os.utime(master_data, (now, now))
+            request(port, "GET", "/api/excel-data")
+            reload_count[0] += 1
+
+    report = measure_during(port, args.endpoints, args.concurrency, reload_loop)
+    report["master_data_reloads"] = reload_count[0]
+    return report
+
+
+def find_regressions(results, baseline, max_regression):
+    """기준값 대비 p95 지연이 max_regression 비율보다 더 늘어난 시나리오/엔드포인트 목록"""
+    regressions = []
+    for scenario, report in results.items():
+        base_report = baseline.get(scenario)
+        if not base_report:
+            continue
+        pairs = [("전체", report, base_report)] + [
+            (name, stats, base_report.get("endpoints", {}).get(name))
+            for name, stats in report.get("endpoints", {}).items()
+        ]
+        for name, current, base in pairs:
+            if not base or not base.get("p95_ms"):
+                continue
+            ratio = current["p95_ms"] / base["p95_ms"] - 1
+            if ratio > max_regression:
+                regressions.append({"scenario": scenario, "endpoint": name, "baseline_p95_ms": base["p95_ms"],
+                                    "p95_ms": current["p95_ms"], "increase": round(ratio, 3)})
+    return regressions
+
+
+def print_report(name, report):
+    print(f"[{name}] {report['requests']}건 ({report['throughput_rps']} req/s), "
+          f"p50 {report['p50_ms']}ms / p95 {report['p95_ms']}ms / p99 {report['p99_ms']}ms / max {report['max_ms']}ms, "
+          f"오류 {report['errors']}건")
+    for endpoint, stats in report["endpoints"].items():
+        print(f"    {endpoint:<16} {stats['requests']:>6}건 {stats['throughput_rps']:>8} req/s  "
+              f"p50 {stats['p50_ms']}ms / p95 {stats['p95_ms']}ms / p99 {stats['p99_ms']}ms, 오류 {stats['errors']}건")
+    for extra in ("run_status", "stop_request_seconds", "stop_confirm_seconds", "master_data_reloads"):
+        if extra in report:
+            print(f"    {extra}: {report[extra]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="예약확정처리 서버 부하 테스트")
+    parser.add_argument("--scenario", choices=SCENARIOS + ["all"], default="all")
+    parser.add_argument("--concurrency", type=int, default=8, help="동시 폴링 클라이언트 수")
+    parser.add_argument("--duration", type=float, default=10, help="idle/active/reload 시나리오 측정 시간(초)")
+    parser.add_argument("--endpoints", default=",".join(ENDPOINTS), help=f"요청할 엔드포인트 (쉼표 구분: {', '.join(ENDPOINTS)})")
+    parser.add_argument("--baseline", default=None, help="비교할 기준 결과 JSON (--json 출력)")
+    parser.add_argument("--max-regression", type=float, default=0.25, help="허용하는 p95 지연 증가 비율 (기본 0.25 = 25%%)")
+    parser.add_argument("--output", default=None, help="결과 JSON 저장 경로")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args()
+
+    args.endpoints = [name.strip() for name in args.endpoints.split(",") if name.strip()]
+    unknown = [name for name in args.endpoints if name not in ENDPOINTS]
+    if unknown or not args.endpoints:
+        parser.error(f"알 수 없는 엔드포인트: {', '.join(unknown) or '(없음)'}")
+
+    scenarios = SCENARIOS if args.scenario == "all" else [args.scenario]
+    results = {}
+
+    for name in scenarios:
+        workspace = prepare_workspace(SLOW_STOP_WORKER_SCRIPT if name in ("active", "stop") else None)
+        port = find_free_port()
+        try:
+            with ServerProcess(workspace, port):
+                if name == "idle":
+                    results[name] = scenario_idle(port, args)
+                elif name == "active":
+                    results[name] = scenario_active(port, args)
+                elif name == "stop":
+                    results[name] = scenario_stop(port, args)
+                else:
+                    results[name] = scenario_reload(port, args, workspace)
+        finally:
+            shutil.rmtree(workspace, ignore_errors=True)
+
+        if not args.json:
+            print_report(name, results[name])
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = find_regressions(results, baseline.get("results", baseline), args.max_regression)
+
+    output = {
+        "settings": {"concurrency": args.concurrency, "duration": args.duration, "endpoints": args.endpoints},
+        "results": results
+    }
+    if args.baseline:
+        output["regressions"] = regressions
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(output, f, ensure_ascii=False, indent=2)
+
+    if args.json:
+        print(json.dumps(output, ensure_ascii=False, indent=2))
+    elif args.baseline:
+        if regressions:
+            print(f"⚠️ p95 지연이 기준값보다 {args.max_regression:.0%} 넘게 늘어난 항목 {len(regressions)}개:")
+            for item in regressions:
+                print(f"    [{item['scenario']}] {item['endpoint']}: {item['baseline_p95_ms']}ms → {item['p95_ms']}ms (+{item['increase']:.0%})")
+        else:
+            print(f"기준값 대비 p95 지연 증가가 {args.max_regression:.0%} 이내입니다.")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,176 @@
+# distributed_run.py - 분산 실행(리스 큐 + 워커 에이전트)과 단일 실행의 처리량/결과 비교
+#
+# 사용법:
+#   python benchmarks/distributed_run.py --orders 40 --agents 2
+#   python benchmarks/distributed_run.py --orders 100 --agents 4 --batch-size 10 --latency-ms 200
+#
+# 1. mock_admin_site.py 서버와 임시 작업 폴더의 코디네이터 서버(uvicorn)를 실행합니다.
+# 2. 단일 실행: 같은 주문 시트를 AdminConfirmEngine 1개로 처리합니다 (기준값).
+# 3. 분산 실행: Mock을 초기화하고 /api/distributed/runs로 실행을 등록한 뒤 에이전트 N개(python -m rpa.agent)를 실행합니다.
+# 결과: 두 방식의 처리 시간/분당 처리 주문 수, 주문별 (상태 결과, LMS 결과) 일치 여부, 분산 실행 배치 상태
+# Chrome 브라우저가 필요합니다.
+import sys
+import json
+import time
+import shutil
+import argparse
+import subprocess
+from collections import Counter
+from pathlib import Path
+
+from api_load import PROJECT_ROOT, ServerProcess, find_free_port, prepare_workspace, request, write_order_sheet
+from e2e_benchmark import MockSiteProcess, build_config
+
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from rpa.engine import AdminConfirmEngine  # noqa: E402
+from services.run_plan import DEFAULT_STATUS_MAPPING, compile_run_plan  # noqa: E402
+from services.upload_manager import parse_order_sheet  # noqa: E402
+
+
+def read_result_map(result_file):
+    """결과 파일에서 주문번호 → (상태 결과, LMS 결과)"""
+    results = {}
+    if result_file and Path(result_file).exists():
+        with open(result_file, "r", encoding="utf-8") as f:
+            for line in f:
+                parts = line.rstrip("\n").split("\t")
+                if len(parts) >= 4:
+                    results[parts[0]] = (parts[2], parts[3])
+    return results
+
+
+def run_single(mock_port, workspace, args):
+    """단일 엔진으로 전체 파이프라인 실행 (기준값)"""
+    request(mock_port, "POST", "/mock/reset")
+    (workspace / "single").mkdir(parents=True, exist_ok=True)
+    config = build_config(mock_port, workspace / "single", args)
+    shutil.copy(workspace / "uploads" / "order_confirmnum_list.xlsx", config["file_paths"]["excel_file"])
+    plan = compile_run_plan(config, "single", dict(DEFAULT_STATUS_MAPPING), parse_order_sheet(config["file_paths"]["excel_file"]))
+
+    engine = AdminConfirmEngine(config, plan, execution_id="single", execution_mode="benchmark")
+    started = time.perf_counter()
+    exit_code = engine.run()
+    return {
+        "exit_code": exit_code,
+        "seconds": round(time.perf_counter() - started, 2),
+        "results": read_result_map(engine.result_file)
+    }
+
+
+def run_distributed(server_port, mock_port, workspace, args):
+    """코디네이터에 분산 실행을 등록하고 에이전트 N개로 처리"""
+    request(mock_port, "POST", "/mock/reset")
+    _, response = request(server_port, "POST", "/api/distributed/runs",
+                          {"config": {}, "batch_size": args.batch_size, "lease_seconds": args.lease_seconds})
+    if not response["success"]:
+        raise RuntimeError(f"분산 실행 생성 실패: {response['error']}")
+    run_id = response["run"]["run_id"]
+
+    started = time.perf_counter()
+    agents = [
+        subprocess.Popen(
+            [sys.executable, "-m", "rpa.agent", "--server", f"http://127.0.0.1:{server_port}",
+             "--agent-id", f"agent-{i + 1}", "--poll-interval", "1", "--exit-when-idle"] +
+            ([] if args.show_browser else ["--headless"]),
+            cwd=str(workspace),
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+        for i in range(args.agents)
+    ]
+    exit_codes = [agent.wait() for agent in agents]
+    seconds = time.perf_counter() - started
+
+    _, response = request(server_port, "GET", f"/api/distributed/runs/{run_id}?include_results=true")
+    run = response["run"]
+    return {
+        "agent_exit_codes": exit_codes,
+        "status": run["status"],
+        "seconds": round(seconds, 2),
+        "batches": run["batches"],
+        "results": {item["order_number"]: (item["status_result"], item["lms_result"]) for item in run["results"]},
+        "result_file": run["result_file"]
+    }
+
+
+def compare(single, distributed):
+    """주문별 결과 비교 (Mock의 실패 주입이 없으면 모두 일치해야 함)"""
+    mismatches = {}
+    for order_number in sorted(set(single) | set(distributed)):
+        if single.get(order_number) != distributed.get(order_number):
+            mismatches[order_number] = {"single": single.get(order_number), "distributed": distributed.get(order_number)}
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="분산 실행 처리량/결과 비교")
+    parser.add_argument("--orders", type=int, default=40, help="주문 수")
+    parser.add_argument("--agents", type=int, default=2, help="에이전트 수")
+    parser.add_argument("--batch-size", type=int, default=10, help="배치당 주문 수")
+    parser.add_argument("--lease-seconds", type=float, default=60, help="리스 유지 시간 (초)")
+    parser.add_argument("--latency-ms", type=float, default=50, help="Mock 화면 요청 지연 (밀리초)")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="지연 무작위 편차 (밀리초)")
+    parser.add_argument("--failure-rate", type=float, default=0, help="500 오류 응답 확률 (0~1)")
+    parser.add_argument("--missing-rate", type=float, default=0, help="검색 결과 누락 확률 (0~1)")
+    parser.add_argument("--seed", type=int, default=None, help="실패 주입 난수 시드")
+    parser.add_argument("--wait", type=float, default=None, help="타이밍 설정(초)을 모두 이 값으로 변경 (기본: 예제 설정값)")
+    parser.add_argument("--show-browser", action="store_true", help="headless 대신 브라우저 화면 표시")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args()
+
+    mock_port = find_free_port()
+    server_port = find_free_port()
+    workspace = prepare_workspace()
+    try:
+        # 코디네이터 설정: Mock 서버 대상, 주문 시트는 작업 폴더의 uploads에 생성
+        config = build_config(mock_port, workspace, args)
+        config["file_paths"]["excel_file"] = str(workspace / "uploads" / "order_confirmnum_list.xlsx")
+        write_order_sheet(Path(config["file_paths"]["excel_file"]), args.orders)
+        with open(workspace / "admin_confirm_config.json", "w", encoding="utf-8") as f:
+            json.dump(config, f, ensure_ascii=False, indent=2)
+
+        with MockSiteProcess(mock_port, args), ServerProcess(workspace, server_port):
+            single = run_single(mock_port, workspace, args)
+            distributed = run_distributed(server_port, mock_port, workspace, args)
+
+        mismatches = compare(single["results"], distributed["results"])
+        report = {
+            "orders": args.orders,
+            "agents": args.agents,
+            "single": {
+                "exit_code": single["exit_code"],
+                "seconds": single["seconds"],
+                "orders_per_minute": round(args.orders / single["seconds"] * 60, 2) if single["seconds"] else 0.0,
+                "outcomes": dict(Counter(f"{s}/{l}" for s, l in single["results"].values()))
+            },
+            "distributed": {
+                "status": distributed["status"],
+                "agent_exit_codes": distributed["agent_exit_codes"],
+                "seconds": distributed["seconds"],
+                "orders_per_minute": round(args.orders / distributed["seconds"] * 60, 2) if distributed["seconds"] else 0.0,
+                "batches": distributed["batches"],
+                "outcomes": dict(Counter(f"{s}/{l}" for s, l in distributed["results"].values()))
+            },
+            "mismatches": mismatches
+        }
+    finally:
+        shutil.rmtree(workspace, ignore_errors=True)
+
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        return
+
+    print(f"주문 {report['orders']}건, 에이전트 {report['agents']}개")
+    for name in ("single", "distributed"):
+        r = report[name]
+        print(f"  [{name}] {r['seconds']}초 → {r['orders_per_minute']}건/분, 결과 {r['outcomes']}")
+    print(f"  분산 실행 상태: {report['distributed']['status']}, 배치 {report['distributed']['batches']}, "
+          f"에이전트 종료코드 {report['distributed']['agent_exit_codes']}")
+    print(f"  결과 불일치: {len(mismatches)}건")
+    for order_number, diff in list(mismatches.items())[:10]:
+        print(f"    {order_number}: 단일 {diff['single']} / 분산 {diff['distributed']}")
+
+
+if __name__ == "__main__":
+    main()
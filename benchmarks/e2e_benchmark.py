@@ -0,0 +1,264 @@
+# e2e_benchmark.py - 로컬 관리자 사이트 Mock을 대상으로 실제 RPA 파이프라인 처리량 측정
+#
+# 사용법:
+#   python benchmarks/e2e_benchmark.py --sizes 5,20,50
+#   python benchmarks/e2e_benchmark.py --sizes 20 --latency-ms 200 --jitter-ms 100 --failure-rate 0.05
+#   python benchmarks/e2e_benchmark.py --sizes 5 --show-browser     # 브라우저 화면 표시
+#
+# 시트 크기별로 주문 시트를 만들고, mock_admin_site.py 서버를 대상으로 AdminConfirmEngine을 그대로 실행합니다.
+# (로그인 → 엑셀 업로드 → 주문별 검색/상태 변경/LMS 전송)
+# 결과: 분당 처리 주문 수, 단계별 지연(p50/p95/p99/max), 처리 결과 분포, Mock 서버 처리 건수
+# Chrome 브라우저가 필요합니다. 로그/결과 파일/결과 DB/업로드 기록은 임시 폴더에 기록되어 실제 폴더에 영향을 주지 않습니다.
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+
+from api_load import PROJECT_ROOT, find_free_port, percentile, request, write_order_sheet
+
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from rpa.engine import AdminConfirmEngine  # noqa: E402
+from services.result_store import RESULT_DB_NAME, ResultStore  # noqa: E402
+from services.run_plan import DEFAULT_STATUS_MAPPING, compile_run_plan  # noqa: E402
+from services.upload_manager import parse_order_sheet  # noqa: E402
+
+# 단계 이름 (change_status는 상세페이지 열기~상태 변경, 내부에서 호출하는 LMS 전송 시간은 제외)
+STAGES = ["login", "upload", "search", "change_status", "lms", "order_total"]
+
+
+class StageRecorder:
+    """단계별 소요 시간(초) 기록"""
+
+    def __init__(self):
+        self.durations = defaultdict(list)
+        self._nested = []
+
+    @contextmanager
+    def span(self, stage):
+        started = time.perf_counter()
+        self._nested.append(0.0)
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            nested = self._nested.pop()
+            self.durations[stage].append(elapsed - nested)
+            if self._nested:
+                self._nested[-1] += elapsed
+
+    def summary(self, stage):
+        values = self.durations.get(stage, [])
+        return {
+            "count": len(values),
+            "p50_ms": round(percentile(values, 50) * 1000, 1),
+            "p95_ms": round(percentile(values, 95) * 1000, 1),
+            "p99_ms": round(percentile(values, 99) * 1000, 1),
+            "max_ms": round(max(values) * 1000, 1) if values else 0.0
+        }
+
+
+class TimedEngine(AdminConfirmEngine):
+    """단계별 시간을 기록하는 AdminConfirmEngine (처리 로직은 그대로 사용)"""
+
+    def __init__(self, *args, recorder=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.recorder = recorder
+        self.process_seconds = 0.0
+
+    def prepare_output(self):
+        super().prepare_output()
+        # ADMIN_CONFIRM_RESULT_DB가 설정되어 있어도 운영 결과 DB 대신 임시 결과 디렉토리의 DB에 기록
+        self.result_store = ResultStore(Path(self.result_dir) / RESULT_DB_NAME)
+
+    def login(self):
+        with self.recorder.span("login"):
+            return super().login()
+
+    def upload_excel_file(self):
+        with self.recorder.span("upload"):
+            return super().upload_excel_file()
+
+    def search_order_by_number(self, order_number, search_status=None):
+        # 주문 전체 시간은 검색부터 상태 변경/LMS 전송까지 (검색 실패 시 검색까지)
+        self._order_started = time.perf_counter()
+        with self.recorder.span("search"):
+            found = super().search_order_by_number(order_number, search_status=search_status)
+        if not found:
+            self.recorder.durations["order_total"].append(time.perf_counter() - self._order_started)
+        return found
+
+    def change_reservation_status(self, order_number):
+        with self.recorder.span("change_status"):
+            result = super().change_reservation_status(order_number)
+        self.recorder.durations["order_total"].append(time.perf_counter() - self._order_started)
+        return result
+
+    def send_lms_from_order_list(self, order_number=None):
+        with self.recorder.span("lms"):
+            return super().send_lms_from_order_list(order_number)
+
+    def process_confirm_numbers(self):
+        started = time.perf_counter()
+        try:
+            return super().process_confirm_numbers()
+        finally:
+            self.process_seconds = time.perf_counter() - started
+
+
+class MockSiteProcess:
+    """mock_admin_site.py 서버 실행"""
+
+    def __init__(self, port, args):
+        self.port = port
+        self.args = args
+        self.process = None
+
+    def __enter__(self):
+        self.process = subprocess.Popen(
+            [sys.executable, str(Path(__file__).parent / "mock_admin_site.py"),
+             "--port", str(self.port),
+             "--latency-ms", str(self.args.latency_ms),
+             "--jitter-ms", str(self.args.jitter_ms),
+             "--failure-rate", str(self.args.failure_rate),
+             "--missing-rate", str(self.args.missing_rate),
+             "--session-ttl", str(getattr(self.args, "session_ttl", 0))] +
+            (["--seed", str(self.args.seed)] if self.args.seed is not None else []),
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+        deadline = time.time() + 30
+        while time.time() < deadline:
+            try:
+                status, _ = request(self.port, "GET", "/mock/stats")
+                if status == 200:
+                    return self
+            except OSError:
+                time.sleep(0.2)
+        raise RuntimeError("Mock 서버가 30초 안에 시작되지 않았습니다")
+
+    def __exit__(self, *exc):
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+
+
+def build_config(port, workspace, args):
+    """예제 설정을 기반으로 Mock 서버를 대상으로 하는 런타임 설정 생성"""
+    with open(PROJECT_ROOT / "admin_confirm_config.example.json", "r", encoding="utf-8") as f:
+        config = json.load(f)
+
+    site_url = f"http://127.0.0.1:{port}"
+    config["login"].update({"url": site_url, "user_id": "benchmark", "password": "benchmark"})
+    config["urls"]["base_url"] = site_url  # 포트 유지 (login.url 기반 자동 동기화는 포트를 제거함)
+    config["file_paths"] = {
+        "excel_file": str(workspace / "order_confirmnum_list.xlsx"),
+        "log_directory": str(workspace / "logs"),
+        "result_directory": str(workspace / "results")
+    }
+    config["browser"] = {"headless": not args.show_browser, "tabs": args.tabs}
+    if args.wait is not None:
+        config["timing"] = {name: args.wait for name in ("page_load_wait", "upload_wait", "detail_page_wait", "refresh_wait", "lms_popup_wait")}
+    return config
+
+
+def read_outcomes(result_file):
+    """결과 파일(주문번호, 확정번호, 상태결과, LMS결과, 시간)에서 처리 결과 분포 집계"""
+    outcomes = Counter()
+    if result_file and Path(result_file).exists():
+        with open(result_file, "r", encoding="utf-8") as f:
+            for line in f:
+                parts = line.rstrip("\n").split("\t")
+                if len(parts) >= 4:
+                    outcomes[f"{parts[2]}/{parts[3]}"] += 1
+    return dict(outcomes)
+
+
+def run_size(port, size, args):
+    """주문 size건 시트로 전체 파이프라인 1회 실행"""
+    request(port, "POST", "/mock/reset")
+    workspace = Path(tempfile.mkdtemp(prefix="admin_confirm_e2e_"))
+    try:
+        config = build_config(port, workspace, args)
+        write_order_sheet(Path(config["file_paths"]["excel_file"]), size)
+        plan = compile_run_plan(config, f"e2e_{size}", dict(DEFAULT_STATUS_MAPPING),
+                                parse_order_sheet(config["file_paths"]["excel_file"]))
+
+        recorder = StageRecorder()
+        engine = TimedEngine(config, plan, execution_id=f"e2e_{size}", execution_mode="benchmark", recorder=recorder)
+        started = time.perf_counter()
+        exit_code = engine.run()
+        total_seconds = time.perf_counter() - started
+
+        _, mock = request(port, "GET", "/mock/stats")
+        orders = len(plan["orders"])
+        return {
+            "orders": orders,
+            "exit_code": exit_code,
+            "total_seconds": round(total_seconds, 2),
+            "process_seconds": round(engine.process_seconds, 2),
+            "orders_per_minute": round(orders / engine.process_seconds * 60, 2) if engine.process_seconds else 0.0,
+            "stages": {stage: recorder.summary(stage) for stage in STAGES},
+            "spans": engine.metrics.summary(),  # 엔진 계측 (선택자 fallback별 span 포함)
+            "events": engine.metrics.snapshot()["counters"],
+            "outcomes": read_outcomes(engine.result_file),
+            "mock_stats": mock["stats"]
+        }
+    finally:
+        shutil.rmtree(workspace, ignore_errors=True)
+
+
+def print_report(size, report):
+    print(f"\n[{size}건] 종료코드 {report['exit_code']}, 전체 {report['total_seconds']}초, "
+          f"주문 처리 {report['process_seconds']}초 → {report['orders_per_minute']}건/분")
+    for stage in STAGES:
+        s = report["stages"][stage]
+        if s["count"]:
+            print(f"    {stage:<14} {s['count']:>4}회  p50 {s['p50_ms']}ms / p95 {s['p95_ms']}ms / "
+                  f"p99 {s['p99_ms']}ms / max {s['max_ms']}ms")
+    print(f"    결과: {report['outcomes']}")
+    if report["events"]:
+        print(f"    이벤트: {report['events']}")
+    stats = report["mock_stats"]
+    print(f"    Mock: 상태변경 {stats['status_changes']}건, LMS {stats['lms_sent']}건, "
+          f"주입 실패 {stats['injected_failures']}건, 검색 누락 {stats['injected_missing']}건")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="관리자 사이트 Mock 대상 E2E 벤치마크")
+    parser.add_argument("--sizes", default="5,20", help="시트 크기 목록 (쉼표 구분)")
+    parser.add_argument("--latency-ms", type=float, default=50, help="Mock 화면 요청 지연 (밀리초)")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="지연 무작위 편차 (밀리초)")
+    parser.add_argument("--failure-rate", type=float, default=0, help="500 오류 응답 확률 (0~1)")
+    parser.add_argument("--missing-rate", type=float, default=0, help="검색 결과 누락 확률 (0~1)")
+    parser.add_argument("--seed", type=int, default=None, help="실패 주입 난수 시드")
+    parser.add_argument("--session-ttl", type=float, default=0, help="Mock 로그인 세션 유지 시간 (초, 재로그인 확인용, 0이면 만료 없음)")
+    parser.add_argument("--wait", type=float, default=None, help="타이밍 설정(초)을 모두 이 값으로 변경 (기본: 예제 설정값)")
+    parser.add_argument("--tabs", type=int, default=1, help="한 브라우저에서 동시에 처리할 탭 수 (browser.tabs)")
+    parser.add_argument("--show-browser", action="store_true", help="headless 대신 브라우저 화면 표시")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    port = find_free_port()
+    results = {}
+    with MockSiteProcess(port, args):
+        for size in sizes:
+            results[str(size)] = run_size(port, size, args)
+            if not args.json:
+                print_report(size, results[str(size)])
+
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,324 @@
+# mock_admin_site.py - 관리자 사이트(adm.allmytour.com) 로컬 대체 서버
+#
+# 사용법:
+#   python benchmarks/mock_admin_site.py --port 8101 --latency-ms 150 --failure-rate 0.05
+#
+# RPA가 사용하는 화면만 구현합니다.
+#   GET  /                               로그인 폼 (userId, userPasswd, submit)
+#   GET  /orders                         예약목록/검색 (a.blue_link 주문번호 링크, send_lms 버튼)
+#   GET  /orders/uploadConfirmNumExcel   확정번호 엑셀 업로드 (#excelFile, "업로드" 버튼, 완료 알럿)
+#   GET  /orders/{order_number}          예약 상세 (#orderProductStatus 드롭다운)
+#   LMS 전송 버튼 클릭 시 알럿 2개 ("발송 요청 하시겠습니까?" → "발송 요청 하였습니다.")
+#
+# 벤치마크 제어용:
+#   GET  /mock/stats    처리 건수 (상태 변경, LMS 전송, 업로드, 주입된 실패)
+#   POST /mock/config   지연/실패 설정 변경 (latency_ms, jitter_ms, failure_rate, missing_rate)
+#   POST /mock/reset    주문 상태와 통계 초기화
+import time
+import random
+import asyncio
+import argparse
+import threading
+from html import escape
+from typing import Dict
+
+from fastapi import FastAPI, Request, Form, File, UploadFile
+from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse
+
+SESSION_COOKIE = "MOCK_ADMIN_SESSION"
+
+# 예약 상태 (영문 코드, 드롭다운 표시 텍스트)
+ORDER_STATUSES = [
+    ("pending", "대기"),
+    ("confirmWait", "확정 확인필요"),
+    ("confirmWip", "확정처리중"),
+    ("confirm", "확정"),
+    ("complete", "완료"),
+    ("cancelRequest", "취소요청"),
+    ("cancel", "취소"),
+]
+
+LMS_CONFIRM_MESSAGE = "구매확인 LMS 발송 요청 하시겠습니까?"
+LMS_DONE_MESSAGE = "구매확인 LMS 발송 요청 하였습니다."
+UPLOAD_DONE_MESSAGE = "확정번호 업로드가 완료되었습니다."
+
+app = FastAPI(title="관리자 사이트 Mock")
+
+settings = {
+    "latency_ms": 0.0,      # 모든 화면 요청에 추가할 지연 (밀리초)
+    "jitter_ms": 0.0,       # 지연에 더할 무작위 편차 (0 ~ jitter_ms)
+    "failure_rate": 0.0,    # 화면 요청을 500 오류 페이지로 응답할 확률
+    "missing_rate": 0.0,    # 검색 결과에서 주문을 누락시킬 확률
+    "initial_status": "pending",
+    "session_ttl_s": 0.0,   # 로그인 세션 유지 시간 (초, 0이면 만료 없음) - 지나면 로그인 페이지로 이동
+}
+
+_state_lock = threading.Lock()
+orders: Dict[str, Dict] = {}
+stats = {
+    "logins": 0,
+    "uploads": 0,
+    "searches": 0,
+    "detail_views": 0,
+    "status_changes": 0,
+    "lms_sent": 0,
+    "injected_failures": 0,
+    "injected_missing": 0,
+    "expired_sessions": 0,
+}
+
+
+def count(name: str, amount: int = 1):
+    with _state_lock:
+        stats[name] += amount
+
+
+def get_order(order_number: str) -> Dict:
+    """주문 조회 (처음 조회하는 주문번호는 초기 상태로 생성)"""
+    with _state_lock:
+        if order_number not in orders:
+            orders[order_number] = {"status": settings["initial_status"], "lms_count": 0}
+        return orders[order_number]
+
+
+def page(title: str, body: str, script: str = "") -> HTMLResponse:
+    return HTMLResponse(
+        f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>{escape(title)}</title></head>"
+        f"<body>{body}<script>{script}</script></body></html>"
+    )
+
+
+@app.middleware("http")
+async def inject_latency_and_failures(request: Request, call_next):
+    """화면 요청에 지연과 실패 주입 (/mock 제어 경로 제외)"""
+    if request.url.path.startswith("/mock"):
+        return await call_next(request)
+
+    delay = settings["latency_ms"] + random.uniform(0, settings["jitter_ms"])
+    if delay > 0:
+        await asyncio.sleep(delay / 1000.0)
+
+    if request.url.path.startswith("/orders") and random.random() < settings["failure_rate"]:
+        count("injected_failures")
+        return HTMLResponse("<html><head><title>500 Internal Server Error</title></head>"
+                            "<body><h1>일시적인 오류가 발생했습니다.</h1></body></html>", status_code=500)
+    return await call_next(request)
+
+
+def is_logged_in(request: Request) -> bool:
+    """세션 쿠키 확인 (session_ttl_s가 설정되면 쿠키 발급 시각 기준으로 만료)"""
+    session = request.cookies.get(SESSION_COOKIE)
+    if not session:
+        return False
+    if settings["session_ttl_s"] > 0:
+        try:
+            issued_at = float(session.rsplit("-", 1)[1])
+        except (IndexError, ValueError):
+            return False
+        if time.time() - issued_at > settings["session_ttl_s"]:
+            count("expired_sessions")
+            return False
+    return True
+
+
+def login_redirect() -> RedirectResponse:
+    return RedirectResponse("/", status_code=303)
+
+
+@app.get("/", response_class=HTMLResponse)
+async def login_page():
+    return page("관리자 로그인", """
+        <form method="post" action="/login">
+            <input type="text" name="userId">
+            <input type="password" name="userPasswd">
+            <input type="submit" value="로그인">
+        </form>
+    """)
+
+
+@app.post("/login")
+async def login(userId: str = Form(""), userPasswd: str = Form("")):
+    if not userId or not userPasswd:
+        return login_redirect()
+    count("logins")
+    response = RedirectResponse("/orders", status_code=303)
+    response.set_cookie(SESSION_COOKIE, f"{userId}-{time.time():.0f}")
+    return response
+
+
+def render_order_row(order_number: str, order: Dict) -> str:
+    """예약목록 행 (LMS를 보낸 적이 있으면 재전송 링크, 없으면 전송 버튼)"""
+    number = escape(order_number)
+    if order["lms_count"] > 0:
+        lms_button = f"<a class='send_lms' href='javascript:void(0)' onclick=\"sendLms('{number}')\">재전송</a>"
+    else:
+        lms_button = f"<input type='button' class='send_lms square_btn' value='LMS 전송' onclick=\"sendLms('{number}')\">"
+    status_text = dict(ORDER_STATUSES).get(order["status"], order["status"])
+    return (
+        f"<tr><td><div class='order_link'><a class='blue_link' href='/orders/{number}' target='_blank'>{number}</a></div></td>"
+        f"<td>{escape(status_text)}</td><td>{lms_button}</td></tr>"
+    )
+
+
+# LMS 전송: 확인 알럿 → 동기 요청 → 완료 알럿 (실제 사이트와 같이 알럿 2개)
+LMS_SCRIPT = f"""
+function sendLms(orderNumber) {{
+    if (!confirm({LMS_CONFIRM_MESSAGE!r})) return;
+    var xhr = new XMLHttpRequest();
+    xhr.open('POST', '/orders/' + orderNumber + '/lms', false);
+    xhr.send();
+    alert({LMS_DONE_MESSAGE!r});
+}}
+"""
+
+
+@app.get("/orders", response_class=HTMLResponse)
+async def order_list(request: Request, keyword: str = "", orderProductStatus: str = ""):
+    if not is_logged_in(request):
+        return login_redirect()
+
+    rows = []
+    if keyword:
+        count("searches")
+        if random.random() < settings["missing_rate"]:
+            count("injected_missing")
+        else:
+            order = get_order(keyword)
+            if not orderProductStatus or order["status"] == orderProductStatus:
+                rows.append(render_order_row(keyword, order))
+
+    body = (
+        "<h1>예약목록</h1>"
+        "<table class='order_list'><thead><tr><th>주문번호</th><th>상태</th><th>LMS</th></tr></thead>"
+        f"<tbody>{''.join(rows)}</tbody></table>"
+        + ("" if rows or not keyword else "<p class='no_data'>검색 결과가 없습니다.</p>")
+    )
+    return page("예약목록", body, LMS_SCRIPT)
+
+
+@app.get("/orders/uploadConfirmNumExcel", response_class=HTMLResponse)
+async def upload_page(request: Request):
+    if not is_logged_in(request):
+        return login_redirect()
+    return page("확정번호 업로드", """
+        <h1>확정번호 엑셀 업로드</h1>
+        <input type="file" id="excelFile" name="excelFile">
+        <button type="button" onclick="uploadExcel()">업로드</button>
+    """, f"""
+        function uploadExcel() {{
+            var data = new FormData();
+            data.append('excelFile', document.getElementById('excelFile').files[0]);
+            var xhr = new XMLHttpRequest();
+            xhr.open('POST', '/orders/uploadConfirmNumExcel', false);
+            xhr.send(data);
+            alert({UPLOAD_DONE_MESSAGE!r});
+        }}
+    """)
+
+
+@app.post("/orders/uploadConfirmNumExcel")
+async def upload_confirm_numbers(request: Request, excelFile: UploadFile = File(None)):
+    if not is_logged_in(request):
+        return JSONResponse({"success": False}, status_code=401)
+    size = len(await excelFile.read()) if excelFile is not None else 0
+    count("uploads")
+    return {"success": True, "size": size}
+
+
+@app.get("/orders/{order_number}", response_class=HTMLResponse)
+async def order_detail(request: Request, order_number: str):
+    if not is_logged_in(request):
+        return login_redirect()
+    count("detail_views")
+    order = get_order(order_number)
+    options = "".join(
+        f"<option value='{code}'{' selected' if code == order['status'] else ''}>{escape(text)}</option>"
+        for code, text in ORDER_STATUSES
+    )
+    number = escape(order_number)
+    return page(f"예약상세 {number}", f"""
+        <h1>예약상세 {number}</h1>
+        <select id="orderProductStatus" onchange="changeStatus(this.value)">{options}</select>
+    """, f"""
+        function changeStatus(status) {{
+            var xhr = new XMLHttpRequest();
+            xhr.open('POST', '/orders/{number}/status?status=' + encodeURIComponent(status), false);
+            xhr.send();
+        }}
+    """)
+
+
+@app.post("/orders/{order_number}/status")
+async def change_status(request: Request, order_number: str, status: str):
+    if not is_logged_in(request):
+        return JSONResponse({"success": False}, status_code=401)
+    order = get_order(order_number)
+    with _state_lock:
+        order["status"] = status
+    count("status_changes")
+    return {"success": True}
+
+
+@app.post("/orders/{order_number}/lms")
+async def send_lms(request: Request, order_number: str):
+    if not is_logged_in(request):
+        return JSONResponse({"success": False}, status_code=401)
+    order = get_order(order_number)
+    with _state_lock:
+        order["lms_count"] += 1
+    count("lms_sent")
+    return {"success": True}
+
+
+@app.get("/mock/stats")
+async def mock_stats():
+    with _state_lock:
+        return {"settings": dict(settings), "stats": dict(stats), "orders": len(orders)}
+
+
+@app.post("/mock/config")
+async def mock_config(request: Request):
+    update = await request.json()
+    for key, value in update.items():
+        if key in settings:
+            settings[key] = value if key == "initial_status" else float(value)
+    return {"success": True, "settings": dict(settings)}
+
+
+@app.post("/mock/reset")
+async def mock_reset():
+    with _state_lock:
+        orders.clear()
+        for key in stats:
+            stats[key] = 0
+    return {"success": True}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="관리자 사이트 Mock 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8101)
+    parser.add_argument("--latency-ms", type=float, default=0, help="화면 요청 지연 (밀리초)")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="지연 무작위 편차 (밀리초)")
+    parser.add_argument("--failure-rate", type=float, default=0, help="500 오류 응답 확률 (0~1)")
+    parser.add_argument("--missing-rate", type=float, default=0, help="검색 결과 누락 확률 (0~1)")
+    parser.add_argument("--seed", type=int, default=None, help="실패 주입 난수 시드")
+    parser.add_argument("--session-ttl", type=float, default=0, help="로그인 세션 유지 시간 (초, 0이면 만료 없음)")
+    args = parser.parse_args()
+
+    settings.update({
+        "latency_ms": args.latency_ms,
+        "jitter_ms": args.jitter_ms,
+        "failure_rate": args.failure_rate,
+        "missing_rate": args.missing_rate,
+        "session_ttl_s": args.session_ttl,
+    })
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    import uvicorn
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
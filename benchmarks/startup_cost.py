@@ -0,0 +1,92 @@
+# startup_cost.py - RPA 워커 시작 비용 측정 (cold start vs warm worker)
+#
+# 사용법:
+#   python benchmarks/startup_cost.py --repeat 5
+#
+# cold: 워커 프로세스 생성 직후 작업 전달 → 인터프리터 시작 + selenium/webdriver_manager/엔진 import 비용을 모두 기다림
+# warm: import가 끝난 워커에 작업 전달 → 작업 전달부터 엔진 진입까지의 시간만 측정
+# 작업은 존재하지 않는 설정 파일을 지정하여 엔진 진입 직후 종료되도록 합니다 (브라우저 실행 없음).
+import sys
+import json
+import time
+import argparse
+import tempfile
+import statistics
+import subprocess
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+
+def spawn_worker():
+    return subprocess.Popen(
+        [sys.executable, "-m", "rpa.worker"],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        text=True,
+        cwd=str(PROJECT_ROOT)
+    )
+
+
+def send_job(process, spawned_at, stats_path):
+    job = {
+        "env": {"CONFIG_FILE_PATH": str(Path(tempfile.gettempdir()) / "admin_confirm_missing_config.json")},
+        "stats_path": str(stats_path),
+        "spawned_at": spawned_at,
+        "sent_at": time.time()
+    }
+    process.stdin.write(json.dumps(job) + "\n")
+    process.stdin.close()
+
+
+def measure_cold(stats_path):
+    """생성 직후 작업 전달 → 종료까지 시간"""
+    started = time.perf_counter()
+    spawned_at = time.time()
+    process = spawn_worker()
+    send_job(process, spawned_at, stats_path)
+    process.wait()
+    return time.perf_counter() - started
+
+
+def measure_warm(stats_path, ready_wait):
+    """import 완료를 기다린 뒤 작업 전달 → 종료까지 시간"""
+    spawned_at = time.time()
+    process = spawn_worker()
+    time.sleep(ready_wait)
+    started = time.perf_counter()
+    send_job(process, spawned_at, stats_path)
+    process.wait()
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RPA 워커 시작 비용 측정")
+    parser.add_argument("--repeat", type=int, default=5, help="측정 반복 횟수")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        stats_path = Path(temp_dir) / "startup.json"
+
+        cold_times = [measure_cold(stats_path) for _ in range(args.repeat)]
+        cold_stats = json.loads(stats_path.read_text(encoding="utf-8"))
+
+        # 워커가 import를 끝낼 수 있도록 cold 시간의 2배만큼 대기 후 작업 전달
+        ready_wait = max(cold_times) * 2
+        warm_times = [measure_warm(stats_path, ready_wait) for _ in range(args.repeat)]
+        warm_stats = json.loads(stats_path.read_text(encoding="utf-8"))
+
+    cold_median = statistics.median(cold_times)
+    warm_median = statistics.median(warm_times)
+    print(f"cold start (생성→종료) 중앙값: {cold_median * 1000:.0f}ms")
+    print(f"warm worker (작업 전달→종료) 중앙값: {warm_median * 1000:.0f}ms")
+    print(f"실행당 절약 시간: {(cold_median - warm_median) * 1000:.0f}ms")
+    print(f"import 시간 (cold 마지막 측정): {cold_stats['import_seconds'] * 1000:.0f}ms")
+    for module_name, seconds in cold_stats["import_timings"].items():
+        print(f"    {module_name}: {seconds * 1000:.0f}ms")
+    print(f"warm worker 통계: mode={warm_stats['mode']}, 대기 {warm_stats['waited_seconds']}초, 절약 {warm_stats['saved_seconds']}초")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,16 @@
 # main.py - 예약확정처리 시스템 v2.0 메인 서버
 from fastapi import FastAPI, HTTPException, UploadFile, File
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, PlainTextResponse, StreamingResponse
+from starlette.background import BackgroundTask
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.concurrency import run_in_threadpool
 import uvicorn
 import os
 import json
 from pathlib import Path
 from datetime import datetime
+from urllib.parse import quote
 
 # FastAPI 앱 생성
 app = FastAPI(
@@ -32,11 +35,68 @@ UPLOAD_DIR.mkdir(exist_ok=True)
 # 설정 파일 경로
 CONFIG_PATH = Path(__file__).parent / "admin_confirm_config.json"
 
+# 설정 파일 읽기-수정-쓰기 동시 접근 방지 (핸들러는 스레드풀에서 실행, 여러 uvicorn 워커끼리는 파일 잠금)
+from services.file_lock import FileLock
+config_lock = FileLock(Path(__file__).parent / "temp_configs" / "config.lock")
+
+# ===== 블로킹 작업 헬퍼 (이벤트 루프가 아닌 스레드풀에서 실행) =====
+
+def read_config_file() -> dict:
+    """설정 파일 읽기"""
+    with open(CONFIG_PATH, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def current_result_store():
+    """설정의 결과 디렉토리에 있는 결과 DB (RPA 실행이 결과를 기록하는 DB)"""
+    from services.result_store import get_result_store, result_dir_from_config
+    try:
+        config = read_config_file()
+    except (OSError, ValueError):
+        config = {}
+    return get_result_store(result_dir_from_config(config))
+
+def update_config_file(update_func) -> dict:
+    """설정 파일을 잠금 상태에서 읽고 update_func로 수정한 뒤 저장"""
+    with config_lock:
+        try:
+            config = read_config_file()
+        except:
+            config = {}
+        update_func(config)
+        with open(CONFIG_PATH, 'w', encoding='utf-8') as f:
+            json.dump(config, f, ensure_ascii=False, indent=2)
+        return config
+
+def error_response(error: Exception) -> dict:
+    """실패 응답 (실행 전 점검 실패는 발견한 문제 목록 포함)"""
+    response = {"success": False, "error": str(error)}
+    problems = getattr(error, "problems", None)
+    if problems is not None:
+        response["problems"] = problems
+    return response
+
 # 정적 파일 서빙 (HTML, CSS, JavaScript 파일들)
 frontend_path = Path(__file__).parent / "frontend"
 if frontend_path.exists():
     app.mount("/static", StaticFiles(directory=str(frontend_path)), name="static")
 
+# 서버 시작 시 실행기 초기화 (RPA warm worker 미리 준비)
+@app.on_event("startup")
+async def startup_executor():
+    from services.project_executor import get_project_executor
+    await run_in_threadpool(get_project_executor)
+    # 실행 로그 주문번호 색인 (백그라운드에서 늘어난 로그만 색인)
+    from services.log_index import get_log_index
+    get_log_index().start()
+
+# 서버 종료 시 대기 중인 warm worker 정리
+@app.on_event("shutdown")
+async def shutdown_executor():
+    from services.project_executor import get_project_executor
+    await run_in_threadpool(get_project_executor().warm_workers.shutdown)
+    from services.log_index import get_log_index
+    await run_in_threadpool(get_log_index().stop)
+
 # 메인 페이지 라우트
 @app.get("/")
 async def read_root():
@@ -63,9 +123,7 @@ async def health_check():
 async def get_config():
     """프로젝트 설정 로드"""
     try:
-        config_path = Path(__file__).parent / "admin_confirm_config.json"
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = json.load(f)
+        config = await run_in_threadpool(read_config_file)
         return {"success": True, "config": config}
     except Exception as e:
         return {"success": False, "error": str(e)}
@@ -75,15 +133,6 @@ async def get_config():
 async def save_config(config_data: dict):
     """프로젝트 설정 저장"""
     try:
-        config_path = Path(__file__).parent / "admin_confirm_config.json"
-        
-        # 기존 설정 로드
-        try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                existing_config = json.load(f)
-        except:
-            existing_config = {}
-        
         # 중첩된 딕셔너리 병합 함수
         def deep_merge(base_dict, update_dict):
             for key, value in update_dict.items():
@@ -93,21 +142,17 @@ async def save_config(config_data: dict):
                     base_dict[key] = value
         
         # 새 설정과 기존 설정 병합
-        deep_merge(existing_config, config_data)
-        
         # 참고: search_status(변경 전 상태)와 change_to_status(변경할 상태)는 별개입니다.
         # 동기화하지 않습니다.
-        
-        with open(config_path, 'w', encoding='utf-8') as f:
-            json.dump(existing_config, f, ensure_ascii=False, indent=2)
+        await run_in_threadpool(update_config_file, lambda existing_config: deep_merge(existing_config, config_data))
         return {"success": True, "message": "설정이 저장되었습니다"}
     except Exception as e:
         return {"success": False, "error": str(e)}
 
 # 프로젝트 시작 API
 @app.post("/api/start")
-async def start_project(config_data: dict):
-    """프로젝트 시작"""
+async def start_project(config_data: dict, profile: str = ""):
+    """프로젝트 시작 (profile=sampling|deterministic이면 프로파일을 수집하여 /api/executions/{id}/profile로 제공)"""
     try:
         # 하위 호환성: change_status를 search_status로 변환 (search_settings 내에서만)
         if 'search_settings' in config_data and 'change_status' in config_data['search_settings']:
@@ -121,27 +166,57 @@ async def start_project(config_data: dict):
         from services.project_executor import get_project_executor
         executor = get_project_executor()
         
-        execution_id = executor.start_project(config_data)
+        # 런타임 설정 파일 작성 및 프로세스 생성은 블로킹 작업이므로 스레드풀에서 실행
+        execution_id = await run_in_threadpool(executor.start_project, config_data, profile or None)
         return {
             "success": True, 
             "execution_id": execution_id,
             "message": "예약확정처리 프로젝트가 시작되었습니다"
         }
     except Exception as e:
-        return {"success": False, "error": str(e)}
+        return error_response(e)
+
+# 실행 전 점검 API
+@app.post("/api/preflight")
+async def preflight_project(config_data: dict):
+    """브라우저를 실행하지 않고 설정/엑셀 파일만 점검 (/api/start와 같은 점검, 문제를 모두 반환)"""
+    try:
+        from services.project_executor import get_project_executor
+        executor = get_project_executor()
+        
+        def check():
+            runtime_config = executor.build_runtime_config(config_data)
+            files = executor.plan_file_summary(executor.compile_plan(runtime_config, "preflight"))
+            return {
+                "orders": sum(f["orders"] for f in files),
+                "skipped_rows": sum(f["skipped_rows"] for f in files),
+                "files": files
+            }
+        
+        summary = await run_in_threadpool(check)
+        return {"success": True, "problems": [], **summary}
+    except Exception as e:
+        return error_response(e)
 
 # 프로젝트 중단 API
 @app.post("/api/stop")
 async def stop_project(force: bool = False):
-    """프로젝트 중단"""
+    """프로젝트 중단 요청 (RPA가 처리 중인 주문을 마칠 때까지 기다리지 않고 바로 반환, force=true이면 즉시 종료)"""
     try:
         from services.project_executor import get_project_executor
         executor = get_project_executor()
         
-        success = executor.stop_project(force)
-        if success:
+        status = await run_in_threadpool(executor.stop_project, force)
+        if status == "stopping":
             return {
                 "success": True,
+                "status": "stopping",
+                "message": "중단을 요청했습니다. 처리 중인 주문을 마친 뒤 중단됩니다"
+            }
+        elif status == "stopped":
+            return {
+                "success": True,
+                "status": "stopped",
                 "message": "프로젝트가 중단되었습니다"
             }
         else:
@@ -152,6 +227,41 @@ async def stop_project(force: bool = False):
     except Exception as e:
         return {"success": False, "error": str(e)}
 
+# 실행 일시정지/재개/설정 변경 API (RPA가 처리 중인 주문을 마친 뒤 적용, 처리 위치는 유지)
+@app.post("/api/executions/{execution_id}/pause")
+async def pause_execution(execution_id: str):
+    """실행 일시정지 요청 (/api/status가 pausing → paused로 바뀌면 적용됨)"""
+    try:
+        from services.project_executor import get_project_executor
+        control = await run_in_threadpool(get_project_executor().control_execution, execution_id, True)
+        return {"success": True, "control": control, "message": "일시정지를 요청했습니다. 처리 중인 주문을 마친 뒤 멈춥니다"}
+    except Exception as e:
+        return error_response(e)
+
+@app.post("/api/executions/{execution_id}/resume")
+async def resume_execution(execution_id: str):
+    """일시정지한 실행 재개 (남은 주문부터 이어서 처리)"""
+    try:
+        from services.project_executor import get_project_executor
+        control = await run_in_threadpool(get_project_executor().control_execution, execution_id, False)
+        return {"success": True, "control": control, "message": "재개를 요청했습니다"}
+    except Exception as e:
+        return error_response(e)
+
+@app.post("/api/executions/{execution_id}/settings")
+async def update_execution_settings(execution_id: str, settings: dict):
+    """실행 중 설정 변경 ({"timing": {"page_load_wait": 1.5, ...}, "tabs": 2}) - 다음 주문부터 적용"""
+    try:
+        from services.project_executor import get_project_executor
+        timing = settings.get("timing") or {}
+        if not isinstance(timing, dict):
+            return {"success": False, "error": "timing은 {항목: 초} 형식이어야 합니다"}
+        control = await run_in_threadpool(get_project_executor().control_execution, execution_id, None,
+                                          timing, settings.get("tabs"))
+        return {"success": True, "control": control, "message": "설정 변경을 요청했습니다. 다음 주문부터 적용됩니다"}
+    except Exception as e:
+        return error_response(e)
+
 # 프로젝트 상태 확인 API
 @app.get("/api/status")
 async def get_status():
@@ -160,24 +270,199 @@ async def get_status():
         from services.project_executor import get_project_executor
         executor = get_project_executor()
         
-        status = executor.get_status()
+        status = await run_in_threadpool(executor.get_status)  # 공유 상태 DB 조회 (다른 워커가 쓰는 동안 대기할 수 있음)
         return {"success": True, "status": status}
     except Exception as e:
         return {"success": False, "error": str(e)}
 
 # 실행 이력 조회 API
 @app.get("/api/history")
-async def get_history(limit: int = 10):
-    """실행 이력 조회"""
+async def get_history(limit: int = 10, details: bool = False):
+    """실행 이력 조회 (details=true이면 자원 사용량 시계열 포함)"""
     try:
         from services.project_executor import get_project_executor
         executor = get_project_executor()
         
-        history = executor.get_history(limit)
+        history = await run_in_threadpool(executor.get_history, limit, details)
         return {"success": True, "history": history}
     except Exception as e:
         return {"success": False, "error": str(e)}
 
+# 실행 자원 사용량 조회 API (RPA + Chrome 프로세스의 CPU/RSS/핸들 시계열, 실행 중이면 현재까지)
+@app.get("/api/executions/{execution_id}/resources")
+async def get_resource_usage(execution_id: str):
+    try:
+        from services.project_executor import get_project_executor
+        from services.resource_sampler import PSUTIL_MISSING, sampling_available
+        usage = await run_in_threadpool(get_project_executor().get_resource_usage, execution_id)
+        if usage is None:
+            reason = "샘플링 기록이 없습니다" if sampling_available() else PSUTIL_MISSING
+            return {"success": False, "error": f"자원 사용량을 찾을 수 없습니다 ({reason})"}
+        if not usage.get("available", True):
+            return {"success": False, "error": f"자원 사용량을 샘플링하지 못했습니다 ({usage['reason']})"}
+        return {"success": True, **usage}
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+# 실행 프로파일 다운로드 API (sampling: folded stack 텍스트, deterministic: pstats 파일)
+@app.get("/api/executions/{execution_id}/profile")
+async def download_profile(execution_id: str):
+    from services.project_executor import get_project_executor
+    path = get_project_executor().get_profile_path(execution_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="프로파일을 찾을 수 없습니다 (프로파일링하지 않았거나 실행 중입니다)")
+    media_type = "text/plain; charset=utf-8" if path.suffix == ".folded" else "application/octet-stream"
+    return FileResponse(str(path), filename=path.name, media_type=media_type)
+
+# 주문별 결과 조회 API
+@app.get("/api/results")
+async def get_results(execution_id: str = "", order_number: str = "", status_result: str = "", lms_result: str = "",
+                      date_from: str = "", date_to: str = "", page: int = 1, page_size: int = 50):
+    """결과 DB 조회 (실행 ID, 주문번호, 상태/LMS 결과, 처리 날짜 YYYY-MM-DD 범위) + 결과별 건수"""
+    try:
+        filters = {"execution_id": execution_id, "order_number": order_number, "status_result": status_result,
+                   "lms_result": lms_result, "date_from": date_from, "date_to": date_to}
+        store = await run_in_threadpool(current_result_store)
+        results = await run_in_threadpool(store.query, filters, page, page_size)
+        return {"success": True, **results}
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+# 주문별 결과 내보내기 API (CSV는 스트리밍, xlsx는 임시 파일로 작성 후 전송)
+@app.get("/api/results/export")
+async def export_results(format: str = "csv", execution_id: str = "", order_number: str = "", status_result: str = "",
+                         lms_result: str = "", date_from: str = "", date_to: str = ""):
+    filters = {"execution_id": execution_id, "order_number": order_number, "status_result": status_result,
+               "lms_result": lms_result, "date_from": date_from, "date_to": date_to}
+    store = await run_in_threadpool(current_result_store)
+    filename = f"전송여부결과_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    
+    if format == "csv":
+        return StreamingResponse(
+            store.iter_csv(filters),
+            media_type="text/csv; charset=utf-8",
+            headers={"Content-Disposition": f"attachment; filename*=UTF-8''{quote(filename)}.csv"}
+        )
+    if format == "xlsx":
+        path = await run_in_threadpool(store.export_xlsx, filters)
+        return FileResponse(path, filename=f"{filename}.xlsx", background=BackgroundTask(os.remove, path))
+    raise HTTPException(status_code=400, detail="format은 csv 또는 xlsx만 지원합니다")
+
+# 주문별 로그 조회 API (모든 실행 로그에서 [주문번호: …] 태그가 붙은 줄을 색인으로 조회)
+@app.get("/api/orders/{order_number}/trace")
+async def trace_order(order_number: str, limit: int = 1000):
+    """주문의 모든 로그 줄 (로그 시각 순, 조회 전에 새로 기록된 로그 색인)"""
+    try:
+        from services.log_index import get_log_index
+        trace = await run_in_threadpool(get_log_index().trace, order_number, limit)
+        return {"success": True, **trace}
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+# Prometheus 계측 API (실행 카운터, 큐 상태, RPA 단계별 소요 시간 히스토그램)
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Prometheus text format 계측 정보"""
+    from services.metrics import render_prometheus
+    text = await run_in_threadpool(render_prometheus)
+    return PlainTextResponse(text, media_type="text/plain; version=0.0.4")
+
+# ===== 분산 실행 API (코디네이터 ↔ 워커 에이전트) =====
+
+# 분산 실행 생성 API
+@app.post("/api/distributed/runs")
+async def create_distributed_run(request_data: dict):
+    """실행 계획을 배치로 나누어 워커 에이전트(python -m rpa.agent)가 리스하도록 등록"""
+    try:
+        import uuid
+        from services.project_executor import get_project_executor
+        from services.lease_queue import get_lease_queue, DEFAULT_BATCH_SIZE, DEFAULT_LEASE_SECONDS
+        executor = get_project_executor()
+        
+        def create_run():
+            runtime_config = executor.build_runtime_config(request_data.get("config", {}))
+            plan = executor.compile_plan(runtime_config, str(uuid.uuid4()))
+            if "files" in plan:
+                raise ValueError("분산 실행은 엑셀 파일 1개만 지원합니다 (file_paths.excel_files 대신 excel_file 사용)")
+            return get_lease_queue().create_run(
+                plan, runtime_config,
+                batch_size=request_data.get("batch_size", DEFAULT_BATCH_SIZE),
+                lease_seconds=request_data.get("lease_seconds", DEFAULT_LEASE_SECONDS)
+            )
+        
+        run = await run_in_threadpool(create_run)
+        return {"success": True, "run": run}
+    except Exception as e:
+        return error_response(e)
+
+# 분산 실행 상태 API
+@app.get("/api/distributed/runs/{run_id}")
+async def get_distributed_run(run_id: str, include_results: bool = False):
+    """분산 실행 진행 상황 (include_results=true이면 주문별 결과 포함)"""
+    try:
+        from services.lease_queue import get_lease_queue
+        run = await run_in_threadpool(get_lease_queue().get_run, run_id, include_results)
+        if run is None:
+            return {"success": False, "error": f"분산 실행을 찾을 수 없습니다: {run_id}"}
+        return {"success": True, "run": run}
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+# 분산 실행 주문 엑셀 다운로드 API (업로드 배치를 처리하는 에이전트용)
+@app.get("/api/distributed/runs/{run_id}/excel")
+async def download_distributed_excel(run_id: str):
+    from services.lease_queue import get_lease_queue
+    excel_file = await run_in_threadpool(get_lease_queue().get_excel_file, run_id)
+    if not excel_file or not os.path.exists(excel_file):
+        raise HTTPException(status_code=404, detail="엑셀 파일을 찾을 수 없습니다")
+    return FileResponse(excel_file, filename=Path(excel_file).name)
+
+# 배치 리스 API
+@app.post("/api/leases")
+async def acquire_lease(request_data: dict):
+    """대기 중인 배치 1개를 리스 (없으면 lease: null, active_runs가 0이면 더 받을 작업 없음)"""
+    try:
+        from services.lease_queue import get_lease_queue
+        queue = get_lease_queue()
+        
+        def acquire():
+            return queue.lease(request_data.get("agent_id", "unknown")), queue.active_run_count()
+        
+        lease, active_runs = await run_in_threadpool(acquire)
+        return {"success": True, "lease": lease, "active_runs": active_runs}
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+# 리스 갱신 API
+@app.post("/api/leases/{lease_id}/renew")
+async def renew_lease(lease_id: str, request_data: dict):
+    try:
+        from services.lease_queue import get_lease_queue, LeaseLostError
+        try:
+            expires_in = await run_in_threadpool(get_lease_queue().renew, lease_id, request_data.get("token", ""))
+        except LeaseLostError as e:
+            return {"success": False, "error": str(e), "lease_lost": True}
+        return {"success": True, "expires_in": expires_in}
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+# 배치 결과 보고 API
+@app.post("/api/leases/{lease_id}/results")
+async def report_lease_results(lease_id: str, request_data: dict):
+    """주문별 결과 보고 (done=true이면 배치 완료, 업로드 배치는 success=false이면 재리스)"""
+    try:
+        from services.lease_queue import get_lease_queue, LeaseLostError
+        try:
+            report = await run_in_threadpool(
+                get_lease_queue().report, lease_id, request_data.get("token", ""),
+                request_data.get("results", []), request_data.get("done", False), request_data.get("success", True)
+            )
+        except LeaseLostError as e:
+            return {"success": False, "error": str(e), "lease_lost": True}
+        return {"success": True, **report}
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
 # ===== 공통 데이터 API =====
 
 # 채널 데이터 API
@@ -187,7 +472,7 @@ async def get_channels():
     try:
         from services.excel_manager import get_excel_manager
         excel_manager = get_excel_manager()
-        channels = excel_manager.get_channels()
+        channels = await run_in_threadpool(excel_manager.get_channels)
         return {"success": True, "channels": channels}
     except Exception as e:
         return {"success": False, "error": str(e)}
@@ -199,7 +484,7 @@ async def search_channels(q: str = ""):
     try:
         from services.excel_manager import get_excel_manager
         excel_manager = get_excel_manager()
-        channels = excel_manager.search_channels(q)
+        channels = await run_in_threadpool(excel_manager.search_channels, q)
         return {"success": True, "channels": channels}
     except Exception as e:
         return {"success": False, "error": str(e)}
@@ -211,7 +496,7 @@ async def get_order_statuses():
     try:
         from services.excel_manager import get_excel_manager
         excel_manager = get_excel_manager()
-        statuses = excel_manager.get_order_statuses()
+        statuses = await run_in_threadpool(excel_manager.get_order_statuses)
         return {"success": True, "statuses": statuses}
     except Exception as e:
         return {"success": False, "error": str(e)}
@@ -223,7 +508,7 @@ async def get_change_statuses():
     try:
         from services.excel_manager import get_excel_manager
         excel_manager = get_excel_manager()
-        change_statuses = excel_manager.get_change_statuses()
+        change_statuses = await run_in_threadpool(excel_manager.get_change_statuses)
         return {"success": True, "change_statuses": change_statuses}
     except Exception as e:
         return {"success": False, "error": str(e)}
@@ -235,7 +520,7 @@ async def get_search_statuses():
     try:
         from services.excel_manager import get_excel_manager
         excel_manager = get_excel_manager()
-        search_statuses = excel_manager.get_search_statuses()
+        search_statuses = await run_in_threadpool(excel_manager.get_search_statuses)
         return {"success": True, "search_statuses": search_statuses}
     except Exception as e:
         return {"success": False, "error": str(e)}
@@ -247,7 +532,7 @@ async def get_sale_types():
     try:
         from services.excel_manager import get_excel_manager
         excel_manager = get_excel_manager()
-        sale_types = excel_manager.get_sale_types()
+        sale_types = await run_in_threadpool(excel_manager.get_sale_types)
         return {"success": True, "sale_types": sale_types}
     except Exception as e:
         return {"success": False, "error": str(e)}
@@ -259,7 +544,7 @@ async def get_date_types():
     try:
         from services.excel_manager import get_excel_manager
         excel_manager = get_excel_manager()
-        date_types = excel_manager.get_date_types()
+        date_types = await run_in_threadpool(excel_manager.get_date_types)
         return {"success": True, "date_types": date_types}
     except Exception as e:
         return {"success": False, "error": str(e)}
@@ -271,7 +556,7 @@ async def get_appoint_day_types():
     try:
         from services.excel_manager import get_excel_manager
         excel_manager = get_excel_manager()
-        appoint_types = excel_manager.get_appoint_day_types()
+        appoint_types = await run_in_threadpool(excel_manager.get_appoint_day_types)
         return {"success": True, "appoint_types": appoint_types}
     except Exception as e:
         return {"success": False, "error": str(e)}
@@ -283,7 +568,7 @@ async def get_search_types():
     try:
         from services.excel_manager import get_excel_manager
         excel_manager = get_excel_manager()
-        search_types = excel_manager.get_search_types()
+        search_types = await run_in_threadpool(excel_manager.get_search_types)
         return {"success": True, "search_types": search_types}
     except Exception as e:
         return {"success": False, "error": str(e)}
@@ -295,7 +580,7 @@ async def get_excel_data():
     try:
         from services.excel_manager import get_excel_manager
         excel_manager = get_excel_manager()
-        data = excel_manager.get_all_data()
+        data = await run_in_threadpool(excel_manager.get_all_data)
         return {"success": True, "data": data}
     except Exception as e:
         return {"success": False, "error": str(e)}
@@ -331,32 +616,31 @@ async def upload_excel(file: UploadFile = File(...)):
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         new_filename = f"{original_filename}_{timestamp}{file_extension}"
         
-        # 파일 저장
-        file_path = UPLOAD_DIR / new_filename
-        with open(file_path, "wb") as buffer:
-            buffer.write(file_content)
-        
-        # 설정 파일 업데이트
-        try:
-            with open(CONFIG_PATH, 'r', encoding='utf-8') as f:
-                config = json.load(f)
-        except:
-            config = {}
-        
-        # 파일 경로 업데이트 (상대 경로로 저장)
-        if 'file_paths' not in config:
-            config['file_paths'] = {}
         # 상대 경로로 저장 (프로젝트 폴더 기준)
+        file_path = UPLOAD_DIR / new_filename
         relative_path = f"uploads/{new_filename}"
-        config['file_paths']['excel_file'] = relative_path
         
-        # 설정 파일 저장
-        with open(CONFIG_PATH, 'w', encoding='utf-8') as f:
-            json.dump(config, f, ensure_ascii=False, indent=2)
+        def save_upload():
+            # 파일 저장
+            with open(file_path, "wb") as buffer:
+                buffer.write(file_content)
+            
+            # 설정 파일 업데이트 (파일 경로를 상대 경로로 저장)
+            def set_excel_file(config):
+                if 'file_paths' not in config:
+                    config['file_paths'] = {}
+                config['file_paths']['excel_file'] = relative_path
+            update_config_file(set_excel_file)
+            
+            # 업로드 시점에 백그라운드 파싱/검증 시작 (RPA 실행 전에 시트 오류 확인 가능)
+            from services.upload_manager import get_upload_manager
+            upload_id = get_upload_manager().submit(file_path)
+            return upload_id, file_path.stat()
         
-        file_stat = file_path.stat()
+        upload_id, file_stat = await run_in_threadpool(save_upload)
         return {
             "success": True,
+            "upload_id": upload_id,
             "filename": new_filename,
             "file_size": file_stat.st_size,
             "upload_time": datetime.fromtimestamp(file_stat.st_mtime).isoformat(),
@@ -366,16 +650,42 @@ async def upload_excel(file: UploadFile = File(...)):
     except Exception as e:
         return {"success": False, "error": f"파일 업로드 실패: {str(e)}"}
 
+# 업로드 파일 파싱 결과 요약 API
+@app.get("/api/uploads/{upload_id}")
+async def get_upload_summary(upload_id: str):
+    """업로드 파일 파싱/검증 결과 요약 (행 수, 중복/오류 건수)"""
+    try:
+        from services.upload_manager import get_upload_manager
+        summary = await run_in_threadpool(get_upload_manager().get_summary, upload_id)
+        if summary is None:
+            return {"success": False, "error": f"업로드 정보를 찾을 수 없습니다: {upload_id}"}
+        return {"success": True, "upload": summary}
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+# 업로드 파일 미리보기 API (페이지 단위)
+@app.get("/api/uploads/{upload_id}/preview")
+async def get_upload_preview(upload_id: str, page: int = 1, page_size: int = 50):
+    """업로드 파일 파싱 결과 미리보기"""
+    try:
+        from services.upload_manager import get_upload_manager
+        preview = await run_in_threadpool(get_upload_manager().get_preview, upload_id, page, page_size)
+        if preview is None:
+            return {"success": False, "error": f"업로드 정보를 찾을 수 없습니다: {upload_id}"}
+        return {"success": True, **preview}
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
 # 업로드된 파일 정보 조회 API
 @app.get("/api/uploaded-files")
 async def get_uploaded_files():
     """업로드된 파일 정보 조회"""
     try:
-        files_info = []
-        
-        try:
-            with open(CONFIG_PATH, 'r', encoding='utf-8') as f:
-                config = json.load(f)
+        def collect_files_info():
+            files_info = []
+            
+            try:
+                config = read_config_file()
                 excel_file_path = config.get('file_paths', {}).get('excel_file', '')
                 if excel_file_path:
                     # 상대 경로인 경우 절대 경로로 변환
@@ -386,16 +696,21 @@ async def get_uploaded_files():
                     
                     if excel_file_path.exists():
                         file_stat = excel_file_path.stat()
+                        from services.upload_manager import get_upload_manager
                         files_info.append({
                             "type": "excel",
+                            "upload_id": get_upload_manager().submit(excel_file_path),
                             "filename": excel_file_path.name,
                             "file_size": file_stat.st_size,
                             "upload_time": datetime.fromtimestamp(file_stat.st_mtime).isoformat(),
                             "path": str(excel_file_path)
                         })
-        except:
-            pass
+            except:
+                pass
+            
+            return files_info
         
+        files_info = await run_in_threadpool(collect_files_info)
         return {"success": True, "files": files_info}
         
     except Exception as e:
@@ -411,10 +726,13 @@ if __name__ == "__main__":
     # 포트 설정 (환경변수 우선, 기본값 8001)
     port = int(os.getenv('PORT', 8001))
     host = os.getenv('HOST', '0.0.0.0')
+    # 워커 수 (실행 상태는 temp_configs/executor_state.db로 워커끼리 공유)
+    workers = int(os.getenv('ADMIN_CONFIRM_WORKERS', 1))
     
     uvicorn.run(
         "main:app",
         host=host,
         port=port,
-        reload=False
+        reload=False,
+        workers=workers
     )
@@ -0,0 +1,241 @@
+# agent.py - 분산 실행 워커 에이전트
+# 코디네이터 서버(main.py)의 리스 큐에서 배치를 받아 처리하고 주문별 결과를 HTTP로 보고합니다.
+# 브라우저는 한 번 실행/로그인한 뒤 여러 리스에 재사용하며, 처리 중에는 리스를 주기적으로 갱신합니다.
+#
+# 사용 예:
+#   python -m rpa.agent --server http://코디네이터:8001
+#   python -m rpa.agent --server http://127.0.0.1:8000 --exit-when-idle --headless
+#
+# 참고: 같은 PC에서 여러 에이전트를 실행할 수 있도록 Lock 파일은 사용하지 않습니다.
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+import tempfile
+import threading
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from rpa.engine import AdminConfirmEngine
+
+
+class CoordinatorClient:
+    """코디네이터 리스 API 클라이언트 (표준 라이브러리 urllib 사용)"""
+
+    def __init__(self, server: str, timeout: float = 30.0):
+        self.server = server.rstrip("/")
+        self.timeout = timeout
+
+    def _request(self, method: str, path: str, payload: Optional[Dict] = None) -> Dict:
+        data = json.dumps(payload).encode("utf-8") if payload is not None else None
+        req = urllib.request.Request(self.server + path, data=data, method=method,
+                                     headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(req, timeout=self.timeout) as resp:
+            return json.loads(resp.read().decode("utf-8"))
+
+    def lease(self, agent_id: str) -> Dict:
+        return self._request("POST", "/api/leases", {"agent_id": agent_id})
+
+    def renew(self, lease_id: str, token: str) -> Dict:
+        return self._request("POST", f"/api/leases/{lease_id}/renew", {"token": token})
+
+    def report(self, lease_id: str, token: str, results: List[Dict], done: bool = False, success: bool = True) -> Dict:
+        return self._request("POST", f"/api/leases/{lease_id}/results",
+                             {"token": token, "results": results, "done": done, "success": success})
+
+    def download_excel(self, run_id: str, suffix: str) -> str:
+        """업로드 배치용 주문 엑셀을 임시 파일로 내려받아 경로 반환"""
+        fd, path = tempfile.mkstemp(prefix=f"admin_confirm_{run_id[:8]}_", suffix=suffix)
+        with urllib.request.urlopen(f"{self.server}/api/distributed/runs/{run_id}/excel", timeout=self.timeout) as resp, \
+                os.fdopen(fd, "wb") as f:
+            f.write(resp.read())
+        return path
+
+
+class LeaseRenewer(threading.Thread):
+    """처리 중인 리스를 lease_seconds/3 간격으로 갱신 (리스를 잃으면 엔진에 알림)"""
+
+    def __init__(self, client: CoordinatorClient, engine: "AgentEngine", lease: Dict):
+        super().__init__(daemon=True)
+        self.client = client
+        self.engine = engine
+        self.lease = lease
+        self.interval = max(1.0, float(lease["lease_seconds"]) / 3)
+        self._stopped = threading.Event()
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            try:
+                response = self.client.renew(self.lease["lease_id"], self.lease["token"])
+            except (urllib.error.URLError, OSError) as e:
+                print(f"리스 갱신 실패 (다음 주기에 재시도): {e}")
+                continue
+            if response.get("lease_lost"):
+                print(f"리스를 잃었습니다: {self.lease['lease_id']}")
+                self.engine.lease_lost = True
+                return
+
+    def stop(self):
+        self._stopped.set()
+
+
+class AgentEngine(AdminConfirmEngine):
+    """리스 단위로 실행 계획을 바꿔가며 처리하고 주문별 결과를 코디네이터에 즉시 보고하는 엔진"""
+
+    def __init__(self, config: Dict, run_plan: Dict, client: CoordinatorClient, agent_id: str):
+        super().__init__(config, run_plan, execution_id=run_plan["execution_id"], execution_mode=f"agent:{agent_id}")
+        self.client = client
+        self.lease = None
+        self.lease_lost = False
+        self.unreported: List[Dict] = []  # 보고에 실패한 결과 (배치 완료 보고 시 함께 전송)
+
+    def prepare_output(self):
+        super().prepare_output()
+        self.result_store = None  # 결과는 코디네이터가 결과 DB에 기록
+
+    def start_lease(self, lease: Dict):
+        self.lease = lease
+        self.lease_lost = False
+        self.unreported = []
+        self.execution_id = lease["run_id"]
+        self.load_plan(lease["plan"])
+        # 카나리는 이 에이전트가 처리하는 앞 N건 (첫 리스가 업로드 배치라 생성 시에는 주문 수를 알 수 없음)
+        canary_plan = lease["plan"].get("canary")
+        if canary_plan and self.canary is None and self.canary_remaining == 0:
+            self.canary_remaining = canary_plan["orders"]
+
+    def log_result(self, order_number, confirm_number, status_result, lms_result, timestamp, attempts=1, row=None):
+        super().log_result(order_number, confirm_number, status_result, lms_result, timestamp, attempts, row)
+        if self.lease is None:
+            return
+        result = {
+            "row": row,  # 코디네이터는 시트 행으로 결과를 구분 (같은 주문번호가 여러 행에 있을 수 있음)
+            "order_number": order_number,
+            "confirm_number": confirm_number,
+            "status_result": status_result,
+            "lms_result": lms_result,
+            "timestamp": timestamp,
+            "attempts": attempts
+        }
+        try:
+            response = self.client.report(self.lease["lease_id"], self.lease["token"], [result])
+            if response.get("lease_lost"):
+                self.lease_lost = True
+        except (urllib.error.URLError, OSError) as e:
+            print(f"결과 보고 실패 (배치 완료 시 재전송): {e}")
+            self.unreported.append(result)
+
+    def handle_order(self, data, attempt, stage):
+        # 리스를 잃은 배치는 다른 에이전트가 처리하므로 남은 주문(재시도 포함)을 건너뜀
+        if self.lease_lost:
+            return
+        super().handle_order(data, attempt, stage)
+
+
+def login_key(config: Dict):
+    login = config.get("login", {})
+    return login.get("url"), login.get("user_id")
+
+
+def process_lease(client: CoordinatorClient, engine: AgentEngine, lease: Dict):
+    """리스 1개 처리 (업로드 배치: 엑셀 업로드, 주문 배치: 확정번호 처리) 후 완료 보고"""
+    renewer = LeaseRenewer(client, engine, lease)
+    renewer.start()
+    excel_path = None
+    try:
+        if lease["kind"] == "upload":
+            suffix = Path(lease["plan"].get("excel_file") or "orders.xlsx").suffix
+            excel_path = client.download_excel(lease["run_id"], suffix)
+            engine.start_lease({**lease, "plan": {**lease["plan"], "excel_file": excel_path}})
+            success = engine.upload_excel_file()
+        else:
+            engine.start_lease(lease)
+            engine.main_window = engine.driver.current_window_handle
+            engine.process_confirm_numbers()
+            success = True
+    finally:
+        renewer.stop()
+        if excel_path:
+            try:
+                os.remove(excel_path)
+            except OSError:
+                pass
+
+    if engine.lease_lost:
+        return
+    response = client.report(lease["lease_id"], lease["token"], engine.unreported, done=True, success=success)
+    if not response.get("success"):
+        print(f"배치 완료 보고 실패: {response.get('error')}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="예약확정처리 분산 실행 워커 에이전트")
+    parser.add_argument("--server", required=True, help="코디네이터 서버 주소 (예: http://127.0.0.1:8000)")
+    parser.add_argument("--agent-id", default=f"{socket.gethostname()}-{os.getpid()}")
+    parser.add_argument("--poll-interval", type=float, default=5.0, help="작업이 없을 때 리스 재요청 간격 (초)")
+    parser.add_argument("--exit-when-idle", action="store_true", help="진행 중인 분산 실행이 없으면 종료")
+    parser.add_argument("--headless", action="store_true", help="브라우저 headless 실행")
+    args = parser.parse_args()
+
+    client = CoordinatorClient(args.server)
+    engine = None
+    print(f"=== 분산 실행 에이전트 시작: {args.agent_id} → {args.server} ===")
+
+    try:
+        while True:
+            try:
+                response = client.lease(args.agent_id)
+            except (urllib.error.URLError, OSError) as e:
+                print(f"코디네이터 연결 실패: {e}")
+                time.sleep(args.poll_interval)
+                continue
+
+            lease = response.get("lease")
+            if lease is None:
+                if args.exit_when_idle and response.get("success") and response.get("active_runs", 0) == 0:
+                    print("처리할 분산 실행이 없어 종료합니다.")
+                    return 0
+                time.sleep(args.poll_interval)
+                continue
+
+            print(f"리스 획득: {lease['lease_id']} ({lease['kind']}, 주문 {len(lease['plan']['orders'])}건)")
+            config = lease["config"]
+            if args.headless:
+                config.setdefault("browser", {})["headless"] = True
+
+            # 브라우저는 첫 리스에서 실행/로그인하고 이후 재사용 (로그인 정보가 바뀌면 다시 로그인)
+            if engine is None:
+                engine = AgentEngine(config, lease["plan"], client, args.agent_id)
+                engine.prepare_output()
+                if not engine.launch_browser() or not engine.login():
+                    # 리스는 만료 후 다른 에이전트에 재할당됨
+                    print("브라우저 실행/로그인 실패로 종료합니다.")
+                    return 1
+            elif login_key(config) != login_key(engine.config):
+                engine.config = config
+                if not engine.login():
+                    print("재로그인 실패로 종료합니다.")
+                    return 1
+            else:
+                engine.config = config
+
+            process_lease(client, engine, lease)
+    except KeyboardInterrupt:
+        print("에이전트를 중단합니다.")
+        return 0
+    finally:
+        if engine is not None:
+            engine.quit_browser()
+            engine.report_metrics()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+# canary.py - 카나리 실행 (앞 N건을 먼저 처리하고 기준을 통과하면 나머지 처리)
+# 관리자 사이트 배포 문제 등으로 대부분의 주문이 실패하는 상황을 전체 시트가 아닌 N건 안에서 발견하기 위해 사용합니다.
+# - 카나리 구간: 실행의 앞 excel_settings.canary.orders건 (재시도 포함, 최종 결과가 나올 때까지 처리)
+#   배치 실행은 파일 경계를 넘어 실행 전체의 앞 N건이며, 파일 사이(업로드 등)는 구간에서 제외
+# - 판정: 최종 결과 실패율, 주문당 평균 처리 시간(구간 경과 시간 / 주문 수), 단계별 평균 소요 시간
+#   (단계별 시간은 계측 히스토그램의 카나리 시작/종료 시점 차이로 계산)
+# - 통과하면 나머지 주문을 이어서 처리 (canary.tabs_after로 탭 수를 늘릴 수 있음)
+# - 실패하면 나머지 주문을 "카나리중단"으로 기록하고 보고서를 남긴 뒤 종료 (rpa/engine.py EXIT_CANARY_FAILED)
+import json
+import time
+from typing import Dict, List
+
+# 카나리 보고서에 항상 포함하는 단계 (engine의 @timed 단계 이름)
+CANARY_STAGES = ("search_order_by_number", "change_reservation_status", "send_lms_from_order_list")
+
+
+def is_success(status_result: str, lms_result: str, target_value: str) -> bool:
+    """최종 결과가 성공인지 (상태 변경 + LMS 전송 성공, 또는 이미 목표 상태)"""
+    if status_result == "이미확정":
+        return True
+    return status_result == target_value and lms_result == "성공"
+
+
+class CanaryMonitor:
+    """카나리 구간의 최종 결과와 계측 차이를 모아 통과 여부 판정 (탭 동시 처리 시 모든 탭이 공유)"""
+
+    def __init__(self, plan: Dict, target_value: str):
+        self.plan = plan
+        self.target_value = target_value
+        self.active = False
+        self.successes = 0
+        self.failures = 0
+        self._started_at = None
+        self._elapsed = 0.0
+        self._baseline = {}
+
+    def start(self, metrics):
+        self.active = True
+        self._started_at = time.monotonic()
+        self._baseline = metrics.snapshot()["histograms"]
+
+    def suspend(self):
+        """배치 실행에서 카나리 구간이 다음 파일로 이어질 때 파일 사이 시간/결과 제외"""
+        if self.active:
+            self._elapsed += time.monotonic() - self._started_at
+            self.active = False
+
+    def resume(self):
+        if not self.active:
+            self._started_at = time.monotonic()
+            self.active = True
+
+    def record(self, status_result: str, lms_result: str):
+        """최종 결과 1건 기록 (카나리 구간에서만)"""
+        if not self.active:
+            return
+        if is_success(status_result, lms_result, self.target_value):
+            self.successes += 1
+        else:
+            self.failures += 1
+
+    def stage_averages(self, metrics) -> Dict[str, Dict]:
+        """카나리 구간의 단계별 호출 수와 평균 소요 시간"""
+        current = metrics.snapshot()["histograms"]
+        stages = {}
+        for name in list(CANARY_STAGES) + [n for n in self.plan["max_stage_seconds"] if n not in CANARY_STAGES]:
+            after = current.get(name)
+            if after is None:
+                continue
+            before = self._baseline.get(name, {"count": 0, "sum": 0.0})
+            count = after["count"] - before["count"]
+            if count > 0:
+                stages[name] = {"count": count, "avg_seconds": round((after["sum"] - before["sum"]) / count, 3)}
+        return stages
+
+    def finish(self, metrics) -> Dict:
+        """카나리 구간 종료 및 판정 보고서"""
+        self.suspend()
+        elapsed = self._elapsed
+        total = self.successes + self.failures
+        failure_rate = self.failures / total if total else 1.0
+        order_seconds = elapsed / total if total else 0.0
+        stages = self.stage_averages(metrics)
+
+        problems: List[str] = []
+        if failure_rate > self.plan["max_failure_rate"]:
+            problems.append(f"실패율 {failure_rate:.0%} > 기준 {self.plan['max_failure_rate']:.0%}")
+        if self.plan["max_order_seconds"] and order_seconds > self.plan["max_order_seconds"]:
+            problems.append(f"주문당 평균 {order_seconds:.1f}초 > 기준 {self.plan['max_order_seconds']:g}초")
+        for name, limit in self.plan["max_stage_seconds"].items():
+            if name in stages and stages[name]["avg_seconds"] > limit:
+                problems.append(f"{name} 평균 {stages[name]['avg_seconds']:.1f}초 > 기준 {limit:g}초")
+
+        return {
+            "passed": not problems,
+            "orders": total,
+            "failures": self.failures,
+            "failure_rate": round(failure_rate, 3),
+            "elapsed_seconds": round(elapsed, 1),
+            "order_seconds": round(order_seconds, 2),
+            "stages": stages,
+            "problems": problems,
+            "thresholds": self.plan
+        }
+
+
+def report_lines(report: Dict) -> List[str]:
+    """로그에 기록할 카나리 보고서"""
+    lines = [
+        "=== 카나리 판정: " + ("통과" if report["passed"] else "실패") + " ===",
+        f"주문 {report['orders']}건, 실패 {report['failures']}건 ({report['failure_rate']:.0%}), "
+        f"주문당 평균 {report['order_seconds']}초 (경과 {report['elapsed_seconds']}초)"
+    ]
+    for name, stage in report["stages"].items():
+        lines.append(f"{name:<45} {stage['count']:>5}회  평균 {stage['avg_seconds'] * 1000:>8.1f}ms")
+    lines += [f"기준 초과: {problem}" for problem in report["problems"]]
+    return lines
+
+
+def write_report(path: str, report: Dict):
+    """실행기가 실행 이력에 첨부하는 보고서 파일 저장"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False)
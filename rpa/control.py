@@ -0,0 +1,90 @@
+# control.py - 실행 중 제어 채널 (일시정지/재개, 실시간 설정 변경)
+# 실행기가 제어 파일(CONTROL_FILE_PATH)에 원하는 상태를 기록하면 RPA가 주문 사이에서 확인하여 적용합니다.
+# - 제어 파일: {"version": n, "paused": bool, "timing": {이름: 초}, "tabs": n 또는 null}
+# - 주문마다 파일 수정 시각만 확인하고, 바뀐 경우에만 다시 읽음
+# - 적용 결과는 확인 파일(..._control_ack.json)에 기록 → 실행기가 상태(running/pausing/paused)와 적용 버전을 표시
+# - 일시정지 중에도 처리 위치(남은 주문, 재시도 큐)는 그대로 유지되며, 중단 요청은 바로 처리
+# 실행기(서버)에서도 import 하므로 selenium 등 무거운 모듈을 import 하지 않습니다.
+import os
+import json
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+# 실행 중 변경할 수 있는 타이밍 값 (초)
+LIVE_TIMING_KEYS = (
+    "page_load_wait", "upload_wait", "detail_page_wait", "refresh_wait", "lms_popup_wait",
+    "page_load_timeout", "login_timeout",
+)
+# 실행 중 변경할 수 있는 최대 탭 수
+MAX_LIVE_TABS = 8
+# 일시정지 중 재개/중단 요청 확인 간격 (초)
+PAUSE_CHECK_INTERVAL = 0.5
+
+
+def ack_path(control_path) -> Path:
+    """RPA가 적용 결과를 기록하는 확인 파일 경로"""
+    path = Path(control_path)
+    return path.with_name(f"{path.stem}_ack.json")
+
+
+def write_json_atomic(path, data: Dict):
+    """임시 파일에 쓴 뒤 교체 (읽는 쪽이 반쯤 쓰인 파일을 보지 않도록)"""
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(temp_path, path)
+
+
+def read_ack(control_path) -> Optional[Dict]:
+    """RPA가 마지막으로 적용한 제어 상태 (아직 없으면 None)"""
+    try:
+        with open(ack_path(control_path), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+class ControlChannel:
+    """RPA 쪽 제어 파일 확인 (탭 동시 처리 시 모든 탭이 같은 객체를 공유)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.state: Dict = {}
+        self.version = 0
+        self._mtime = None
+
+    @property
+    def paused(self) -> bool:
+        return bool(self.state.get("paused"))
+
+    def poll(self) -> Optional[Dict]:
+        """제어 파일이 바뀌었으면 새 상태 반환 (바뀌지 않았거나 읽을 수 없으면 None)"""
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+        if mtime == self._mtime:
+            return None
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None  # 교체 중 - 다음 확인에서 다시 읽음
+        self._mtime = mtime
+        if state.get("version", 0) <= self.version:
+            return None
+        self.version = state.get("version", 0)
+        self.state = state
+        return state
+
+    def acknowledge(self):
+        """현재 상태를 적용했음을 기록"""
+        try:
+            write_json_atomic(ack_path(self.path), {
+                "version": self.version,
+                "paused": self.paused,
+                "applied_at": time.time()
+            })
+        except OSError as e:
+            print(f"제어 적용 기록 실패: {e}")
@@ -0,0 +1,133 @@
+# dom_query.py - 예약목록 DOM 조회 모듈 (execute_script 1회로 필요한 정보 추출)
+# 선택자마다 find_elements / get_attribute / text를 호출하면 요소 수만큼 WebDriver HTTP 왕복이 발생합니다.
+# 이 모듈은 주문번호 링크, 행 상태, LMS 버튼 종류를 브라우저 안에서 한 번에 조회하고,
+# 마지막으로 성공한 선택자 전략을 기억해 다음 조회에서 먼저 시도합니다.
+from typing import Dict, List, Optional
+
+# 주문번호 링크 선택자 전략 (기본 순서, 원래 검색 로직의 방법1 → 1-1 → 2 → 3 순서와 동일)
+ORDER_LINK_STRATEGIES = ["exact_href", "order_link", "blue_link_scan", "href_contains"]
+
+# 예약목록에서 주문번호 링크/행/LMS 버튼을 한 번에 조회하는 스크립트
+# arguments[0]: 주문번호, arguments[1]: 시도할 전략 순서
+FIND_ORDER_SCRIPT = """
+var orderNumber = arguments[0];
+var strategies = arguments[1];
+var exactHref = '/orders/' + orderNumber;
+
+function byStrategy(name) {
+    if (name === 'exact_href') {
+        return Array.prototype.slice.call(document.querySelectorAll('a.blue_link'))
+            .filter(function (a) { return a.getAttribute('href') === exactHref; });
+    }
+    if (name === 'order_link') {
+        return Array.prototype.slice.call(document.querySelectorAll('div.order_link a.blue_link'))
+            .filter(function (a) { return a.getAttribute('href') === exactHref; });
+    }
+    if (name === 'blue_link_scan') {
+        return Array.prototype.slice.call(document.querySelectorAll('a.blue_link'))
+            .filter(function (a) {
+                return (a.href || '').indexOf(orderNumber) !== -1 || (a.textContent || '').indexOf(orderNumber) !== -1;
+            });
+    }
+    if (name === 'href_contains') {
+        return Array.prototype.slice.call(document.querySelectorAll('a[href]'))
+            .filter(function (a) { return (a.getAttribute('href') || '').indexOf(exactHref) !== -1; });
+    }
+    return [];
+}
+
+function lmsButton(row) {
+    if (!row) { return {kind: null, element: null}; }
+    var resend = row.querySelector('a.send_lms');
+    if (resend) { return {kind: 'resend', element: resend}; }
+    var send = row.querySelector("input.send_lms.square_btn[value='LMS 전송']");
+    if (send) { return {kind: 'send', element: send}; }
+    return {kind: null, element: null};
+}
+
+for (var i = 0; i < strategies.length; i++) {
+    var links = byStrategy(strategies[i]);
+    if (links.length > 0) {
+        var rows = links.map(function (link) {
+            var row = link.closest('tr');
+            var button = lmsButton(row);
+            return {
+                link: link,
+                href: link.getAttribute('href'),
+                text: (link.textContent || '').trim(),
+                row_text: row ? (row.innerText || '').trim() : '',
+                lms_kind: button.kind,
+                lms_button: button.element
+            };
+        });
+        return {found_by: strategies[i], rows: rows, page_has_order: true, title: document.title, login_form: false};
+    }
+}
+return {
+    found_by: null,
+    rows: [],
+    page_has_order: document.documentElement.innerHTML.indexOf(orderNumber) !== -1,
+    title: document.title,
+    login_form: !!document.querySelector("input[name='userPasswd']")
+};
+"""
+
+
+class StrategyMemory:
+    """조회 종류별로 마지막으로 성공한 선택자 전략을 기억하여 먼저 시도"""
+
+    def __init__(self, default_order: List[str]):
+        self.default_order = list(default_order)
+        self.preferred: Optional[str] = None
+
+    def order(self) -> List[str]:
+        if self.preferred is None:
+            return list(self.default_order)
+        return [self.preferred] + [name for name in self.default_order if name != self.preferred]
+
+    def remember(self, strategy: Optional[str]):
+        if strategy is not None:
+            self.preferred = strategy
+
+
+class OrderListQuery:
+    """예약목록 페이지 DOM 조회 (주문번호 링크, 같은 행의 LMS 버튼)"""
+
+    def __init__(self, driver, metrics=None):
+        self.driver = driver
+        self.metrics = metrics
+        self.link_strategies = StrategyMemory(ORDER_LINK_STRATEGIES)
+        self._last_order = None
+        self._last_result = None
+
+    def find_order(self, order_number: str) -> Dict:
+        """
+        주문번호 링크와 행 정보를 한 번의 execute_script로 조회
+
+        Returns:
+            {"found_by": 성공한 전략 또는 None, "rows": [{"link", "href", "text", "row_text", "lms_kind", "lms_button"}],
+             "page_has_order": 페이지에 주문번호 문자열이 있는지, "title": 페이지 제목,
+             "login_form": 로그인 페이지로 이동되었는지 (세션 만료)}
+        """
+        if self.metrics is not None:
+            with self.metrics.span('dom_query.find_order'):
+                result = self.driver.execute_script(FIND_ORDER_SCRIPT, order_number, self.link_strategies.order())
+        else:
+            result = self.driver.execute_script(FIND_ORDER_SCRIPT, order_number, self.link_strategies.order())
+        self.link_strategies.remember(result.get("found_by"))
+        self._last_order, self._last_result = order_number, result
+        return result
+
+    def cached_link(self, order_number: str):
+        """직전 find_order 조회에서 찾은 주문번호 링크 요소 (같은 주문번호일 때만, 없으면 None)"""
+        if self._last_order == order_number and self._last_result and self._last_result["rows"]:
+            return self._last_result["rows"][0]["link"]
+        return None
+
+    def find_lms_button(self, order_number: str):
+        """주문번호 행의 LMS 버튼 조회 → (버튼 요소, "재전송"/"전송") 또는 (None, None)"""
+        result = self.find_order(order_number)
+        for row in result["rows"]:
+            if row.get("lms_button") is not None:
+                return row["lms_button"], ("재전송" if row["lms_kind"] == "resend" else "전송")
+        return None, None
@@ -0,0 +1,1323 @@
+# engine.py - 예약확정처리 시스템 v2.0 RPA 엔진
+# admin_confirm_rpa_v2.0.py의 처리 로직을 import 가능한 엔진으로 분리한 모듈
+# - import 시점에는 아무 작업도 하지 않음 (설정 로드, 디렉토리 생성, 드라이버 실행, 로그인 모두 명시적 호출)
+# - 실행기의 warm worker가 selenium 등 무거운 모듈을 미리 import 해 둔 상태에서 바로 실행할 수 있음
+
+import os
+import re
+import time
+import json
+import shutil
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+from selenium import webdriver
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.common.alert import Alert
+from selenium.webdriver.support.ui import WebDriverWait, Select
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.chrome.service import Service
+from selenium.common.exceptions import NoSuchElementException
+from webdriver_manager.chrome import ChromeDriverManager
+
+from rpa.dom_query import OrderListQuery
+from rpa.metrics import MetricsRegistry, timed
+from rpa.session import DEFAULT_MAX_AGE_HOURS, SESSION_KEY_ENV, SessionCache, SessionExpiredError, is_login_page, session_cipher
+from rpa.upload_ledger import LEDGER_FILE_NAME, UploadLedger, write_chunk_sheet
+from rpa.control import LIVE_TIMING_KEYS, PAUSE_CHECK_INTERVAL, ControlChannel
+from rpa.canary import CanaryMonitor, report_lines as canary_report_lines, write_report as write_canary_report
+from rpa.supervisor import BrowserSupervisor, is_dead_session
+from rpa.retry import (
+    LMS_UNCONFIRMED_RESULT, STAGE_LMS, STAGE_ORDER, TRANSIENT, TRANSIENT_STATUS_RESULTS,
+    LmsUnconfirmedError, RetryPolicy, RetryQueue, TransientPageError, classify_exception, is_error_page_title
+)
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# 프로젝트별 독립적인 Lock 파일 (동시 실행 방지)
+LOCK_FILE = str(PROJECT_ROOT / 'admin_confirm_v2.0.lock')
+
+# 중단 요청(STOP_FILE_PATH)으로 남은 주문을 처리하지 않고 종료한 경우의 종료 코드 (실행기가 stopped로 기록)
+EXIT_STOPPED = 3
+# 카나리 판정 실패로 남은 주문을 처리하지 않고 종료한 경우의 종료 코드 (실행기가 failed로 기록)
+EXIT_CANARY_FAILED = 4
+
+
+# ✅ 1. [설정 파일 로드] - 웹 인터페이스 연동 지원
+def load_config(config_file: str) -> Optional[Dict]:
+    """설정 파일 로드 (실패 시 None)"""
+    try:
+        with open(config_file, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+        print(f"설정 파일 로드 완료: {config_file}")
+        return config
+    except FileNotFoundError:
+        print(f"오류: {config_file} 파일을 찾을 수 없습니다.")
+    except json.JSONDecodeError as e:
+        print(f"오류: {config_file} 파일 형식이 잘못되었습니다. {e}")
+    return None
+
+
+def describe_plan(run_plan: Dict) -> str:
+    """실행 계획 요약 (배치 실행은 파일 수 포함)"""
+    from services.run_plan import plan_files
+    files = plan_files(run_plan)
+    orders = sum(len(file_plan['orders']) for file_plan in files)
+    return f"파일 {len(files)}개, 주문 {orders}건" if len(files) > 1 else f"주문 {orders}건"
+
+
+def load_or_compile_run_plan(config: Dict, execution_id: str, run_plan_file: Optional[str] = None) -> Optional[Dict]:
+    """
+    실행 계획 로드 (서버에서 컴파일한 상태 코드, 검색 URL 템플릿, 주문 목록, 타이밍)
+
+    브라우저를 띄우기 전에 실행 전 점검(services/preflight.py)을 수행하며, 문제가 있으면 모두 출력하고 None 반환
+    """
+    from services.preflight import PreflightError
+    try:
+        if run_plan_file:
+            # 서버에서 전달받은 경우 pandas/openpyxl import 및 Excel 파싱이 필요 없음
+            from services.run_plan import load_run_plan
+            from services.preflight import check_run_plan
+            run_plan = load_run_plan(run_plan_file)
+            problems = check_run_plan(config, run_plan)
+            if problems:
+                raise PreflightError(problems)
+            print(f"실행 계획 로드 완료: {run_plan_file} ({describe_plan(run_plan)})")
+        else:
+            # 단독 실행: 설정 파일로 직접 컴파일 (master_data.xlsx, 주문 엑셀 파싱 및 실행 전 점검 포함)
+            from services.run_plan import compile_run_plan_from_config
+            run_plan = compile_run_plan_from_config(config, execution_id)
+            print(f"실행 계획 컴파일 완료 (단독 실행, {describe_plan(run_plan)})")
+        return run_plan
+    except PreflightError as e:
+        print(f"오류: 실행 전 점검에서 문제 {len(e.problems)}건을 발견했습니다.")
+        for item in e.problems:
+            print(f"  - {item['field']}: {item['message']}" if item.get('field') else f"  - {item['message']}")
+        return None
+    except Exception as e:
+        print(f"오류: 실행 계획을 준비할 수 없습니다. {e}")
+        return None
+
+
+# ✅ 2. [초기화] 상대 경로를 절대 경로로 변환하는 함수
+def resolve_path(path_str):
+    """상대 경로를 절대 경로로 변환 (프로젝트 폴더 기준)"""
+    if not path_str:
+        return None
+    
+    # 이미 절대 경로인 경우 그대로 반환
+    if os.path.isabs(path_str):
+        return path_str
+    
+    # 상대 경로인 경우 프로젝트 루트 기준으로 변환
+    return str(PROJECT_ROOT / Path(path_str))
+
+
+# ✅ 자동 인덱스 파일명 생성 함수
+def generate_log_filename(base_dir, prefix, today):
+    index = 1
+    while True:
+        file_name = f"{prefix}_{index:03}_{today}.txt"
+        full_path = os.path.join(base_dir, file_name)
+        if not os.path.exists(full_path):
+            return full_path
+        index += 1
+
+
+# ✅ Lock 파일 관리 (동시 실행 방지)
+def check_lock_file():
+    """Lock 파일 확인 (동시 실행 방지)"""
+    if os.path.exists(LOCK_FILE):
+        try:
+            with open(LOCK_FILE, 'r') as f:
+                lock_time = f.read().strip()
+            print(f"⚠️ 다른 프로세스가 실행 중입니다. Lock 시간: {lock_time}")
+            return False
+        except:
+            # Lock 파일이 손상된 경우 삭제
+            os.remove(LOCK_FILE)
+            return True
+    return True
+
+def create_lock_file():
+    """Lock 파일 생성"""
+    try:
+        with open(LOCK_FILE, 'w') as f:
+            f.write(f"{datetime.now().strftime('%Y-%m-%d %H:%M:%S')} (v2.0)")
+        return True
+    except:
+        return False
+
+def remove_lock_file():
+    """Lock 파일 제거"""
+    try:
+        if os.path.exists(LOCK_FILE):
+            os.remove(LOCK_FILE)
+    except:
+        pass
+
+
+class AdminConfirmEngine:
+    """예약확정처리 RPA 엔진 (업로드 → 주문별 검색/상태 변경/LMS 전송)"""
+    
+    def __init__(self, config: Dict, run_plan: Dict, execution_id: str = 'unknown', execution_mode: str = 'standalone',
+                 metrics_path: Optional[str] = None, stop_file: Optional[str] = None, control_file: Optional[str] = None,
+                 canary_report_path: Optional[str] = None):
+        """
+        RPA 엔진 초기화 (부수 효과 없음)
+        
+        Args:
+            config: 런타임 설정
+            run_plan: 실행 계획 (services.run_plan.compile_run_plan 결과)
+            execution_id: 실행 ID
+            execution_mode: 실행 모드 (web_interface / standalone)
+            metrics_path: 단계별 소요 시간 계측 결과를 저장할 파일 (서버가 /metrics에 집계)
+            stop_file: 중단 요청 파일 - 이 파일이 생기면 처리 중인 주문을 마친 뒤 남은 주문을 처리하지 않고 종료
+            control_file: 제어 파일 - 일시정지/재개, 타이밍/탭 수 변경을 주문 사이에서 적용 (rpa/control.py)
+            canary_report_path: 카나리 판정 보고서를 저장할 파일 (실행기가 실행 이력에 첨부)
+        """
+        self.config = config
+        self.execution_id = execution_id
+        self.execution_mode = execution_mode
+        self.metrics_path = metrics_path
+        self.stop_file = stop_file
+        self.stopped = False  # 중단 요청으로 종료했는지 여부
+        # 실행 중 제어 (탭 복사본과 공유 - 설정 변경은 먼저 확인한 탭이 한 번만 적용)
+        self.control = ControlChannel(control_file) if control_file else None
+        self.timing_overrides = {}  # 실행 중 변경한 타이밍 (배치 실행의 다음 파일에도 유지)
+        # 카나리 실행 (실행 계획 canary - 실행당 한 번, 배치 실행은 파일 경계를 넘어 실행의 앞 N건)
+        self.canary_report_path = canary_report_path
+        self.canary = None
+        self.canary_report = None
+        self.canary_failed = False
+        self.canary_remaining = 0  # 카나리 구간에 남은 주문 수
+        
+        # 단계/선택자 fallback별 소요 시간 히스토그램
+        self.metrics = MetricsRegistry()
+        
+        self.last_error = None  # 현재 시도에서 처음 발생한 예외 (실패 분류용)
+        self.session_expired = False  # 현재 시도 중 로그인 페이지로 이동되었는지 여부
+        self.session_cipher_warned = False  # 세션 암호화를 사용할 수 없다는 안내를 출력했는지 여부
+        self.relogin_count = 0
+        
+        self.driver = None
+        self.chromedriver_path = None  # 브라우저 재시작 시 ChromeDriver 설치 확인 생략
+        # 장시간 실행 시 N건/메모리 기준 브라우저 재시작, 세션 끊김 복구 (rpa/supervisor.py)
+        self.supervisor = BrowserSupervisor.from_config(self, config.get('browser'))
+        self.order_list = None  # 예약목록 DOM 조회 (브라우저 실행 후 생성)
+        self.main_window = None  # 주문 처리 창 (탭 동시 처리 시 탭별 복사본마다 자기 탭)
+        self.tab_scheduler = None  # 탭 동시 처리 시 WebDriver 사용 순서 조정 (rpa/tabs.py)
+        self.tab_index = None
+        self.log_file = None
+        self.result_file = None
+        self.result_dir = None
+        self.result_store = None  # 주문별 결과 DB (prepare_output에서 생성)
+        
+        # 배치 실행(services.run_plan.compile_checked_run_plan)은 파일별 계획 여러 개를 순서대로 처리
+        from services.run_plan import plan_files
+        self.plan_files = plan_files(run_plan)
+        self.batch_summary = []
+        self.load_plan(self.plan_files[0])
+        canary_plan = self.run_plan.get('canary')
+        if canary_plan:
+            self.canary_remaining = min(canary_plan['orders'], sum(len(file_plan['orders']) for file_plan in self.plan_files))
+    
+    def load_plan(self, run_plan: Dict):
+        """실행 계획 적용 (분산 실행 에이전트는 같은 브라우저로 리스마다 새 계획을 적용)"""
+        self.run_plan = run_plan
+        
+        # 일시적 실패 재시도 (본 처리 후 지수 백오프로 재시도, 주문별 최대 시도 횟수 제한)
+        self.retry_policy = RetryPolicy.from_dict(run_plan.get('retry'))
+        self.retry_queue = RetryQueue(self.retry_policy)
+        
+        # ✅ URL 설정 자동 동기화: login.url을 기반으로 base_url 설정 (실행 계획 컴파일 시 결정됨)
+        self.config.setdefault('urls', {})['base_url'] = run_plan['base_url']
+        
+        # 🔥 상태 매핑 (실행 계획에서 미리 변환된 값 사용 - 주문별 매핑 작업 없음)
+        self.target_status_value = run_plan['status']['target_value']  # 영문 코드 (예: "confirm")
+        self.target_status_text = run_plan['status']['target_text']  # 한글 표시명 (예: "확정")
+        self.status_text_to_code = run_plan['status']['text_to_code']  # 한글 → 영문 (상세페이지 드롭다운 텍스트 변환용)
+    
+    # ✅ 로그 및 결과 디렉토리/파일 준비 (상대 경로 지원)
+    def prepare_output(self):
+        today = datetime.now().strftime('%Y%m%d')
+        log_dir = resolve_path(self.config['file_paths']['log_directory']) or str(PROJECT_ROOT / 'logs')
+        result_dir = resolve_path(self.config['file_paths']['result_directory']) or str(PROJECT_ROOT / 'results')
+        os.makedirs(log_dir, exist_ok=True)
+        os.makedirs(result_dir, exist_ok=True)
+        self.result_dir = result_dir
+        
+        # 로그 및 결과 파일명 자동 생성 (배치 실행은 파일마다 결과 파일을 따로 생성 - start_batch_file)
+        self.log_file = generate_log_filename(log_dir, "로그_v2.0", today)
+        self.result_file = generate_log_filename(result_dir, "전송여부결과_v2.0", today)
+        
+        # 결과 파일과 같은 내용을 같은 결과 디렉토리의 조회용 DB에도 기록 (/api/results)
+        from services.result_store import ResultStore, result_db_path
+        self.result_store = ResultStore(result_db_path(result_dir))
+    
+    # ✅ 안전한 타이밍 접근자 (실행 계획의 타이밍 프로파일 사용, 키가 없어도 동작)
+    def get_timing(self, name, default_seconds):
+        if name in self.timing_overrides:
+            return self.timing_overrides[name]
+        return float(self.run_plan['timing'].get(name, default_seconds))
+    
+    def get_timing_adv(self, name, default_seconds):
+        """고급 타이밍 설정 (timing → timing_advanced 순서로 실행 계획 컴파일 시 결정됨)"""
+        return self.get_timing(name, default_seconds)
+    
+    def pause(self, seconds):
+        """페이지 로딩/안정화 대기 (탭 동시 처리 중에는 대기하는 동안 다른 탭이 WebDriver를 사용)"""
+        if self.tab_scheduler is None:
+            time.sleep(seconds)
+        else:
+            self.tab_scheduler.pause(seconds)
+    
+    def open_url(self, url):
+        """페이지 이동 (탭 동시 처리 중에는 로딩 완료를 기다리는 동안 다른 탭이 WebDriver를 사용)"""
+        if self.tab_scheduler is None:
+            self.driver.get(url)
+            return
+        from rpa.tabs import NAVIGATE_SCRIPT, NAVIGATION_DONE_SCRIPT, NAVIGATION_POLL_INTERVAL
+        self.driver.execute_script(NAVIGATE_SCRIPT, url)
+        deadline = time.monotonic() + self.get_timing('page_load_timeout', 30)
+        while True:
+            self.pause(NAVIGATION_POLL_INTERVAL)
+            try:
+                if self.driver.execute_script(NAVIGATION_DONE_SCRIPT):
+                    return
+            except Exception:
+                pass  # 문서 교체 중
+            if time.monotonic() > deadline:
+                raise TransientPageError(f"페이지 로딩 시간 초과: {url}")
+    
+    def tab_count(self) -> int:
+        """주문 동시 처리 탭 수 (설정 browser.tabs, 기본 1)"""
+        try:
+            return max(1, int(self.config.get('browser', {}).get('tabs', 1)))
+        except (TypeError, ValueError):
+            return 1
+    
+    def start_batch_file(self, index: int, file_plan: Dict):
+        """배치 실행: 다음 파일의 실행 계획 적용 및 파일별 결과 파일 준비 (브라우저/로그인 세션은 그대로 사용)"""
+        self.load_plan(file_plan)
+        label = file_plan.get('file_label') or Path(file_plan['excel_file']).name
+        safe_label = re.sub(r'[\\/:*?"<>|#.\s]+', '_', label)
+        self.result_file = generate_log_filename(self.result_dir, f"전송여부결과_v2.0_{safe_label}",
+                                                 datetime.now().strftime('%Y%m%d'))
+        self.log_debug("-" * 60)
+        self.log_debug(f"파일 {index}/{len(self.plan_files)}: {label} (주문 {len(file_plan['orders'])}건)")
+        self.log_debug(f"결과 파일: {self.result_file}")
+    
+    def log_batch_summary(self):
+        """배치 실행의 파일별 처리 요약 기록"""
+        self.log_debug("=" * 60)
+        self.log_debug(f"배치 실행 요약 (파일 {len(self.plan_files)}개)")
+        for item in self.batch_summary:
+            result = f", 결과 파일 {Path(item['result_file']).name}" if item['result_file'] else ""
+            self.log_debug(f"  {item['file']}: 주문 {item['orders']}건, {item['status']}{result}")
+        for file_plan in self.plan_files[len(self.batch_summary):]:
+            self.log_debug(f"  {file_plan.get('file_label')}: 처리하지 않음 ({'카나리중단' if self.canary_failed else '중단'})")
+    
+    # ✅ 로그 파일에 기록 (디버깅, 오류, 처리 과정)
+    def log_debug(self, message, order_number=None):
+        """로그 메시지 기록 (주문번호 포함 가능)"""
+        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        if order_number:
+            log_content = f"[{timestamp}] [주문번호: {order_number}] {message}"
+        else:
+            log_content = f"[{timestamp}] {message}"
+        with open(self.log_file, 'a', encoding='utf-8') as f:
+            f.write(log_content + '\n')
+        print(message)  # 콘솔에도 출력
+    
+    # ✅ 결과 파일에 기록 (최종 처리 결과, 마지막 열은 시도 횟수, row는 시트 행 번호 - 분산 실행 결과 보고용)
+    def log_result(self, order_number, confirm_number, status_result, lms_result, timestamp, attempts=1, row=None):
+        result_content = f"{order_number}\t{confirm_number}\t{status_result}\t{lms_result}\t{timestamp}\t{attempts}"
+        with open(self.result_file, 'a', encoding='utf-8') as f:
+            f.write(result_content + '\n')
+        if self.canary is not None:
+            self.canary.record(status_result, lms_result)
+        if self.result_store is not None:
+            try:
+                self.result_store.record(self.execution_id, order_number, confirm_number, status_result, lms_result,
+                                         timestamp, attempts=attempts, result_file=self.result_file)
+            except Exception as e:
+                print(f"결과 DB 기록 실패 (결과 파일에는 기록됨): {e}")
+        self.log_debug(f"결과 기록: {result_content}")
+    
+    # ✅ 실패 원인 기록 (한 시도에서 처음 발생한 예외를 원인으로 사용)
+    def record_error(self, error):
+        if self.last_error is None:
+            self.last_error = error
+    
+    # ✅ 중단 요청 확인 (주문 사이에서 확인하여 처리 중인 주문은 끝까지 진행)
+    def stop_requested(self) -> bool:
+        return bool(self.stop_file) and os.path.exists(self.stop_file)
+    
+    # ✅ 실행 중 제어 확인 (주문 사이에서 확인하여 처리 중인 주문은 끝까지 진행)
+    def control_checkpoint(self):
+        """변경된 설정 적용, 일시정지 중이면 재개 또는 중단 요청까지 대기 (남은 주문/재시도 큐는 그대로 유지)"""
+        if self.control is None:
+            return
+        self.poll_control()
+        if not self.control.paused:
+            return
+        paused_at = time.monotonic()
+        while self.control.paused and not self.stop_requested():
+            self.pause(PAUSE_CHECK_INTERVAL)  # 탭 동시 처리 중에는 대기하는 동안 다른 탭도 일시정지 확인
+            self.poll_control()
+        self.metrics.observe('control.paused', time.monotonic() - paused_at)
+    
+    def poll_control(self):
+        """제어 파일이 바뀌었으면 적용하고 적용 결과 기록"""
+        was_paused = self.control.paused
+        state = self.control.poll()
+        if state is None:
+            return
+        changes = []
+        for name, value in (state.get('timing') or {}).items():
+            if name not in LIVE_TIMING_KEYS:
+                continue
+            try:
+                value = float(value)
+            except (TypeError, ValueError):
+                continue
+            if self.timing_overrides.get(name) != value:
+                self.timing_overrides[name] = value
+                changes.append(f"{name}={value:g}초")
+        tabs = state.get('tabs')
+        if tabs is not None and int(tabs) != self.tab_count():
+            self.config.setdefault('browser', {})['tabs'] = int(tabs)
+            changes.append(f"탭 {int(tabs)}개")
+        if changes:
+            self.metrics.increment("control.settings")
+            self.log_debug(f"실행 중 설정 변경 적용: {', '.join(changes)}")
+        if self.control.paused != was_paused:
+            self.metrics.increment("control.pause" if self.control.paused else "control.resume")
+            self.log_debug("일시정지 - 재개 또는 중단 요청을 기다립니다." if self.control.paused else "재개 - 남은 주문을 이어서 처리합니다.")
+        self.control.acknowledge()
+    
+    def continue_in_tabs(self, remaining_orders) -> bool:
+        """실행 중 탭 수를 늘린 경우 남은 주문(재시도 대기 포함)을 탭으로 동시 처리, 전환했으면 True"""
+        tab_count = min(self.tab_count(), len(remaining_orders) + len(self.retry_queue))
+        if tab_count <= 1:
+            return False
+        self.log_debug(f"탭 {tab_count}개로 전환하여 남은 주문 {len(remaining_orders)}건, 재시도 대기 {len(self.retry_queue)}건을 처리합니다.")
+        from rpa.tabs import process_in_tabs
+        process_in_tabs(self, remaining_orders, tab_count)
+        return True
+    
+    def stop_remaining(self, remaining_orders):
+        """중단 요청 시 남은 주문과 재시도 대기 주문을 결과에 기록"""
+        self.stopped = True
+        retry_items = self.retry_queue.drain()
+        self.log_debug(f"중단 요청으로 남은 주문 {len(remaining_orders)}건, 재시도 대기 {len(retry_items)}건을 처리하지 않고 종료합니다.")
+        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        for data in remaining_orders:
+            self.log_result(data['order_number'], data['confirm_number'], "중단", "미처리", timestamp, attempts=0, row=data.get('row'))
+        for item in retry_items:
+            # 재시도 전 마지막 시도 결과 (LMS 재시도 대기 주문은 상태 변경 성공이 그대로 남음)
+            status_result, lms_result = item.get('last_result') or ("중단", "미처리")
+            self.log_result(item['order']['order_number'], item['order']['confirm_number'], status_result, lms_result,
+                            timestamp, attempts=item['attempts'], row=item['order'].get('row'))
+    
+    # ✅ 실행 시작 로그
+    def log_start(self):
+        self.log_debug("=" * 60)
+        self.log_debug(f"실행 파일: admin_confirm_rpa_v2.0.py")
+        self.log_debug(f"실행 모드: {self.execution_mode}")
+        self.log_debug(f"실행 ID: {self.execution_id}")
+        self.log_debug(f"실행 시작: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        self.log_debug(f"로그 파일: {self.log_file}")
+        if len(self.plan_files) > 1:
+            self.log_debug(f"배치 실행: 파일 {len(self.plan_files)}개 (결과 파일은 파일마다 생성)")
+        else:
+            self.log_debug(f"결과 파일: {self.result_file}")
+        canary_plan = self.run_plan.get('canary')
+        if canary_plan:
+            self.log_debug(f"카나리 실행: 앞 {canary_plan['orders']}건, 실패율 기준 {canary_plan['max_failure_rate']:.0%}")
+        self.log_debug("=" * 60)
+    
+    # ✅ 3. [드라이버 실행 및 로그인]
+    @timed('launch_browser')
+    def launch_browser(self) -> bool:
+        """ChromeDriver 설정 및 브라우저 실행"""
+        try:
+            if self.chromedriver_path is None:
+                print("ChromeDriver 자동 다운로드 및 설정 중...")
+                self.chromedriver_path = ChromeDriverManager().install()
+            service = Service(self.chromedriver_path)
+            options = webdriver.ChromeOptions()
+            # 벤치마크/서버 환경용 headless 실행 (설정: browser.headless)
+            if self.config.get('browser', {}).get('headless', False):
+                options.add_argument('--headless=new')
+                options.add_argument('--no-sandbox')
+                options.add_argument('--disable-dev-shm-usage')
+            self.driver = webdriver.Chrome(service=service, options=options)
+            self.order_list = OrderListQuery(self.driver, self.metrics)
+            print("ChromeDriver 설정 완료!")
+        except Exception as e:
+            print(f"ChromeDriver 설정 실패: {e}")
+            return False
+        
+        self.driver.maximize_window()
+        self.driver.set_window_position(0, 0)
+        self.driver.set_window_size(1920, 1080)
+        return True
+    
+    # 3-1. 로그인 (저장된 세션이 유효하면 로그인 폼 생략)
+    @timed('login')
+    def login(self) -> bool:
+        session_cache = self.get_session_cache()
+        if session_cache is not None and self.restore_session(session_cache):
+            print("로그인 완료! (저장된 세션 재사용)")
+            return True
+        if not self.login_with_form():
+            return False
+        if session_cache is not None:
+            try:
+                session_cache.save(self.driver.get_cookies())
+            except Exception as e:
+                print(f"세션 저장 실패 (다음 실행에서 다시 로그인): {e}")
+        print("로그인 완료!")
+        return True
+    
+    def get_session_cache(self) -> Optional[SessionCache]:
+        """세션 저장소 (설정 login.reuse_session이 false이거나 쿠키를 암호화할 수 없으면 None)"""
+        login_config = self.config['login']
+        if not login_config.get('reuse_session', True):
+            return None
+        if session_cipher() is None:
+            if not self.session_cipher_warned:
+                self.session_cipher_warned = True
+                print(f"세션 암호화를 사용할 수 없어 로그인 세션을 저장하지 않습니다 "
+                      f"(Windows: pywin32 설치, 그 외: cryptography 설치 + {SESSION_KEY_ENV} 환경변수)")
+            return None
+        return SessionCache(login_config['url'], login_config['user_id'],
+                            max_age_hours=login_config.get('session_max_age_hours', DEFAULT_MAX_AGE_HOURS))
+    
+    def restore_session(self, session_cache: SessionCache) -> bool:
+        """저장된 쿠키를 주입하고 예약목록 페이지가 로그인 없이 열리는지 확인"""
+        cookies = session_cache.load()
+        if not cookies:
+            return False
+        try:
+            with self.metrics.span('login.restore_session'):
+                # 쿠키는 같은 도메인 페이지를 연 상태에서만 추가할 수 있음
+                self.driver.get(self.config['login']['url'])
+                self.driver.delete_all_cookies()
+                for cookie in cookies:
+                    self.driver.add_cookie(cookie)
+                self.driver.get(self.run_plan['orders_url'])
+                valid = not is_login_page(self.driver)
+        except Exception as e:
+            print(f"저장된 세션 적용 실패: {e}")
+            valid = False
+        if not valid:
+            session_cache.clear()
+            self.metrics.increment("session.restore_failed")
+            return False
+        self.metrics.increment("session.reused")
+        return True
+    
+    def login_with_form(self) -> bool:
+        """로그인 폼 입력 (고정 대기 대신 입력란 표시/로그인 페이지 이탈을 기다림)"""
+        timeout = self.get_timing('login_timeout', 10)
+        try:
+            self.driver.get(self.config['login']['url'])
+            user_input = WebDriverWait(self.driver, timeout).until(EC.presence_of_element_located((By.NAME, "userId")))
+            user_input.clear()
+            user_input.send_keys(self.config['login']['user_id'])
+            password_input = self.driver.find_element(By.NAME, "userPasswd")
+            password_input.clear()
+            password_input.send_keys(self.config['login']['password'])
+            self.driver.find_element(By.XPATH, "//input[@type='submit']").click()
+            WebDriverWait(self.driver, timeout).until(lambda driver: not is_login_page(driver))
+            return True
+        except Exception as e:
+            print(f"로그인 실패: {e}")
+            return False
+    
+    def relogin(self, expired_at: Optional[float] = None) -> bool:
+        """실행 중 세션 만료 시 저장된 세션을 지우고 다시 로그인 (expired_at 이후 다른 탭이 이미 재로그인했으면 생략)"""
+        if self.tab_scheduler is not None and expired_at is not None and self.tab_scheduler.relogged_since(expired_at):
+            return True
+        self.relogin_count += 1
+        self.metrics.increment("session.relogin")
+        session_cache = self.get_session_cache()
+        if session_cache is not None:
+            session_cache.clear()
+        if self.main_window is not None:
+            self.driver.switch_to.window(self.main_window)
+        with self.metrics.span('session.relogin'):
+            success = self.login_with_form()
+        if success and session_cache is not None:
+            try:
+                session_cache.save(self.driver.get_cookies())
+            except Exception as e:
+                print(f"세션 저장 실패: {e}")
+        if not success:
+            self.metrics.increment("session.relogin_failed")
+        elif self.tab_scheduler is not None:
+            self.tab_scheduler.mark_relogin()
+        return success
+    
+    def quit_browser(self):
+        """브라우저 종료"""
+        if self.driver is not None:
+            try:
+                self.driver.quit()
+            except Exception:
+                pass
+            self.driver = None
+    
+    # ✅ 4. [1단계: 엑셀 파일 업로드]
+    # 업로드 기록(rpa/upload_ledger.py)에 있는 시트/분할 파일은 건너뛰고, 큰 시트는 분할하여 순서대로 업로드
+    @timed('upload_excel_file')
+    def upload_excel_file(self):
+        upload_plan = self.run_plan.get('upload') or {}
+        excel_path = self.run_plan['excel_file']
+        ledger = None
+        if upload_plan.get('skip_uploaded') and upload_plan.get('sheet_hash'):
+            ledger = UploadLedger(self.run_plan['upload_url'], upload_plan.get('ledger_days', 7),
+                                  path=Path(self.result_dir) / LEDGER_FILE_NAME)
+        
+        print("1단계: 엑셀 파일 업로드 시작...")
+        if ledger is not None and ledger.get(upload_plan['sheet_hash']):
+            print("1단계: 같은 내용의 시트를 이미 업로드했습니다. 업로드를 건너뜁니다.")
+            self.metrics.increment("upload.skipped")
+            return True
+        
+        chunks = upload_plan.get('chunks') or []
+        if chunks:
+            print(f"1-0. 시트 {upload_plan['rows']}행을 {len(chunks)}개 파일로 나누어 업로드합니다.")
+        
+        chunk_dir = None
+        try:
+            # 1. 로그인 완료 후 예약목록 페이지 이동
+            orders_url = self.run_plan['orders_url']
+            print(f"1-1. 예약목록 페이지 이동: {orders_url}")
+            self.driver.get(orders_url)
+            time.sleep(self.get_timing('page_load_wait', 2))
+            print(f"1-1-1. 현재 페이지 URL: {self.driver.current_url}")
+            print(f"1-1-2. 페이지 제목: {self.driver.title}")
+            
+            # 예약목록 페이지 안정화 대기
+            print("1-1-3. 예약목록 페이지 안정화 대기 (2초)...")
+            time.sleep(2)
+            
+            if not chunks:
+                if not self.upload_sheet(excel_path):
+                    return False
+            else:
+                chunk_dir = tempfile.mkdtemp(prefix="admin_confirm_upload_")
+                for chunk in chunks:
+                    label = f"{chunk['index']}/{len(chunks)}"
+                    if ledger is not None and ledger.get(chunk['hash']):
+                        print(f"분할 {label} ({chunk['rows']}행): 이미 업로드됨 - 건너뜀")
+                        self.metrics.increment("upload.chunk_skipped")
+                        continue
+                    print(f"분할 {label} ({chunk['rows']}행) 업로드...")
+                    chunk_path = write_chunk_sheet(excel_path, upload_plan, chunk, chunk_dir)
+                    if not self.upload_sheet(chunk_path):
+                        print(f"분할 {label} 업로드 실패 - 다음 실행에서는 이 분할부터 업로드합니다.")
+                        return False
+                    self.metrics.increment("upload.chunk_uploaded")
+                    if ledger is not None:
+                        ledger.record(chunk['hash'], self.execution_id, chunk['rows'], f"chunk {label}")
+            
+            if ledger is not None:
+                ledger.record(upload_plan['sheet_hash'], self.execution_id, upload_plan.get('rows', 0), Path(excel_path).name)
+            print("1단계: 엑셀 파일 업로드 완료!")
+            
+            # 창 상태 확인
+            print(f"업로드 후 창 개수: {len(self.driver.window_handles)}")
+            print(f"현재 페이지 URL: {self.driver.current_url}")
+            
+            return True
+            
+        except Exception as e:
+            print(f"1단계: 엑셀 파일 업로드 실패 - {e}")
+            return False
+        finally:
+            if chunk_dir:
+                shutil.rmtree(chunk_dir, ignore_errors=True)
+    
+    def upload_sheet(self, excel_path) -> bool:
+        """업로드 페이지를 새창으로 열어 파일 1개 업로드 (실패 시 창 상태 복구)"""
+        try:
+            # 2. 새창을 열고 업로드 페이지 접속
+            upload_url = self.run_plan['upload_url']
+            print(f"1-2. 새창에서 업로드 페이지 접속: {upload_url}")
+            self.driver.execute_script(f"window.open('{upload_url}', '_blank');")
+            time.sleep(1)  # 새창 열기 시간 단축
+            
+            # 새창으로 전환
+            windows = self.driver.window_handles
+            if len(windows) > 1:
+                self.driver.switch_to.window(windows[-1])
+                time.sleep(self.get_timing('page_load_wait', 2))
+                print(f"1-3. 새창으로 전환 완료")
+            
+            # 3. 파일 업로드 요소 찾기 및 파일 선택
+            print("1-4. 파일 업로드 요소 찾기...")
+            with self.metrics.span('upload.selector.file_input'):
+                file_input = self.driver.find_element(By.ID, "excelFile")
+            print(f"1-5. 엑셀 파일 선택: {excel_path}")
+            file_input.send_keys(excel_path)
+            time.sleep(1)
+            
+            # 4. 업로드 버튼 클릭
+            print("1-6. 업로드 버튼 클릭...")
+            with self.metrics.span('upload.selector.upload_button'):
+                upload_button = self.driver.find_element(By.XPATH, "//button[text()='업로드']")
+            upload_button.click()
+            time.sleep(self.get_timing('upload_wait', 2))
+            
+            # 5. 업로드 성공 시스템 알럿 처리
+            print("1-7. 시스템 알럿 처리...")
+            try:
+                alert = Alert(self.driver)
+                alert.accept()
+                print("업로드 성공 알럿 확인 완료")
+            except:
+                print("알럿이 없거나 이미 처리됨")
+            
+            # 6. 새창 닫기
+            print("1-8. 새창 닫기...")
+            self.driver.close()
+            self.driver.switch_to.window(windows[0])
+            return True
+            
+        except Exception as e:
+            print(f"엑셀 파일 업로드 실패 ({Path(excel_path).name}) - {e}")
+            # 창 상태 복구
+            try:
+                windows = self.driver.window_handles
+                if len(windows) > 1:
+                    self.driver.close()
+                self.driver.switch_to.window(self.driver.window_handles[0])
+            except:
+                pass
+            return False
+
+    # ✅ 5. [2단계: 주문번호로 검색]
+    @timed('search_order_by_number')
+    def search_order_by_number(self, order_number, search_status=None):
+        """주문번호로 검색하여 검색결과 페이지로 이동하고 검색 결과를 확인합니다. (search_status: 검색할 상태, 기본값은 변경 전 상태)"""
+        try:
+            self.log_debug(f"주문번호 검색 시작", order_number)
+            
+            # 검색 URL 생성 (실행 계획의 검색 URL 템플릿에 주문번호만 삽입)
+            search_url = self.run_plan['search_url_template'].replace('{order_number}', order_number)
+            if search_status is not None and search_status != self.run_plan['search_status']:
+                # LMS 재시도 등 이미 상태가 바뀐 주문은 바뀐 상태로 검색
+                search_url = search_url.replace(f"orderProductStatus={self.run_plan['search_status']}&", f"orderProductStatus={search_status}&")
+            else:
+                search_status = self.run_plan['search_status']
+            self.log_debug(f"검색 URL 생성 완료", order_number)
+            self.log_debug(f"생성된 검색 URL: {search_url}", order_number)
+            self.log_debug(f"검색 조건 - 변경 전 상태: {search_status}, 주문번호: {order_number}", order_number)
+            
+            # 검색 페이지로 이동
+            with self.metrics.span('search.navigate'):
+                self.open_url(search_url)
+            self.pause(self.get_timing('page_load_wait', 2))  # 페이지 로딩 대기
+            
+            # 검색 결과 페이지 안정화 대기 (더 긴 대기 시간)
+            self.pause(3)
+            
+            # 현재 URL 확인 (디버그용)
+            current_url = self.driver.current_url
+            self.log_debug(f"검색 후 현재 URL: {current_url}", order_number)
+            
+            # 검색 결과 확인 (링크/행/LMS 버튼을 execute_script 1회로 조회, 마지막 성공 선택자 전략 우선)
+            try:
+                result = self.order_list.find_order(order_number)
+                if not result["rows"] and result["page_has_order"]:
+                    # 페이지에는 주문번호가 있지만 링크를 찾지 못한 경우 (렌더링 지연), 잠시 후 다시 조회
+                    self.log_debug(f"페이지에 주문번호 {order_number} 발견됨, 링크 재조회", order_number)
+                    self.pause(2)
+                    result = self.order_list.find_order(order_number)
+                found_by = result["found_by"]
+                links = result["rows"]
+                
+                # 어떤 선택자로 찾았는지 기록 (fallback 빈도 확인용)
+                self.metrics.increment(f"search.found_by.{found_by or 'none'}")
+                
+                if not links and result.get("login_form"):
+                    # 로그인 페이지로 이동됨 → 세션 만료 (handle_order에서 재로그인 후 다시 처리)
+                    self.log_debug("로그인 페이지로 이동되었습니다. 세션이 만료되었습니다.", order_number)
+                    self.session_expired = True
+                    self.metrics.increment("session.expired")
+                    self.record_error(SessionExpiredError("로그인 세션 만료"))
+                    return False
+                
+                if len(links) == 0:
+                    self.log_debug(f"검색 결과가 없습니다. 다음 주문번호로 진행합니다.", order_number)
+                    # 디버그: 페이지 제목과 URL 저장
+                    page_title = result["title"]
+                    self.log_debug(f"페이지 제목: {page_title}", order_number)
+                    if is_error_page_title(page_title):
+                        # 오류 페이지가 표시된 경우는 일시적 실패로 재시도
+                        self.record_error(TransientPageError(page_title))
+                    return False  # 검색 결과 없음
+                else:
+                    self.log_debug(f"검색 결과 확인: 주문번호 링크 {len(links)}개 발견 (선택자: {found_by})", order_number)
+                    return True
+            except Exception as e:
+                self.log_debug(f"검색 결과 확인 중 오류 발생: {e}", order_number)
+                self.record_error(e)
+                return False
+            
+        except Exception as e:
+            self.log_debug(f"주문번호 검색 실패: {e}", order_number)
+            self.record_error(e)
+            return False
+
+    # ✅ 6. [2단계: 상세페이지 열기 및 상태 변경]
+    @timed('change_reservation_status')
+    def change_reservation_status(self, order_number):
+        """주문번호 링크를 클릭하여 상세페이지를 열고 예약상태를 확정으로 변경합니다."""
+        try:
+            self.log_debug(f"상세페이지 열기 및 상태 변경 시작", order_number)
+            
+            # 주문번호 링크 클릭
+            try:
+                # 검색 시 조회한 링크 요소 재사용 (없으면 기본 선택자로 조회)
+                with self.metrics.span('change_status.selector.order_link'):
+                    link_element = self.order_list.cached_link(order_number) or self.driver.find_element(By.CSS_SELECTOR, f"a.blue_link[href='/orders/{order_number}']")
+                windows_before = set(self.driver.window_handles)
+                link_element.click()
+                self.pause(self.get_timing_adv('detail_page_wait', 2))
+            except Exception as e:
+                self.log_debug(f"주문번호 링크를 찾을 수 없습니다: {e}", order_number)
+                self.record_error(e)
+                return (False, "링크찾기실패", "미처리")
+            
+            # 새창으로 전환
+            new_window = self.find_detail_window(windows_before, order_number)
+            if new_window is not None:
+                self.driver.switch_to.window(new_window)
+                self.pause(self.get_timing_adv('detail_page_wait', 2))
+                self.log_debug(f"상세페이지 새창으로 전환 완료", order_number)
+            else:
+                self.log_debug(f"새창이 열리지 않았습니다", order_number)
+                return (False, "새창열기실패", "미처리")
+            
+            # 예약상태 드롭다운 찾기 및 변경
+            try:
+                with self.metrics.span('change_status.selector.status_select'):
+                    select_element = self.driver.find_element(By.ID, "orderProductStatus")
+                    select = Select(select_element)
+                previous_text = select.first_selected_option.text.strip()  # 한글 텍스트 (예: "대기")
+                
+                # 현재 상태의 영문 코드 가져오기 (한글 → 영문 변환)
+                previous_value = self.status_text_to_code.get(previous_text, previous_text)  # "대기" → "pending"
+                
+                # 상태 변경 목표값 (실행 계획 컴파일 시 한글/영문 판단 및 변환 완료)
+                target_value = self.target_status_value  # "confirm"
+                target_text = self.target_status_text  # "확정"
+                
+                self.log_debug(f"현재 상태: {previous_text}({previous_value}), 목표 상태: {target_text}({target_value})", order_number)
+                
+                # 이미 목표 상태면 건너뜀 (영문 코드로 비교)
+                if previous_value == target_value:
+                    self.log_debug(f"이미 {target_text}({target_value}) 상태입니다. 건너뜁니다.", order_number)
+                    self.driver.close()
+                    self.driver.switch_to.window(self.main_window)
+                    return (True, "이미확정", "미처리")
+                
+                # 상태 변경 (영문 코드 사용)
+                with self.metrics.span('change_status.select_option'):
+                    select.select_by_value(target_value)
+                self.pause(2)  # 상태 변경 후 대기
+                
+                # 변경 확인
+                select_element_after = self.driver.find_element(By.ID, "orderProductStatus")
+                select_after = Select(select_element_after)
+                current_text = select_after.first_selected_option.text.strip()  # 한글 텍스트
+                current_value = self.status_text_to_code.get(current_text, current_text)  # 영문 코드로 변환
+                
+                # 변경 확인 (영문 코드로 비교)
+                if current_value == target_value:
+                    self.log_debug(f"상태 변경 성공: {previous_text}({previous_value}) → {current_text}({current_value})", order_number)
+                    status_changed = True
+                else:
+                    self.log_debug(f"상태 변경 실패: 현재 {current_text}({current_value}), 목표 {target_text}({target_value})", order_number)
+                    status_changed = False
+                
+                # 창 닫기 및 메인창으로 복귀 (LMS 전송은 예약목록에서 수행)
+                self.driver.close()
+                self.driver.switch_to.window(self.main_window)
+                self.pause(self.get_timing_adv('refresh_wait', 2))
+                
+                # 상태 변경이 성공한 경우에만 예약목록에서 LMS 전송
+                if status_changed:
+                    self.log_debug(f"예약목록으로 복귀 완료, LMS 전송 준비", order_number)
+                    lms_success = self.send_lms_from_order_list(order_number)
+                    lms_result = "성공" if lms_success else self.lms_failure_result()
+                    self.log_debug(f"LMS 전송 결과: {lms_result}", order_number)
+                else:
+                    lms_result = "미처리"
+                
+                # LMS 결과를 함께 반환하기 위해 튜플로 변경
+                return (status_changed, current_value, lms_result)
+                
+            except Exception as e:
+                self.log_debug(f"상태 변경 중 오류 발생: {e}", order_number)
+                self.record_error(e)
+                self.driver.close()
+                self.driver.switch_to.window(self.main_window)
+                return (False, f"상태변경오류: {str(e)}", "미처리")
+            
+        except Exception as e:
+            self.log_debug(f"상태 변경 실패: {e}", order_number)
+            self.record_error(e)
+            # 창 상태 복구
+            try:
+                windows = self.driver.window_handles
+                if len(windows) > 1:
+                    self.driver.close()
+                self.driver.switch_to.window(self.main_window)
+            except:
+                pass
+            return (False, f"오류: {str(e)}", "미처리")
+
+    def find_detail_window(self, windows_before, order_number):
+        """링크 클릭 후 새로 열린 상세페이지 창 (탭 동시 처리 중 다른 탭의 창도 새로 열렸으면 URL로 구분)"""
+        candidates = [w for w in self.driver.window_handles if w not in windows_before]
+        if len(candidates) <= 1:
+            return candidates[0] if candidates else None
+        for window in candidates:
+            self.driver.switch_to.window(window)
+            if f"/orders/{order_number}" in self.driver.current_url:
+                return window
+        self.driver.switch_to.window(self.main_window)
+        return None
+    
+    # ✅ 7. [2단계: LMS 전송 - 예약목록에서]
+    @timed('send_lms_from_order_list')
+    def send_lms_from_order_list(self, order_number=None, retry=False):
+        """
+        예약목록 페이지에서 해당 주문번호의 LMS 전송 버튼을 클릭하고 팝업을 처리합니다.
+        
+        알럿1(발송 요청 확인)을 확인한 뒤의 실패와 재시도(retry=True)에서 버튼을 찾지 못한 경우는
+        요청이 이미 제출되었을 수 있으므로 LmsUnconfirmedError로 기록합니다 (재시도하지 않음).
+        """
+        try:
+            self.log_debug(f"예약목록에서 LMS 전송 시작", order_number)
+            
+            # 페이지 새로고침 후 안정화 대기 (상세페이지에서 변경사항 반영)
+            self.pause(self.get_timing_adv('refresh_wait', 2))
+            
+            # 주문번호 행의 LMS 버튼 조회 (같은 행에 재전송/전송 버튼 중 하나만 존재, execute_script 1회)
+            with self.metrics.span('lms.find_button'):
+                lms_button, button_type = self.order_list.find_lms_button(order_number)
+            if lms_button is None:
+                if retry:
+                    # 이전 시도의 전송 여부를 알 수 없으므로 다시 찾지 않음
+                    self.last_error = LmsUnconfirmedError(f"재시도에서 LMS 전송/재전송 버튼을 찾을 수 없습니다: {order_number}")
+                    self.log_debug(f"{self.last_error}", order_number)
+                    return False
+                error = NoSuchElementException(f"LMS 전송/재전송 버튼을 찾을 수 없습니다: {order_number}")
+                self.log_debug(f"{error.msg}", order_number)
+                self.record_error(error)
+                raise error
+            self.log_debug(f"같은 행에서 LMS {button_type} 버튼 찾기 성공", order_number)
+            
+            # LMS 전송/재전송 버튼 클릭 (알럿이 열려 있는 동안은 다른 탭에 WebDriver를 넘기지 않음)
+            lms_button.click()
+            time.sleep(self.get_timing_adv('lms_popup_wait', 2))
+            self.log_debug(f"LMS {button_type} 버튼 클릭 완료", order_number)
+            
+            # 팝업 처리 - 알럿 2개 처리
+            self.metrics.increment(f"lms.button.{'resend' if button_type == '재전송' else 'send'}")
+            try:
+                # 알럿1: "구매확인 LMS 발송 요청 하시겠습니까?" (확인 전 실패는 요청이 제출되지 않았으므로 재시도 가능)
+                alert1 = self.driver.switch_to.alert
+                alert1_text = alert1.text
+                self.log_debug(f"알럿1 메시지: {alert1_text}", order_number)
+                alert1.accept()  # 확인 버튼 클릭
+            except Exception as e:
+                self.log_debug(f"팝업이 나타나지 않았습니다: {e}", order_number)
+                self.record_error(e)
+                return False
+            
+            # 알럿1 확인 후에는 LMS 요청이 이미 제출됨 - 실패해도 재시도하지 않음 (재전송 버튼으로 고객에게 중복 발송됨)
+            try:
+                time.sleep(1)  # 1초 대기
+                self.log_debug(f"알럿1 확인 버튼 클릭 완료", order_number)
+                
+                # 알럿2: "구매확인 LMS 발송 요청 하였습니다."
+                alert2 = self.driver.switch_to.alert
+                alert2_text = alert2.text
+                self.log_debug(f"알럿2 메시지: {alert2_text}", order_number)
+                alert2.accept()  # 확인 버튼 클릭
+                self.pause(2)  # 2초 대기 (화면 새로고침 대기)
+                self.log_debug(f"알럿2 확인 버튼 클릭 완료 - 팝업 닫힘", order_number)
+                
+                return True
+            except Exception as e:
+                # 먼저 기록된 예외보다 우선 (실패 분류가 일시적이 되지 않도록)
+                self.last_error = LmsUnconfirmedError(f"알럿1 확인 후 실패: {e}")
+                self.log_debug(f"LMS 발송 요청 후 완료 알럿을 확인하지 못했습니다 (재시도하지 않음): {e}", order_number)
+                return False
+            
+        except Exception as e:
+            self.log_debug(f"LMS 전송 실패: {e}", order_number)
+            self.record_error(e)
+            return False
+
+    # ✅ 8. [2단계: 메인 처리]
+    def process_confirm_numbers(self):
+        """2단계: 실행 계획의 주문 목록으로 확정번호를 처리합니다."""
+        try:
+            print("2단계: 확정번호 처리 시작...")
+            
+            # 주문 목록 (서버에서 파싱/정규화/테스트 모드 적용 완료)
+            excel_data = self.run_plan['orders']
+            
+            # 검증에 실패한 행(주문번호 누락/형식 오류/중복 등)은 처리하지 않고 결과에만 기록
+            for skipped in self.run_plan.get('skipped_rows', []):
+                timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                self.log_debug(f"{skipped['row']}행 검증 실패({skipped['issue']})로 건너뜁니다.", skipped['order_number'] or None)
+                self.log_result(skipped['order_number'], skipped['confirm_number'], f"검증오류({skipped['issue']})", "미처리", timestamp, attempts=0,
+                                row=skipped.get('row'))
+            
+            if not excel_data:
+                print("2단계: 처리할 데이터가 없습니다.")
+                return
+            
+            # 카나리 실행: 실행의 앞 N건을 먼저 처리하고 기준을 통과한 경우에만 나머지 처리 (실행당 한 번)
+            # 배치 실행에서 파일의 주문이 N건 이하이면 다음 파일의 주문까지 카나리 구간으로 처리
+            if self.canary_remaining > 0:
+                canary_orders, excel_data = excel_data[:self.canary_remaining], excel_data[self.canary_remaining:]
+                if not self.run_canary(canary_orders, excel_data) or not excel_data:
+                    return
+            
+            print(f"2단계: {len(excel_data)}개 데이터 처리 시작")
+            self.process_orders(excel_data)
+            if not self.stopped:
+                print("2단계: 모든 데이터 처리 완료!")
+            
+        except Exception as e:
+            print(f"2단계: 처리 중 오류 발생: {e}")
+    
+    def process_orders(self, excel_data):
+        """주문 목록 처리 (본 처리 → 재시도 큐), 중단 요청 시 남은 주문을 기록하고 반환"""
+        # 탭 동시 처리 (browser.tabs > 1): 한 브라우저의 탭 K개가 서로 다른 주문 처리 (재시도 포함)
+        tab_count = min(self.tab_count(), len(excel_data))
+        if tab_count > 1:
+            from rpa.tabs import process_in_tabs
+            process_in_tabs(self, excel_data, tab_count)
+            return
+        
+        # 각 데이터 처리 (일시적 실패는 재시도 큐로 미루고 다음 주문 진행, 주문 사이에서 제어/중단 요청 확인)
+        for i, data in enumerate(excel_data, 1):
+            self.control_checkpoint()
+            if self.stop_requested():
+                self.stop_remaining(excel_data[i - 1:])
+                return
+            if self.continue_in_tabs(excel_data[i - 1:]):
+                return
+            print(f"\n--- {i}/{len(excel_data)} 처리 시작: 주문번호 {data['order_number']} ---")
+            self.handle_order(data, attempt=1, stage=STAGE_ORDER)
+            self.supervisor.after_order(has_more=i < len(excel_data) or len(self.retry_queue) > 0)
+        
+        # 본 처리 후 지연 재시도 (재시도 시각 순서, 지수 백오프)
+        if len(self.retry_queue):
+            print(f"\n2단계: 일시적 실패 {len(self.retry_queue)}건 재시도 시작")
+        while len(self.retry_queue):
+            self.control_checkpoint()
+            if self.stop_requested():
+                self.stop_remaining([])
+                return
+            if self.continue_in_tabs([]):
+                return
+            item = self.retry_queue.pop(cancel=self.stop_requested)
+            if item is None:
+                continue  # 대기 중 중단 요청 → 다음 반복에서 남은 주문 기록
+            attempt = item['attempts'] + 1
+            self.log_debug(f"재시도 {attempt}/{self.retry_policy.max_attempts} 시작 (이전 결과: {item['reason']})", item['order']['order_number'])
+            self.handle_order(item['order'], attempt=attempt, stage=item['stage'])
+            self.supervisor.after_order(has_more=len(self.retry_queue) > 0)
+    
+    def run_canary(self, canary_orders, remaining_orders) -> bool:
+        """
+        카나리 구간 처리 후 판정 (통과하면 True, 실패/중단이면 나머지 주문을 결과에 기록하고 False)
+        
+        배치 실행에서 카나리 구간이 다음 파일로 이어지면 판정하지 않고 True (다음 파일에서 이어서 처리)
+        """
+        if self.canary is None:
+            self.canary = CanaryMonitor(self.run_plan['canary'], self.target_status_value)
+            self.canary.start(self.metrics)
+        else:
+            self.canary.resume()
+        self.log_debug(f"카나리 실행: {len(canary_orders)}건을 먼저 처리합니다. "
+                       f"(카나리 남은 주문 {self.canary_remaining}건, 이 파일의 남은 주문 {len(remaining_orders)}건)")
+        self.process_orders(canary_orders)
+        self.canary_remaining -= len(canary_orders)
+        if self.stopped:
+            self.canary.finish(self.metrics)
+            self.stop_remaining(remaining_orders)
+            return False
+        if self.canary_remaining > 0:
+            self.canary.suspend()
+            self.log_debug(f"카나리 구간이 다음 파일로 이어집니다. (남은 카나리 주문 {self.canary_remaining}건)")
+            return True
+        return self.judge_canary(remaining_orders)
+    
+    def judge_canary(self, remaining_orders) -> bool:
+        """카나리 판정 및 보고서 기록 (실패하면 나머지 주문을 카나리중단으로 기록하고 False)"""
+        canary_plan = self.canary.plan
+        report = self.canary.finish(self.metrics)
+        self.canary_remaining = 0
+        self.canary_report = report
+        for line in canary_report_lines(report):
+            self.log_debug(line)
+        if self.canary_report_path:
+            try:
+                write_canary_report(self.canary_report_path, report)
+            except Exception as e:
+                print(f"카나리 보고서 저장 실패: {e}")
+        
+        if report['passed']:
+            self.metrics.increment("canary.passed")
+            if canary_plan['tabs_after']:
+                self.config.setdefault('browser', {})['tabs'] = canary_plan['tabs_after']
+                self.log_debug(f"카나리 통과 - 탭 {canary_plan['tabs_after']}개로 나머지 주문을 처리합니다.")
+            return True
+        
+        self.metrics.increment("canary.failed")
+        self.canary_failed = True
+        self.log_debug(f"카나리 기준을 통과하지 못해 남은 주문 {len(remaining_orders)}건을 처리하지 않고 종료합니다.")
+        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        for data in remaining_orders:
+            self.log_result(data['order_number'], data['confirm_number'], "카나리중단", "미처리", timestamp, attempts=0, row=data.get('row'))
+        return False
+
+    def handle_order(self, data, attempt, stage):
+        """주문 1건 처리 후 최종 결과 기록 (일시적 실패이고 시도 횟수가 남았으면 재시도 큐에 등록)"""
+        order_number = data['order_number']
+        confirm_number = data['confirm_number']  # 로그용으로만 사용
+        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        
+        self.session_expired = False
+        attempt_started_at = time.monotonic()
+        status_result, lms_result, retry_stage = self.process_order(order_number, stage)
+        
+        # 세션 만료로 실패한 경우 재로그인 후 같은 시도로 한 번 더 처리 (재로그인 실패 시 일시적 실패로 재시도 큐에 등록)
+        if self.session_expired and self.relogin(expired_at=attempt_started_at):
+            self.log_debug(f"재로그인 완료 ({self.relogin_count}회) - 현재 주문을 다시 처리합니다.", order_number)
+            self.session_expired = False
+            status_result, lms_result, retry_stage = self.process_order(order_number, stage)
+        
+        # 브라우저가 종료되어 세션이 끊긴 경우 브라우저를 다시 실행/재로그인한 뒤 같은 시도로 한 번 더 처리
+        # (탭 동시 처리 제외, LMS 요청이 이미 제출되었을 수 있으면 다시 처리하지 않음 - 다음 주문에서 복구)
+        if (self.tab_scheduler is None and not isinstance(self.last_error, LmsUnconfirmedError)
+                and self.browser_session_lost() and self.supervisor.recover()):
+            self.log_debug("브라우저 재실행 완료 - 현재 주문을 다시 처리합니다.", order_number)
+            status_result, lms_result, retry_stage = self.process_order(order_number, stage)
+        
+        if retry_stage is not None:
+            if self.retry_policy.can_retry(attempt):
+                self.retry_queue.defer(data, attempt, retry_stage, f"{status_result}/{lms_result}", last_result=(status_result, lms_result))
+                self.metrics.increment(f"retry.deferred.{retry_stage}")
+                self.log_debug(f"일시적 실패({status_result}/{lms_result}) - {self.retry_policy.delay(attempt):.0f}초 후 재시도 예정 "
+                               f"(시도 {attempt}/{self.retry_policy.max_attempts})", order_number)
+                return
+            self.metrics.increment("retry.exhausted")
+        elif attempt > 1:
+            self.metrics.increment("retry.recovered")
+        
+        self.log_result(order_number, confirm_number, status_result, lms_result, timestamp, attempts=attempt, row=data.get('row'))
+        self.log_debug(f"처리 완료: 상태={status_result}, LMS={lms_result}, 시도={attempt}", order_number)
+    
+    def lms_failure_result(self) -> str:
+        """LMS 전송 실패 시 결과 (요청이 제출되었을 수 있으면 확인 필요)"""
+        return LMS_UNCONFIRMED_RESULT if isinstance(self.last_error, LmsUnconfirmedError) else "실패"
+    
+    def browser_session_lost(self) -> bool:
+        """현재 시도의 실패 원인이 브라우저 세션 끊김인지 (오류가 있었던 경우에만 드라이버 상태 확인)"""
+        if self.last_error is None:
+            return False
+        return is_dead_session(self.last_error) or not self.supervisor.driver_alive()
+    
+    def process_order(self, order_number, stage=STAGE_ORDER):
+        """
+        주문 1건 처리
+        
+        Args:
+            order_number: 주문번호
+            stage: STAGE_ORDER (검색 → 상태 변경 → LMS 전송) 또는 STAGE_LMS (상태 변경 완료, LMS 전송만)
+        
+        Returns:
+            (상태 결과, LMS 결과, 재시도 단계 - 일시적 실패가 아니면 None)
+        """
+        self.last_error = None
+        
+        if stage == STAGE_LMS:
+            # 이전 시도에서 상태 변경은 성공 → 변경된 상태로 검색하여 LMS만 다시 전송
+            if not self.search_order_by_number(order_number, search_status=self.target_status_value):
+                retry = STAGE_LMS if classify_exception(self.last_error) == TRANSIENT else None
+                return (self.target_status_value, "실패", retry)
+            lms_success = self.send_lms_from_order_list(order_number, retry=True)
+            if lms_success:
+                return (self.target_status_value, "성공", None)
+            return (self.target_status_value, self.lms_failure_result(),
+                    STAGE_LMS if classify_exception(self.last_error) == TRANSIENT else None)
+        
+        # 1. 주문번호로 검색 (오류 페이지/WebDriver 오류는 일시적, 검색 결과 없음은 영구적 실패)
+        if not self.search_order_by_number(order_number):
+            if classify_exception(self.last_error) == TRANSIENT:
+                return ("검색오류", "미처리", STAGE_ORDER)
+            self.log_debug(f"검색 실패로 다음 주문번호로 진행합니다.", order_number)
+            return ("검색결과없음", "미처리", None)
+        
+        # 2. 상세페이지 열기 및 상태 변경 (LMS 전송 포함)
+        status_success, status_result, lms_result = self.change_reservation_status(order_number)
+        
+        if not status_success:
+            transient = status_result in TRANSIENT_STATUS_RESULTS or classify_exception(self.last_error) == TRANSIENT
+            return (status_result, lms_result, STAGE_ORDER if transient else None)
+        if lms_result == "실패" and classify_exception(self.last_error) == TRANSIENT:
+            return (status_result, lms_result, STAGE_LMS)
+        return (status_result, lms_result, None)
+
+    # ✅ 9. [메인 실행]
+    def run(self) -> int:
+        """전체 파이프라인 실행 (브라우저 실행 → 로그인 → 업로드 → 주문 처리), 종료 코드 반환"""
+        self.prepare_output()
+        
+        # 3. 드라이버 실행 및 로그인
+        if not self.launch_browser():
+            self.report_metrics()
+            return 1
+        if not self.login():
+            self.quit_browser()
+            self.report_metrics()
+            return 1
+        
+        try:
+            # Lock 파일 확인
+            if not check_lock_file():
+                print("다른 프로세스가 실행 중입니다. 종료합니다.")
+                return 0
+            
+            # Lock 파일 생성
+            if not create_lock_file():
+                print("Lock 파일 생성 실패. 종료합니다.")
+                return 0
+            
+            # 실행 시작 로그
+            self.log_start()
+            
+            # 파일별 업로드 → 확정번호 처리 (배치 실행은 한 번 로그인한 브라우저로 파일을 순서대로 처리)
+            batch = len(self.plan_files) > 1
+            for index, file_plan in enumerate(self.plan_files, 1):
+                self.control_checkpoint()
+                if self.stop_requested():
+                    print("중단 요청으로 업로드 전에 종료합니다.")
+                    self.stopped = True
+                    break
+                if batch:
+                    self.start_batch_file(index, file_plan)
+                
+                # 1단계: 엑셀 파일 업로드
+                upload_success = self.upload_excel_file()
+                
+                if not upload_success:
+                    if batch:
+                        print("엑셀 파일 업로드 실패로 이 파일의 처리를 건너뜁니다.")
+                        self.batch_summary.append({"file": file_plan.get('file_label'), "orders": len(file_plan['orders']),
+                                                   "status": "업로드 실패", "result_file": None})
+                        continue
+                    print("엑셀 파일 업로드 실패로 작업을 중단합니다.")
+                    return 0
+                
+                print("1단계 완료! 2단계 시작...")
+                
+                # 메인창 핸들 저장
+                self.main_window = self.driver.current_window_handle
+                print(f"메인창 핸들 저장: {self.main_window}")
+                
+                # 2단계: 확정번호 처리
+                self.process_confirm_numbers()
+                if batch:
+                    self.batch_summary.append({"file": file_plan.get('file_label'), "orders": len(file_plan['orders']),
+                                               "status": "중단" if self.stopped else "카나리중단" if self.canary_failed else "완료",
+                                               "result_file": self.result_file})
+                if self.stopped or self.canary_failed:
+                    break
+            
+            # 업로드 실패로 건너뛴 파일 때문에 카나리 구간을 다 채우지 못한 경우 처리한 주문으로 판정
+            if self.canary_remaining > 0 and self.canary is not None and not self.stopped:
+                self.judge_canary([])
+            
+            if batch:
+                self.log_batch_summary()
+            if not self.stopped and not self.canary_failed:
+                print("모든 작업 완료!")
+            
+        except Exception as e:
+            print(f"메인 실행 중 오류 발생: {e}")
+        finally:
+            # Lock 파일 제거
+            remove_lock_file()
+            
+            # 브라우저 종료
+            print("브라우저를 종료합니다.")
+            self.quit_browser()
+            
+            # 단계별 소요 시간 요약 출력 및 저장
+            self.report_metrics()
+        
+        if self.stopped:
+            return EXIT_STOPPED
+        return EXIT_CANARY_FAILED if self.canary_failed else 0
+    
+    def report_metrics(self):
+        """단계별 소요 시간 요약을 로그에 기록하고 계측 결과 파일 저장"""
+        for line in self.metrics.summary_lines():
+            self.log_debug(line)
+        if self.metrics_path:
+            try:
+                self.metrics.write(self.metrics_path)
+            except Exception as e:
+                print(f"계측 결과 저장 실패: {e}")
+
+
+def run_from_env() -> int:
+    """환경변수(CONFIG_FILE_PATH, RUN_PLAN_PATH, EXECUTION_MODE, EXECUTION_ID, METRICS_PATH, STOP_FILE_PATH, CONTROL_FILE_PATH, CANARY_REPORT_PATH)로 엔진을 구성하여 실행"""
+    # 환경변수에서 설정 파일 경로 확인 (웹 인터페이스에서 전달)
+    config_file = os.environ.get('CONFIG_FILE_PATH')
+    execution_mode = os.environ.get('EXECUTION_MODE', 'standalone')
+    execution_id = os.environ.get('EXECUTION_ID', 'unknown')
+    
+    if not config_file:
+        # 환경변수가 없으면 기본 설정 파일 사용
+        config_file = str(PROJECT_ROOT / 'admin_confirm_config.json')
+    
+    print(f"=== 예약확정처리 시스템 v2.0 시작 ===")
+    print(f"실행 모드: {execution_mode}")
+    print(f"실행 ID: {execution_id}")
+    print(f"설정 파일 경로: {config_file}")
+    
+    config = load_config(config_file)
+    if config is None:
+        return 1
+    
+    run_plan = load_or_compile_run_plan(config, execution_id, os.environ.get('RUN_PLAN_PATH'))
+    if run_plan is None:
+        return 1
+    from services.run_plan import plan_files
+    print(f"✅ base_url: {plan_files(run_plan)[0]['base_url']}")
+    
+    engine = AdminConfirmEngine(config, run_plan, execution_id=execution_id, execution_mode=execution_mode,
+                                metrics_path=os.environ.get('METRICS_PATH'), stop_file=os.environ.get('STOP_FILE_PATH'),
+                                control_file=os.environ.get('CONTROL_FILE_PATH'),
+                                canary_report_path=os.environ.get('CANARY_REPORT_PATH'))
+    return engine.run()
@@ -0,0 +1,226 @@
+# metrics.py - 단계별 소요 시간 계측 (히스토그램) 모듈
+# RPA 엔진(단계/선택자 fallback별 span 기록)과 서버(/metrics 집계) 양쪽에서 사용합니다.
+# 외부 의존성 없이 표준 라이브러리만 사용합니다.
+import os
+import json
+import time
+import bisect
+import threading
+import functools
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+# 히스토그램 버킷 상한 (초) - 선택자 탐색(수 ms) ~ 주문 1건 처리(수십 초)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120)
+# 정확한 분위수 계산을 위해 보관하는 측정값 수 (넘으면 측정값을 버리고 버킷으로 추정)
+MAX_SAMPLES = 5000
+
+
+class Histogram:
+    """누적 버킷 히스토그램 (Prometheus histogram과 같은 구조) + 분위수 계산용 측정값 (MAX_SAMPLES개까지)"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # 마지막 칸은 +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self.samples: Optional[List[float]] = []  # None이면 MAX_SAMPLES를 넘어 버킷 추정만 가능
+
+    def observe(self, seconds: float):
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+        if self.samples is not None:
+            self.samples.append(seconds)
+            if len(self.samples) > MAX_SAMPLES:
+                self.samples = None
+
+    @property
+    def estimated(self) -> bool:
+        """분위수가 버킷 추정값인지 (측정값을 모두 보관하고 있으면 정확한 값)"""
+        return self.samples is None
+
+    def quantile(self, q: float) -> float:
+        """분위수 (측정값이 있으면 정확한 값, 없으면 버킷 추정)"""
+        if self.count == 0:
+            return 0.0
+        if self.samples is not None:
+            ordered = sorted(self.samples)
+            # 선형 보간 (numpy percentile 기본 방식)
+            position = q * (len(ordered) - 1)
+            lower = int(position)
+            upper = min(lower + 1, len(ordered) - 1)
+            return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+        return self.bucket_quantile(q)
+
+    def bucket_quantile(self, q: float) -> float:
+        """버킷 내 선형 보간으로 분위수 추정 (Prometheus histogram_quantile 방식)"""
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        cumulative = 0
+        for i, bucket_count in enumerate(self.counts):
+            if cumulative + bucket_count >= rank and bucket_count > 0:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.max
+                upper = min(upper, self.max)
+                if upper <= lower:
+                    return upper
+                return lower + (upper - lower) * (rank - cumulative) / bucket_count
+            cumulative += bucket_count
+        return self.max
+
+    def merge(self, data: Dict):
+        """to_dict() 결과 합산 (버킷 구성이 같은 경우)"""
+        if tuple(data.get("buckets", ())) != self.buckets:
+            return
+        for i, bucket_count in enumerate(data["counts"]):
+            self.counts[i] += bucket_count
+        self.count += data["count"]
+        self.sum += data["sum"]
+        self.max = max(self.max, data["max"])
+        samples = data.get("samples")
+        if self.samples is None or samples is None or len(self.samples) + len(samples) > MAX_SAMPLES:
+            self.samples = None
+        else:
+            self.samples.extend(samples)
+
+    def to_dict(self) -> Dict:
+        data = {"buckets": list(self.buckets), "counts": list(self.counts),
+                "count": self.count, "sum": round(self.sum, 6), "max": round(self.max, 6)}
+        if self.samples is not None:
+            data["samples"] = [round(value, 6) for value in self.samples]
+        return data
+
+    def summary(self) -> Dict:
+        """횟수/평균/최대는 정확한 값, p50/p95는 estimated가 True이면 버킷 추정값"""
+        return {
+            "count": self.count,
+            "avg_ms": round(self.sum / self.count * 1000, 1) if self.count else 0.0,
+            "p50_ms": round(self.quantile(0.5) * 1000, 1),
+            "p95_ms": round(self.quantile(0.95) * 1000, 1),
+            "max_ms": round(self.max * 1000, 1),
+            "estimated": self.estimated
+        }
+
+
+class MetricsRegistry:
+    """이름별 소요 시간 히스토그램과 이벤트 카운터"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.histograms: Dict[str, Histogram] = {}
+        self.counters: Dict[str, int] = {}
+
+    def observe(self, name: str, seconds: float):
+        with self._lock:
+            if name not in self.histograms:
+                self.histograms[name] = Histogram()
+            self.histograms[name].observe(seconds)
+
+    def increment(self, name: str, amount: int = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    @contextmanager
+    def span(self, name: str):
+        """with 블록 소요 시간 기록 (예외가 발생해도 기록)"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started)
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                "histograms": {name: h.to_dict() for name, h in self.histograms.items()},
+                "counters": dict(self.counters)
+            }
+
+    def merge(self, snapshot: Dict):
+        """다른 레지스트리의 snapshot() 결과 합산 (실행별 계측 → 서버 누적)"""
+        with self._lock:
+            for name, data in snapshot.get("histograms", {}).items():
+                if name not in self.histograms:
+                    self.histograms[name] = Histogram(data.get("buckets", DEFAULT_BUCKETS))
+                self.histograms[name].merge(data)
+            for name, value in snapshot.get("counters", {}).items():
+                self.counters[name] = self.counters.get(name, 0) + value
+
+    def summary(self) -> Dict[str, Dict]:
+        with self._lock:
+            return {name: self.histograms[name].summary() for name in sorted(self.histograms)}
+
+    def summary_lines(self) -> List[str]:
+        """실행 종료 시 출력할 단계별 요약"""
+        lines = ["=== 단계별 소요 시간 (~: 버킷 추정 분위수) ==="]
+        for name, s in self.summary().items():
+            mark = "~" if s["estimated"] else " "
+            lines.append(f"{name:<45} {s['count']:>5}회  평균 {s['avg_ms']:>8}ms  p50{mark}{s['p50_ms']:>8}ms  "
+                         f"p95{mark}{s['p95_ms']:>8}ms  최대 {s['max_ms']:>8}ms")
+        with self._lock:
+            counters = sorted(self.counters.items())
+        if counters:
+            lines.append("=== 이벤트 ===")
+            for name, value in counters:
+                lines.append(f"{name:<45} {value:>5}")
+        return lines
+
+    def write(self, path: str):
+        """snapshot을 JSON 파일로 저장 (임시 파일 → 교체)"""
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.snapshot(), f, ensure_ascii=False)
+        os.replace(temp_path, path)
+
+    def to_prometheus(self, prefix: str) -> List[str]:
+        """Prometheus text format 출력 ({prefix}_stage_seconds 히스토그램, {prefix}_events_total 카운터)"""
+        lines = []
+        with self._lock:
+            histograms = sorted(self.histograms.items())
+            counters = sorted(self.counters.items())
+
+        lines.append(f"# HELP {prefix}_stage_seconds RPA stage and selector span duration in seconds "
+                     f"(quantiles from histogram_quantile are bucket estimates)")
+        lines.append(f"# TYPE {prefix}_stage_seconds histogram")
+        for name, h in histograms:
+            label = f'stage="{escape_label(name)}"'
+            cumulative = 0
+            for upper, bucket_count in zip(list(h.buckets) + ["+Inf"], h.counts):
+                cumulative += bucket_count
+                lines.append(f'{prefix}_stage_seconds_bucket{{{label},le="{upper}"}} {cumulative}')
+            lines.append(f"{prefix}_stage_seconds_sum{{{label}}} {h.sum:.6f}")
+            lines.append(f"{prefix}_stage_seconds_count{{{label}}} {h.count}")
+
+        lines.append(f"# HELP {prefix}_events_total RPA events (selector hits etc.)")
+        lines.append(f"# TYPE {prefix}_events_total counter")
+        for name, value in counters:
+            lines.append(f'{prefix}_events_total{{event="{escape_label(name)}"}} {value}')
+        return lines
+
+
+def escape_label(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def timed(stage: str):
+    """메서드 전체 소요 시간을 self.metrics에 기록하는 데코레이터"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            with self.metrics.span(stage):
+                return func(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def load_snapshot(path: str) -> Optional[Dict]:
+    """실행이 기록한 snapshot 파일 로드 (없으면 None)"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
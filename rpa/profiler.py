@@ -0,0 +1,222 @@
+# profiler.py - 실행별 프로파일 수집 모듈
+# 실행기가 프로파일링을 요청한 실행(PROFILE_MODE 환경변수)만 워커가 이 모듈로 엔진을 감싸 실행합니다.
+# - sampling: 별도 스레드가 interval마다 모든 스레드의 호출 스택을 기록 → folded stack 텍스트 (.folded)
+#   flamegraph.pl, speedscope, inferno 등에 그대로 넣어 flamegraph로 볼 수 있음
+# - deterministic: cProfile로 모든 함수 호출 기록 → pstats 파일 (.prof, snakeviz/flameprof/`python -m pstats`)
+#   탭 동시 처리(tab-N 스레드)도 기록하도록 Python 3.11 이하는 스레드마다 Profile을 만들어 종료 시 합침
+#   (3.12부터는 cProfile이 sys.monitoring으로 모든 스레드를 기록)
+# 워커가 작업 전에 미리 import 한 모듈의 import 시간도 함께 기록합니다 (folded에는 "<import>" 스택으로 포함).
+import os
+import sys
+import json
+import time
+import pstats
+import cProfile
+import threading
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).parent.parent
+PROFILE_DIR = PROJECT_ROOT / "profiles"
+
+PROFILE_MODES = ("sampling", "deterministic")
+PROFILE_EXTENSIONS = {"sampling": ".folded", "deterministic": ".prof"}
+DEFAULT_INTERVAL_MS = 5.0
+TOP_FUNCTIONS = 20
+
+
+def artifact_path(execution_id: str, mode: str) -> Path:
+    """실행별 프로파일 파일 경로"""
+    return PROFILE_DIR / f"admin_confirm_{execution_id}_profile{PROFILE_EXTENSIONS[mode]}"
+
+
+def summary_path(execution_id: str) -> Path:
+    """실행별 프로파일 요약(JSON) 경로"""
+    return PROFILE_DIR / f"admin_confirm_{execution_id}_profile.json"
+
+
+@lru_cache(maxsize=None)
+def short_filename(filename: str) -> str:
+    """프로젝트 또는 site-packages 기준 상대 경로 (샘플마다 호출되므로 캐시)"""
+    filename = filename.replace("\\", "/")
+    if "site-packages/" in filename:
+        return filename.rsplit("site-packages/", 1)[1]
+    try:
+        return Path(filename).resolve().relative_to(PROJECT_ROOT).as_posix()
+    except ValueError:
+        return Path(filename).name
+
+
+def frame_label(code) -> str:
+    """flamegraph 프레임 이름: 함수명 (파일 경로)"""
+    # folded 형식은 ";"로 프레임을, 마지막 공백으로 샘플 수를 구분 (프레임 이름 안의 공백은 허용)
+    return f"{code.co_name} ({short_filename(code.co_filename)})".replace(";", ":")
+
+
+class SamplingProfiler:
+    """interval마다 모든 스레드의 호출 스택을 기록하는 샘플링 프로파일러"""
+
+    def __init__(self, interval_ms: float = DEFAULT_INTERVAL_MS):
+        self.interval = max(0.001, interval_ms / 1000.0)
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stopped.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(frame_label(frame.f_code))
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, f"thread-{thread_id}"))
+                self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        self._thread.join()
+
+    def write(self, path: Path, import_timings: Dict[str, float]):
+        """folded stack 형식으로 저장 (import 시간은 같은 샘플 간격으로 환산하여 <import> 스택으로 추가)"""
+        with open(path, "w", encoding="utf-8") as f:
+            for module_name, seconds in import_timings.items():
+                samples = int(round(seconds / self.interval))
+                if samples > 0:
+                    f.write(f"<import>;{module_name} {samples}\n")
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+    def top_functions(self) -> List[Dict]:
+        """자체 샘플(스택 맨 위) 기준 상위 함수"""
+        self_samples, total_samples = Counter(), Counter()
+        for stack, count in self.stacks.items():
+            frames = stack.split(";")[1:]  # 첫 프레임은 스레드 이름
+            if not frames:
+                continue
+            self_samples[frames[-1]] += count
+            for name in set(frames):
+                total_samples[name] += count
+        return [
+            {"function": name, "self_samples": count, "total_samples": total_samples[name]}
+            for name, count in self_samples.most_common(TOP_FUNCTIONS)
+        ]
+
+
+class DeterministicProfiler:
+    """모든 스레드의 함수 호출을 기록하는 cProfile 래퍼"""
+
+    def __init__(self):
+        self.profiles = [cProfile.Profile()]
+        self._lock = threading.Lock()
+        # 3.11 이하의 cProfile은 enable()을 호출한 스레드만 기록
+        self._per_thread = sys.version_info < (3, 12)
+
+    def _start_thread_profile(self, *args):
+        """새 스레드의 첫 호출에서 스레드 전용 Profile 시작 (enable()이 이 훅을 대체)"""
+        profile = cProfile.Profile()
+        with self._lock:
+            self.profiles.append(profile)
+        profile.enable()
+
+    def start(self):
+        if self._per_thread:
+            threading.setprofile(self._start_thread_profile)
+        self.profiles[0].enable()
+
+    def stop(self):
+        self.profiles[0].disable()
+        if self._per_thread:
+            threading.setprofile(None)
+
+    def stats(self) -> pstats.Stats:
+        """스레드별 기록을 합친 통계 (호출이 없는 스레드는 제외)"""
+        stats = pstats.Stats(self.profiles[0])
+        with self._lock:
+            thread_profiles = self.profiles[1:]
+        for profile in thread_profiles:
+            if profile.getstats():
+                stats.add(profile)
+        return stats
+
+
+def deterministic_top_functions(stats: pstats.Stats) -> List[Dict]:
+    """cProfile 통계에서 자체 실행 시간 기준 상위 함수"""
+    rows = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)[:TOP_FUNCTIONS]
+    return [
+        {
+            "function": f"{name} ({Path(filename).name}:{line})",
+            "calls": calls,
+            "self_seconds": round(self_time, 4),
+            "total_seconds": round(total_time, 4)
+        }
+        for (filename, line, name), (_, calls, self_time, total_time, _) in rows
+    ]
+
+
+def run_profiled(target: Callable[[], int], mode: str, execution_id: str,
+                 import_timings: Optional[Dict[str, float]] = None) -> int:
+    """
+    프로파일러로 target을 감싸 실행하고 프로파일 파일과 요약을 profiles/ 폴더에 저장
+
+    프로파일 저장에 실패해도 실행 결과(종료 코드)에는 영향을 주지 않습니다.
+    """
+    if mode not in PROFILE_MODES:
+        print(f"알 수 없는 프로파일 모드({mode})이므로 프로파일 없이 실행합니다.")
+        return target()
+
+    import_timings = import_timings or {}
+    interval_ms = float(os.environ.get("ADMIN_CONFIRM_PROFILE_INTERVAL_MS", DEFAULT_INTERVAL_MS))
+    print(f"프로파일링 실행: {mode}" + (f" ({interval_ms}ms 간격)" if mode == "sampling" else ""))
+
+    started = time.perf_counter()
+    if mode == "sampling":
+        profiler = SamplingProfiler(interval_ms)
+        profiler.start()
+        try:
+            exit_code = target()
+        finally:
+            profiler.stop()
+    else:
+        profiler = DeterministicProfiler()
+        profiler.start()
+        try:
+            exit_code = target()
+        finally:
+            profiler.stop()
+    seconds = time.perf_counter() - started
+
+    try:
+        PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+        path = artifact_path(execution_id, mode)
+        summary = {
+            "mode": mode,
+            "artifact": path.name,
+            "seconds": round(seconds, 3),
+            "import_seconds": round(sum(import_timings.values()), 3),
+            "import_timings": import_timings
+        }
+        if mode == "sampling":
+            profiler.write(path, import_timings)
+            summary.update({"interval_ms": interval_ms, "samples": profiler.samples,
+                            "top_functions": profiler.top_functions()})
+        else:
+            stats = profiler.stats()
+            stats.dump_stats(str(path))
+            summary["top_functions"] = deterministic_top_functions(stats)
+        with open(summary_path(execution_id), "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+        print(f"프로파일 저장: {path}")
+    except Exception as e:
+        print(f"프로파일 저장 실패: {e}")
+    return exit_code
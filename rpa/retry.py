@@ -0,0 +1,148 @@
+# retry.py - 주문별 실패 분류 및 지연 재시도 큐 모듈
+# 일시적 실패(페이지 로딩 지연, 요소/새창/알럿 타이밍, 오류 페이지)는 본 처리 후 지수 백오프로 재시도하고,
+# 영구적 실패(검색 결과 없음, 상태 변경 거부 등)는 바로 결과에 기록합니다.
+# LMS 발송 요청 알럿(알럿1)을 확인한 뒤의 실패는 요청이 이미 제출되었을 수 있으므로 재시도하지 않고 확인 필요로 기록합니다.
+import time
+import heapq
+import itertools
+from typing import Callable, Dict, List, Optional, Tuple
+
+from selenium.common.exceptions import (
+    WebDriverException,
+    InvalidArgumentException,
+    InvalidSelectorException,
+    InvalidSessionIdException,
+)
+
+TRANSIENT = "transient"
+PERMANENT = "permanent"
+
+# 재시도 단계: 주문 전체(검색 → 상태 변경 → LMS) 또는 LMS 전송만 (상태 변경은 이미 성공)
+STAGE_ORDER = "order"
+STAGE_LMS = "lms"
+
+# 일시적 실패로 보는 상태 변경 결과
+TRANSIENT_STATUS_RESULTS = ("링크찾기실패", "새창열기실패", "검색오류")
+
+# LMS 발송 요청이 제출되었는지 확인할 수 없는 경우의 LMS 결과 (관리자 사이트에서 직접 확인 필요)
+LMS_UNCONFIRMED_RESULT = "확인필요"
+
+# 재시도 대기 중 중단 요청 확인 간격 (초)
+CANCEL_CHECK_INTERVAL = 0.5
+
+# 오류 페이지로 판단하는 페이지 제목 키워드 (검색 결과가 없을 때 확인)
+ERROR_PAGE_TITLE_KEYWORDS = ("500", "502", "503", "504", "Error", "오류")
+
+
+class TransientPageError(Exception):
+    """오류 페이지(5xx 등)가 표시되어 결과를 확인할 수 없는 경우"""
+
+
+class LmsUnconfirmedError(Exception):
+    """LMS 발송 요청이 이미 제출되었을 수 있어 다시 전송하면 안 되는 경우 (알럿1 확인 후 실패 등)"""
+
+
+def classify_exception(error: Optional[BaseException]) -> str:
+    """예외를 일시적/영구적 실패로 분류"""
+    if error is None:
+        return PERMANENT
+    if isinstance(error, TransientPageError):
+        return TRANSIENT
+    # 재시도하면 고객에게 LMS가 중복 발송될 수 있음
+    if isinstance(error, LmsUnconfirmedError):
+        return PERMANENT
+    # 잘못된 선택자/인자, 종료된 브라우저 세션은 재시도해도 같은 결과
+    if isinstance(error, (InvalidArgumentException, InvalidSelectorException, InvalidSessionIdException)):
+        return PERMANENT
+    # 요소 없음, 타임아웃, 오래된 요소 참조, 새창/알럿 없음 등 WebDriver 예외는 타이밍 문제인 경우가 대부분
+    if isinstance(error, WebDriverException):
+        return TRANSIENT
+    return PERMANENT
+
+
+def is_error_page_title(title: str) -> bool:
+    return any(keyword in (title or "") for keyword in ERROR_PAGE_TITLE_KEYWORDS)
+
+
+class RetryPolicy:
+    """지수 백오프 재시도 정책"""
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 5.0, max_delay: float = 60.0, multiplier: float = 2.0):
+        self.max_attempts = max(1, int(max_attempts))
+        self.base_delay = float(base_delay)
+        self.max_delay = float(max_delay)
+        self.multiplier = float(multiplier)
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict]) -> "RetryPolicy":
+        data = data or {}
+        return cls(
+            max_attempts=data.get("max_attempts", 3),
+            base_delay=data.get("base_delay", 5.0),
+            max_delay=data.get("max_delay", 60.0),
+            multiplier=data.get("multiplier", 2.0),
+        )
+
+    def delay(self, attempt: int) -> float:
+        """attempt번째 시도가 실패한 뒤 다음 시도까지 대기 시간 (초)"""
+        return min(self.max_delay, self.base_delay * (self.multiplier ** max(0, attempt - 1)))
+
+    def can_retry(self, attempt: int) -> bool:
+        return attempt < self.max_attempts
+
+
+class RetryQueue:
+    """재시도 가능 시각 순서로 주문을 꺼내는 지연 재시도 큐"""
+
+    def __init__(self, policy: RetryPolicy):
+        self.policy = policy
+        self._heap = []
+        self._sequence = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def defer(self, order: Dict, attempt: int, stage: str, reason: str, last_result: Optional[Tuple[str, str]] = None) -> float:
+        """
+        attempt번째 시도에 실패한 주문을 백오프 후 재시도하도록 등록, 재시도 예정 시각 반환
+
+        last_result: 이번 시도의 (상태 결과, LMS 결과) - 재시도 전에 중단되면 이 결과를 기록
+        """
+        ready_at = time.monotonic() + self.policy.delay(attempt)
+        item = {"order": order, "attempts": attempt, "stage": stage, "reason": reason, "last_result": last_result}
+        heapq.heappush(self._heap, (ready_at, next(self._sequence), item))
+        return ready_at
+
+    def pop(self, cancel: Optional[Callable[[], bool]] = None) -> Optional[Dict]:
+        """
+        가장 먼저 재시도할 주문 반환 (재시도 시각까지 대기)
+
+        cancel: 대기 중 주기적으로 확인하는 중단 조건 - True가 되면 주문을 큐에 남겨두고 None 반환
+        """
+        ready_at, sequence, item = heapq.heappop(self._heap)
+        while True:
+            wait = ready_at - time.monotonic()
+            if wait <= 0:
+                return item
+            if cancel is not None and cancel():
+                heapq.heappush(self._heap, (ready_at, sequence, item))
+                return None
+            time.sleep(min(wait, CANCEL_CHECK_INTERVAL) if cancel is not None else wait)
+
+    def pop_ready(self) -> Optional[Dict]:
+        """재시도 시각이 지난 주문이 있으면 대기 없이 반환 (없으면 None)"""
+        if self._heap and self._heap[0][0] <= time.monotonic():
+            return heapq.heappop(self._heap)[2]
+        return None
+
+    def next_ready_in(self) -> Optional[float]:
+        """다음 재시도까지 남은 시간 (초, 큐가 비었으면 None)"""
+        if not self._heap:
+            return None
+        return max(0.0, self._heap[0][0] - time.monotonic())
+
+    def drain(self) -> List[Dict]:
+        """대기 없이 남은 주문을 모두 꺼냄 (재시도 시각 순서)"""
+        items = [item for _, _, item in sorted(self._heap)]
+        self._heap = []
+        return items
@@ -0,0 +1,134 @@
+# session.py - 관리자 사이트 로그인 세션 재사용 모듈
+# 로그인 후 쿠키를 저장해 두었다가 다음 실행 시작 시 주입하여 로그인 폼을 건너뜁니다.
+# - 세션 파일은 sessions/ 폴더에 로그인 URL + 아이디 해시로 저장 (비밀번호는 저장하지 않음)
+# - 쿠키는 암호화하여 저장 (Windows는 DPAPI - 같은 Windows 사용자만 복호화, 그 외는 ADMIN_CONFIRM_SESSION_KEY 키 + Fernet)
+#   암호화를 사용할 수 없으면 세션을 저장/재사용하지 않음 (Windows: pywin32, 그 외: cryptography 설치 + 키 설정 필요)
+# - 폴더/파일 권한은 소유자 전용(0700/0600)으로 생성하며, max_age_hours가 지난 세션은 사용하지 않음
+# - 실행 중 로그인 페이지로 이동되면 세션 만료로 보고 재로그인 (rpa/engine.py)
+import os
+import json
+import time
+import base64
+import hashlib
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+from rpa.retry import TransientPageError
+
+try:
+    import win32crypt  # pywin32 (Windows DPAPI)
+except ImportError:
+    win32crypt = None
+
+try:
+    from cryptography.fernet import Fernet
+except ImportError:
+    Fernet = None
+
+PROJECT_ROOT = Path(__file__).parent.parent
+SESSION_DIR = PROJECT_ROOT / "sessions"
+DEFAULT_MAX_AGE_HOURS = 12
+
+# 로그인 폼(비밀번호 입력란)이 있는 페이지인지 확인
+LOGIN_FORM_SCRIPT = "return !!document.querySelector(\"input[name='userPasswd']\");"
+
+# add_cookie에 전달할 쿠키 항목
+COOKIE_KEYS = ("name", "value", "path", "domain", "secure", "httpOnly", "expiry", "sameSite")
+
+# Windows 외 운영체제에서 세션 암호화 키로 쓰는 환경변수 (임의 문자열, SHA-256으로 Fernet 키 생성)
+SESSION_KEY_ENV = "ADMIN_CONFIRM_SESSION_KEY"
+
+
+class SessionExpiredError(TransientPageError):
+    """실행 중 로그인 세션이 만료되어 로그인 페이지로 이동된 경우"""
+
+
+def is_login_page(driver) -> bool:
+    return bool(driver.execute_script(LOGIN_FORM_SCRIPT))
+
+
+def session_cipher() -> Optional[str]:
+    """사용할 세션 암호화 방식 (dpapi/fernet, 사용할 수 없으면 None)"""
+    if win32crypt is not None:
+        return "dpapi"
+    if Fernet is not None and os.environ.get(SESSION_KEY_ENV):
+        return "fernet"
+    return None
+
+
+def _fernet():
+    secret = os.environ[SESSION_KEY_ENV].encode("utf-8")
+    return Fernet(base64.urlsafe_b64encode(hashlib.sha256(secret).digest()))
+
+
+def encrypt(data: bytes, cipher: str) -> str:
+    if cipher == "dpapi":
+        return base64.b64encode(win32crypt.CryptProtectData(data, "admin_confirm session", None, None, None, 0)).decode("ascii")
+    return _fernet().encrypt(data).decode("ascii")
+
+
+def decrypt(token: str, cipher: str) -> bytes:
+    if cipher == "dpapi":
+        return win32crypt.CryptUnprotectData(base64.b64decode(token), None, None, None, 0)[1]
+    return _fernet().decrypt(token.encode("ascii"))
+
+
+class SessionCache:
+    """로그인 URL + 아이디별 암호화 쿠키 저장소"""
+
+    def __init__(self, login_url: str, user_id: str, directory: Optional[Path] = None,
+                 max_age_hours: float = DEFAULT_MAX_AGE_HOURS, cipher: Optional[str] = None):
+        self.directory = Path(directory or SESSION_DIR)
+        self.max_age_seconds = float(max_age_hours) * 3600
+        self.cipher = cipher or session_cipher()
+        key = hashlib.sha256(f"{urlparse(login_url).netloc}|{user_id}".encode("utf-8")).hexdigest()[:16]
+        self.path = self.directory / f"session_{key}.json"
+
+    def load(self) -> Optional[List[Dict]]:
+        """저장된 쿠키 (없거나 max_age_hours가 지났거나 복호화할 수 없으면 None)"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if time.time() - data.get("saved_at", 0) > self.max_age_seconds:
+            self.clear()
+            return None
+        # 암호화하지 않은 이전 형식이나 다른 방식/키로 암호화한 세션은 삭제
+        if self.cipher is None or data.get("cipher") != self.cipher:
+            self.clear()
+            return None
+        try:
+            cookies = json.loads(decrypt(data["cookies"], self.cipher))
+        except Exception:
+            self.clear()
+            return None
+        return cookies or None
+
+    def save(self, cookies: List[Dict]):
+        """쿠키 암호화 저장 (소유자 전용 권한, 임시 파일 → 교체)"""
+        if self.cipher is None:
+            raise RuntimeError(f"세션 암호화를 사용할 수 없습니다 (Windows: pywin32, 그 외: cryptography + {SESSION_KEY_ENV})")
+        self.directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+        plain = json.dumps([{key: c[key] for key in COOKIE_KEYS if key in c} for c in cookies]).encode("utf-8")
+        data = {"saved_at": time.time(), "cipher": self.cipher, "cookies": encrypt(plain, self.cipher)}
+        fd, temp_path = tempfile.mkstemp(prefix=".session_", suffix=".tmp", dir=str(self.directory))
+        try:
+            os.chmod(temp_path, 0o600)
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(temp_path, self.path)
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+
+    def clear(self):
+        try:
+            self.path.unlink()
+        except OSError:
+            pass
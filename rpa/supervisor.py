@@ -0,0 +1,169 @@
+# supervisor.py - 장시간 실행용 브라우저 재시작/복구 모듈
+# 상세 창을 수천 번 열고 닫는 동안 Chrome 메모리가 계속 늘어나 주문당 처리 시간이 길어지므로,
+# 주문 사이에서 브라우저 상태를 확인하여 필요하면 다시 띄웁니다.
+# - N건마다(browser.recycle_every) 또는 Chrome/chromedriver 프로세스 메모리 합계(RSS)가 browser.max_rss_mb를 넘으면 재시작
+# - 드라이버 세션이 끊긴 경우(invalid session id, chrome not reachable 등) 브라우저를 다시 띄우고 재로그인 → 현재 주문부터 계속
+# - 재시작 전 현재 쿠키를 세션 저장소에 저장하므로 재로그인은 보통 쿠키 주입으로 끝남 (rpa/session.py)
+# - 메모리 측정은 psutil이 설치된 경우에만 동작 (없으면 N건마다 재시작과 세션 끊김 복구만 동작)
+# - 탭 동시 처리(browser.tabs > 1) 중에는 사용하지 않음 (모든 탭이 같은 브라우저를 쓰므로 주문 사이 재시작 불가)
+import time
+from typing import Dict, Optional
+
+from selenium.common.exceptions import InvalidSessionIdException, WebDriverException
+from urllib3.exceptions import HTTPError as DriverConnectionError
+
+try:
+    import psutil
+except ImportError:  # requirements.txt에 포함 (설치되지 않은 환경에서는 메모리 기준 재시작 없이 동작, 실행 로그에 경고)
+    psutil = None
+
+MB = 1024 * 1024
+
+# 기본값: 재시작하지 않음 (설정 browser.recycle_every / browser.max_rss_mb로 사용)
+DEFAULT_RECYCLE_EVERY = 0
+DEFAULT_MAX_RSS_MB = 0
+# 메모리 확인 간격 (주문 수)
+DEFAULT_RSS_CHECK_EVERY = 10
+
+# 브라우저/드라이버가 종료되어 세션을 더 사용할 수 없는 경우의 WebDriver 오류 메시지
+DEAD_SESSION_MESSAGES = (
+    "invalid session id",
+    "no such session",
+    "chrome not reachable",
+    "session deleted because of page crash",
+    "disconnected: not connected to devtools",
+    "tab crashed",
+)
+
+
+def is_dead_session(error: Optional[BaseException]) -> bool:
+    """브라우저 세션이 끊겨 다시 실행해야 하는 오류인지 (요소 없음/타임아웃 같은 일시적 오류는 False)"""
+    if error is None:
+        return False
+    if isinstance(error, InvalidSessionIdException):
+        return True
+    if isinstance(error, WebDriverException):
+        message = str(error).lower()
+        return any(keyword in message for keyword in DEAD_SESSION_MESSAGES)
+    # chromedriver 프로세스가 종료된 경우 (연결 거부)
+    return isinstance(error, (ConnectionError, DriverConnectionError))
+
+
+def browser_rss_bytes(driver) -> Optional[int]:
+    """chromedriver와 하위 Chrome 프로세스의 RSS 합계 (psutil이 없거나 측정할 수 없으면 None)"""
+    if psutil is None or driver is None:
+        return None
+    try:
+        root = psutil.Process(driver.service.process.pid)
+        processes = [root] + root.children(recursive=True)
+    except Exception:
+        return None
+    total = 0
+    for process in processes:
+        try:
+            total += process.memory_info().rss
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            pass
+    return total
+
+
+class BrowserSupervisor:
+    """주문 사이에서 브라우저 재시작 여부 판단 및 재시작/세션 끊김 복구"""
+
+    def __init__(self, engine, recycle_every: int = DEFAULT_RECYCLE_EVERY, max_rss_mb: float = DEFAULT_MAX_RSS_MB,
+                 rss_check_every: int = DEFAULT_RSS_CHECK_EVERY):
+        self.engine = engine
+        self.recycle_every = max(0, int(recycle_every))
+        self.max_rss_bytes = max(0.0, float(max_rss_mb)) * MB
+        self.rss_check_every = max(1, int(rss_check_every))
+        self.orders_since_launch = 0
+        self.restarts = 0
+        self._warned_no_psutil = False
+
+    @classmethod
+    def from_config(cls, engine, browser_config: Optional[Dict]) -> "BrowserSupervisor":
+        """설정 browser 항목으로 생성 (잘못된 값은 기본값 사용)"""
+        browser_config = browser_config or {}
+        values = {}
+        for name, default, cast in (("recycle_every", DEFAULT_RECYCLE_EVERY, int),
+                                    ("max_rss_mb", DEFAULT_MAX_RSS_MB, float),
+                                    ("rss_check_every", DEFAULT_RSS_CHECK_EVERY, int)):
+            try:
+                values[name] = cast(browser_config.get(name, default))
+            except (TypeError, ValueError):
+                values[name] = default
+        return cls(engine, **values)
+
+    def recycle_reason(self) -> Optional[str]:
+        """지금 브라우저를 재시작해야 하는 이유 (필요 없으면 None)"""
+        if self.recycle_every and self.orders_since_launch >= self.recycle_every:
+            return f"{self.orders_since_launch}건 처리"
+        if not self.max_rss_bytes or self.orders_since_launch % self.rss_check_every:
+            return None
+        if psutil is None:
+            if not self._warned_no_psutil:
+                self._warned_no_psutil = True
+                self.engine.log_debug("psutil이 설치되지 않아 메모리 기준 브라우저 재시작(browser.max_rss_mb)을 사용하지 않습니다.")
+            return None
+        rss = browser_rss_bytes(self.engine.driver)
+        if rss is None:
+            return None
+        if rss > self.max_rss_bytes:
+            return f"메모리 {rss / MB:.0f}MB > {self.max_rss_bytes / MB:.0f}MB"
+        return None
+
+    def after_order(self, has_more: bool = True) -> bool:
+        """주문 1건 처리 후 호출 (남은 주문이 있고 재시작 조건이면 재시작), 재시작에 실패하면 False"""
+        self.orders_since_launch += 1
+        if not has_more:
+            return True
+        reason = self.recycle_reason()
+        if reason is None:
+            return True
+        self.engine.log_debug(f"브라우저 재시작 ({reason})")
+        self.engine.metrics.increment("browser.recycle")
+        self.save_session()
+        return self.restart()
+
+    def recover(self) -> bool:
+        """세션이 끊긴 브라우저를 다시 실행하고 재로그인"""
+        self.engine.log_debug("브라우저 세션이 끊겨 브라우저를 다시 실행합니다.")
+        self.engine.metrics.increment("browser.crash")
+        return self.restart()
+
+    def driver_alive(self) -> bool:
+        """드라이버 세션이 살아 있는지 확인 (WebDriver 요청 1회)"""
+        if self.engine.driver is None:
+            return False  # 이전 재시작 실패
+        try:
+            self.engine.driver.current_window_handle
+            return True
+        except Exception as e:
+            return not is_dead_session(e)
+
+    def save_session(self):
+        """재시작 후 쿠키 주입으로 로그인하도록 현재 쿠키 저장"""
+        session_cache = self.engine.get_session_cache()
+        if session_cache is None:
+            return
+        try:
+            session_cache.save(self.engine.driver.get_cookies())
+        except Exception as e:
+            print(f"세션 저장 실패 (재시작 후 로그인 폼으로 로그인): {e}")
+
+    def restart(self) -> bool:
+        """브라우저 종료 → 실행 → 로그인 (성공하면 예약목록 창을 주문 처리 창으로 사용)"""
+        engine = self.engine
+        started = time.perf_counter()
+        with engine.metrics.span('browser.restart'):
+            engine.quit_browser()
+            success = engine.launch_browser() and engine.login()
+        self.orders_since_launch = 0
+        if not success:
+            engine.metrics.increment("browser.restart_failed")
+            engine.log_debug("브라우저 재시작 실패")
+            return False
+        self.restarts += 1
+        engine.main_window = engine.driver.current_window_handle
+        engine.log_debug(f"브라우저 재시작 완료 ({time.perf_counter() - started:.1f}초, {self.restarts}회)")
+        return True
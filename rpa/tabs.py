@@ -0,0 +1,280 @@
+# tabs.py - 한 브라우저의 여러 탭으로 주문 동시 처리
+# 브라우저를 여러 개 띄우는 대신, 로그인한 브라우저 1개에서 탭 K개가 서로 다른 주문을 처리합니다.
+# - 탭마다 스레드 1개가 엔진 처리 로직(handle_order)을 그대로 실행하고, WebDriver 명령은 잠금을 잡은 탭만 보냅니다
+# - 탭은 페이지 로딩/안정화 대기(engine.pause) 동안 잠금을 놓으므로, 그 사이 다른 탭의 명령이 실행됩니다
+#   → 관리자 서버 응답을 기다리는 시간이 탭 수만큼 겹쳐 처리량이 늘어남
+# - 엔진 상태(결과 파일, 재시도 큐, 계측)는 잠금을 잡은 탭만 변경하므로 별도 동기화가 필요 없음
+# - 주문별 상태(현재 창, 마지막 오류, DOM 조회 캐시)는 탭별 엔진 복사본에 둠
+# - 탭 하나에서 예상하지 못한 오류가 나도 해당 주문만 실패/재시도 처리하고 다른 탭은 계속 진행
+# - 실행 중 탭 수를 바꾸면(rpa/control.py) 주문 사이에서 탭을 새로 열거나, 번호가 가장 큰 탭부터 처리를 마치고 빠짐
+import copy
+import time
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from rpa.dom_query import OrderListQuery
+from rpa.retry import LMS_UNCONFIRMED_RESULT, STAGE_ORDER, LmsUnconfirmedError
+
+# 처리할 주문이 없을 때(재시도 대기, 다른 탭 처리 중) 다시 확인하는 간격 (초)
+IDLE_CHECK_INTERVAL = 0.5
+# 페이지 이동 완료 확인 간격 (초)
+NAVIGATION_POLL_INTERVAL = 0.1
+
+# 이동 전 문서에 표시를 남기고 location.assign으로 이동 (driver.get처럼 로딩 완료까지 막지 않음)
+NAVIGATE_SCRIPT = "window.__adminConfirmLeaving = true; window.location.assign(arguments[0]);"
+# 새 문서로 바뀌고 로딩이 끝났는지 확인
+NAVIGATION_DONE_SCRIPT = "return !window.__adminConfirmLeaving && document.readyState === 'complete';"
+
+
+class TabScheduler:
+    """탭들이 WebDriver를 번갈아 사용하도록 조정하는 잠금 (잠금을 다시 잡으면 자기 창으로 전환)"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self._lock = threading.Lock()
+        self._active_handle = None  # 마지막으로 잠금을 놓은 탭이 보고 있던 창
+        self.last_relogin_at = 0.0
+
+    def acquire(self, handle: str):
+        self._lock.acquire()
+        if self._active_handle != handle:
+            try:
+                self.driver.switch_to.window(handle)
+            except Exception:
+                self._lock.release()
+                raise
+            self._active_handle = handle
+
+    def release(self, handle: Optional[str] = None):
+        if handle is not None:
+            self._active_handle = handle
+        self._lock.release()
+
+    def pause(self, seconds: float):
+        """잠금을 놓고 대기한 뒤 다시 잡음 (대기 중 다른 탭이 명령 실행)"""
+        handle = self.driver.current_window_handle
+        self.release(handle)
+        try:
+            time.sleep(seconds)
+        finally:
+            self.acquire(handle)
+
+    def mark_relogin(self):
+        self.last_relogin_at = time.monotonic()
+
+    def relogged_since(self, since: float) -> bool:
+        """since 이후 다른 탭이 이미 재로그인했는지 (같은 세션을 공유하므로 다시 로그인할 필요 없음)"""
+        return self.last_relogin_at > since
+
+
+class TabRunner:
+    """주문 목록과 재시도 큐를 탭 K개에 나누어 처리"""
+
+    def __init__(self, engine, orders: List[Dict], tab_count: int):
+        self.engine = engine
+        self.driver = engine.driver
+        self.scheduler = TabScheduler(engine.driver)
+        self.pending = deque(orders)
+        self.tab_count = tab_count
+        self.busy = 0  # 주문을 처리 중인 탭 수 (재시도를 새로 등록할 수 있음)
+        self.stopping = False
+        self.tabs = []
+        self.active = set()  # 처리 루프가 실행 중인 탭 번호
+        self.threads = []
+
+    def open_tabs(self):
+        """메인 창을 첫 탭으로 쓰고 나머지 탭 생성 (탭별 엔진 복사본 생성)"""
+        handles = [self.engine.main_window]
+        for _ in range(self.tab_count - 1):
+            self.driver.switch_to.new_window('tab')
+            handles.append(self.driver.current_window_handle)
+        self.driver.switch_to.window(self.engine.main_window)
+        self.scheduler._active_handle = self.engine.main_window
+        self.tabs = [self.make_tab(index, handle) for index, handle in enumerate(handles, 1)]
+        self.active = {tab.tab_index for tab in self.tabs}
+
+    def make_tab(self, index: int, handle: str):
+        """탭별 엔진 복사본 (드라이버/결과 파일/재시도 큐/계측은 공유, 창과 주문별 상태는 탭마다)"""
+        tab = copy.copy(self.engine)
+        tab.tab_index = index
+        tab.tab_scheduler = self.scheduler
+        tab.main_window = handle
+        tab.last_error = None
+        tab.session_expired = False
+        tab.order_list = OrderListQuery(self.driver, self.engine.metrics)
+        # 선택자 전략 기억은 모든 탭이 공유 (같은 페이지 구조)
+        tab.order_list.link_strategies = self.engine.order_list.link_strategies
+        return tab
+
+    def next_work(self):
+        """다음 처리할 주문 (새 주문 → 재시도 시각이 된 주문 순서), 대기가 필요하면 (None, 대기 초), 끝나면 (None, None)"""
+        if self.pending:
+            return {"order": self.pending.popleft(), "attempts": 0, "stage": STAGE_ORDER}, 0
+        item = self.engine.retry_queue.pop_ready()
+        if item is not None:
+            return item, 0
+        wait = self.engine.retry_queue.next_ready_in()
+        if wait is not None:
+            return None, min(wait, IDLE_CHECK_INTERVAL)
+        if self.busy:
+            return None, IDLE_CHECK_INTERVAL
+        return None, None
+
+    def run_tab(self, tab):
+        """탭 1개의 처리 루프 (스레드)"""
+        scheduler = self.scheduler
+        try:
+            scheduler.acquire(tab.main_window)
+        except Exception as e:
+            self.active.discard(tab.tab_index)
+            tab.log_debug(f"탭 {tab.tab_index} 전환 실패로 이 탭은 사용하지 않습니다: {e}")
+            return
+        try:
+            while not self.stopping:
+                tab.control_checkpoint()
+                if tab.stop_requested():
+                    self.stopping = True
+                    break
+                if self.retire(tab):
+                    break
+                self.grow(tab)
+                item, wait = self.next_work()
+                if item is None:
+                    if wait is None:
+                        break
+                    scheduler.pause(wait)
+                    continue
+                if not self.handle_item(tab, item):
+                    break
+        finally:
+            self.active.discard(tab.tab_index)
+            try:
+                handle = self.driver.current_window_handle
+            except Exception:
+                handle = None
+            scheduler.release(handle)
+
+    def retire(self, tab) -> bool:
+        """실행 중 탭 수를 줄인 경우 번호가 가장 큰 탭부터 처리를 마침 (잠금을 잡은 상태에서 호출)"""
+        if len(self.active) <= self.engine.tab_count() or tab.tab_index != max(self.active):
+            return False
+        self.active.discard(tab.tab_index)
+        tab.log_debug(f"탭 수 변경으로 탭 {tab.tab_index}의 처리를 마칩니다. (남은 탭 {len(self.active)}개)")
+        return True
+
+    def grow(self, tab):
+        """실행 중 탭 수를 늘린 경우 새 탭 열기 - 남은 새 주문이 있을 때만 (잠금을 잡은 상태에서 호출)"""
+        while self.pending and len(self.active) < self.engine.tab_count():
+            try:
+                self.driver.switch_to.new_window('tab')
+                handle = self.driver.current_window_handle
+                self.driver.switch_to.window(tab.main_window)
+            except Exception as e:
+                tab.log_debug(f"탭 추가 실패 (현재 탭 {len(self.active)}개로 계속 처리): {e}")
+                return
+            new_tab = self.make_tab(len(self.tabs) + 1, handle)
+            self.tabs.append(new_tab)
+            self.start_tab(new_tab)
+            tab.log_debug(f"탭 수 변경으로 탭 {new_tab.tab_index}을 열었습니다. (탭 {len(self.active)}개)")
+
+    def start_tab(self, tab):
+        self.active.add(tab.tab_index)
+        thread = threading.Thread(target=self.run_tab, args=(tab,), name=f"tab-{tab.tab_index}", daemon=True)
+        self.threads.append(thread)
+        thread.start()
+
+    def handle_item(self, tab, item) -> bool:
+        """주문 1건 처리 (탭 오류는 이 주문만 실패/재시도로 처리), 탭을 계속 쓸 수 있으면 True"""
+        data, attempt = item["order"], item["attempts"] + 1
+        if attempt > 1:
+            tab.log_debug(f"[탭 {tab.tab_index}] 재시도 {attempt}/{tab.retry_policy.max_attempts} 시작 (이전 결과: {item['reason']})",
+                          data['order_number'])
+        else:
+            tab.log_debug(f"[탭 {tab.tab_index}] 처리 시작", data['order_number'])
+        self.busy += 1
+        try:
+            tab.handle_order(data, attempt=attempt, stage=item["stage"])
+            return True
+        except Exception as e:
+            tab.log_debug(f"[탭 {tab.tab_index}] 처리 중 예상하지 못한 오류: {e}", data['order_number'])
+            tab.metrics.increment("tabs.error")
+            self.record_tab_failure(tab, data, attempt, item["stage"], e)
+            return self.recover_tab(tab)
+        finally:
+            self.busy -= 1
+
+    def record_tab_failure(self, tab, data, attempt, stage, error):
+        """탭 오류로 끝난 주문은 일시적 실패로 보고 재시도 (시도 횟수를 다 쓰면 결과 기록, LMS 요청이 제출되었을 수 있으면 재시도하지 않음)"""
+        lms_unconfirmed = isinstance(tab.last_error, LmsUnconfirmedError)
+        if tab.retry_policy.can_retry(attempt) and not lms_unconfirmed:
+            tab.retry_queue.defer(data, attempt, stage, "탭오류", last_result=("탭오류", "미처리"))
+            return
+        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        tab.log_result(data['order_number'], data['confirm_number'], "탭오류",
+                       LMS_UNCONFIRMED_RESULT if lms_unconfirmed else "미처리", timestamp, attempts=attempt, row=data.get('row'))
+
+    def recover_tab(self, tab) -> bool:
+        """탭 창 상태 복구 (열린 상세 창 닫기, 탭이 닫혔으면 새 탭 생성), 실패하면 False"""
+        try:
+            handles = self.driver.window_handles
+            if tab.main_window in handles:
+                current = self.driver.current_window_handle
+                if current != tab.main_window:
+                    self.driver.close()
+                self.driver.switch_to.window(tab.main_window)
+                return True
+            self.driver.switch_to.window(handles[0])
+            self.driver.switch_to.new_window('tab')
+            tab.main_window = self.driver.current_window_handle
+            tab.order_list = OrderListQuery(self.driver, tab.metrics)
+            tab.order_list.link_strategies = self.engine.order_list.link_strategies
+            tab.log_debug(f"탭 {tab.tab_index}을 새로 열었습니다.")
+            return True
+        except Exception as e:
+            tab.log_debug(f"탭 {tab.tab_index} 복구 실패로 이 탭의 처리를 중단합니다: {e}")
+            return False
+
+    def run(self):
+        self.open_tabs()
+        print(f"2단계: 탭 {len(self.tabs)}개로 동시 처리")
+        for tab in list(self.tabs):
+            self.start_tab(tab)
+        # 처리 중 탭이 추가될 수 있으므로 목록이 빌 때까지 대기
+        while self.threads:
+            self.threads.pop(0).join()
+
+        # 모든 탭이 실패로 멈춘 경우 남은 주문은 다음 실행에서 처리할 수 있도록 결과에 기록
+        if self.stopping or self.pending or len(self.engine.retry_queue):
+            if self.stopping:
+                self.engine.stop_remaining(list(self.pending))
+            else:
+                self.engine.log_debug(f"사용 가능한 탭이 없어 남은 주문 {len(self.pending)}건을 처리하지 못했습니다.")
+                timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                for data in self.pending:
+                    self.engine.log_result(data['order_number'], data['confirm_number'], "탭오류", "미처리", timestamp,
+                                           attempts=0, row=data.get('row'))
+                for item in self.engine.retry_queue.drain():
+                    status_result, lms_result = item.get('last_result') or ("탭오류", "미처리")
+                    self.engine.log_result(item['order']['order_number'], item['order']['confirm_number'],
+                                           status_result, lms_result, timestamp, attempts=item['attempts'],
+                                           row=item['order'].get('row'))
+        self.engine.relogin_count += sum(tab.relogin_count - self.engine.relogin_count for tab in self.tabs)
+
+        # 추가로 연 탭 닫기 (메인 탭은 유지)
+        for tab in self.tabs[1:]:
+            try:
+                self.driver.switch_to.window(tab.main_window)
+                self.driver.close()
+            except Exception:
+                pass
+        try:
+            self.driver.switch_to.window(self.engine.main_window)
+        except Exception:
+            pass
+
+
+def process_in_tabs(engine, orders: List[Dict], tab_count: int):
+    """주문 목록을 탭 tab_count개로 처리 (재시도 큐 포함)"""
+    TabRunner(engine, orders, tab_count).run()
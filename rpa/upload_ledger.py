@@ -0,0 +1,88 @@
+# upload_ledger.py - 엑셀 업로드 기록 / 분할 파일 모듈
+# 업로드에 성공한 시트/분할 파일의 내용 해시를 업로드 URL별로 기록합니다.
+# 이전 실행이 업로드 후 중단된 경우, 같은 내용의 시트(또는 이미 올린 분할 파일)는 다시 업로드하지 않습니다.
+# - 기록은 결과 디렉토리(file_paths.result_directory)의 upload_ledger.json에 저장 (임시 파일 → 교체)
+# - ledger_days가 지난 기록은 무시하고 저장할 때 정리
+# - 분할 범위는 서버가 실행 계획(run_plan["upload"]["chunks"])에 미리 계산해 둠 (services/run_plan.py)
+import os
+import json
+import time
+import hashlib
+import tempfile
+from pathlib import Path
+from typing import Dict, Optional
+
+PROJECT_ROOT = Path(__file__).parent.parent
+LEDGER_FILE_NAME = "upload_ledger.json"
+DEFAULT_LEDGER_PATH = PROJECT_ROOT / "results" / LEDGER_FILE_NAME
+
+
+class UploadLedger:
+    """업로드 URL + 내용 해시별 업로드 성공 기록"""
+
+    def __init__(self, upload_url: str, ledger_days: float = 7, path: Optional[Path] = None):
+        self.upload_url = upload_url
+        self.max_age_seconds = float(ledger_days) * 86400
+        self.path = Path(path or DEFAULT_LEDGER_PATH)
+
+    def _key(self, content_hash: str) -> str:
+        return hashlib.sha256(f"{self.upload_url}|{content_hash}".encode("utf-8")).hexdigest()
+
+    def _load(self) -> Dict[str, Dict]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        now = time.time()
+        return {key: entry for key, entry in entries.items() if now - entry.get("uploaded_at", 0) <= self.max_age_seconds}
+
+    def get(self, content_hash: str) -> Optional[Dict]:
+        """업로드 기록 (없거나 기간이 지났으면 None)"""
+        return self._load().get(self._key(content_hash))
+
+    def record(self, content_hash: str, execution_id: str, rows: int, label: str):
+        """업로드 성공 기록"""
+        entries = self._load()
+        entries[self._key(content_hash)] = {
+            "uploaded_at": time.time(),
+            "execution_id": execution_id,
+            "rows": rows,
+            "label": label
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(prefix=".upload_ledger_", suffix=".tmp", dir=str(self.path.parent))
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entries, f, ensure_ascii=False, indent=2)
+            os.replace(temp_path, self.path)
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+
+
+def write_chunk_sheet(excel_path: str, upload_plan: Dict, chunk: Dict, directory: str) -> str:
+    """원본 시트의 머리 행(제목/컬럼명)과 분할 범위의 행을 복사하여 분할 파일 생성, 경로 반환 (시트 이름은 업로드용 list)"""
+    import openpyxl
+
+    source = openpyxl.load_workbook(excel_path, read_only=True, data_only=True)
+    try:
+        sheet_name = upload_plan.get("sheet_name")
+        source_sheet = source[sheet_name] if sheet_name in source.sheetnames else source.worksheets[0]
+        workbook = openpyxl.Workbook(write_only=True)
+        sheet = workbook.create_sheet(upload_plan.get("target_sheet_name") or source_sheet.title)
+        header_rows = upload_plan.get("header_rows", 3)
+        for row_number, row in enumerate(source_sheet.iter_rows(values_only=True), start=1):
+            if chunk["end_row"] is not None and row_number > chunk["end_row"]:
+                break
+            if row_number <= header_rows or row_number >= chunk["start_row"]:
+                sheet.append(list(row))
+    finally:
+        source.close()
+
+    path = Path(directory) / f"{Path(excel_path).stem}_{chunk['index']:03d}.xlsx"
+    workbook.save(str(path))
+    return str(path)
@@ -0,0 +1,78 @@
+# worker.py - 예약확정처리 RPA warm worker
+# 실행기가 미리 띄워두는 프로세스입니다.
+# 무거운 모듈(selenium, webdriver_manager, RPA 엔진)을 먼저 import 해 둔 뒤,
+# 표준입력으로 실행 작업(JSON 한 줄)을 받으면 곧바로 엔진을 실행합니다.
+#
+# 작업 형식: {"env": {...}, "stats_path": "...", "spawned_at": 0.0, "sent_at": 0.0}
+# env에 PROFILE_MODE(sampling/deterministic)가 있으면 프로파일러로 감싸 실행합니다 (rpa/profiler.py).
+# 표준입력이 작업 없이 닫히면(서버 종료 등) 그대로 종료합니다.
+import os
+import sys
+import json
+import time
+import importlib
+
+# 미리 import 할 무거운 모듈 (import 비용 측정 포함)
+WARM_MODULES = (
+    "selenium.webdriver",
+    "selenium.webdriver.support.ui",
+    "webdriver_manager.chrome",
+    "rpa.engine",
+)
+
+_import_started = time.perf_counter()
+import_timings = {}
+for _module_name in WARM_MODULES:
+    _started = time.perf_counter()
+    importlib.import_module(_module_name)
+    import_timings[_module_name] = round(time.perf_counter() - _started, 3)
+import_seconds = round(time.perf_counter() - _import_started, 3)
+ready_at = time.time()
+
+
+def write_startup_stats(job: dict, received_at: float):
+    """시작 비용 통계 기록 (실행기가 실행 이력에 첨부)"""
+    stats_path = job.get("stats_path")
+    if not stats_path:
+        return
+
+    spawned_at = job.get("spawned_at") or ready_at
+    sent_at = job.get("sent_at") or received_at
+    # 프로세스 생성부터 import 완료까지의 시작 비용 중, 작업 전달 이후에 기다린 시간만 실제 대기 시간
+    startup_seconds = max(0.0, ready_at - spawned_at)
+    waited_seconds = max(0.0, ready_at - sent_at)
+    stats = {
+        "mode": "warm" if waited_seconds == 0 else "cold",
+        "startup_seconds": round(startup_seconds, 3),
+        "import_seconds": import_seconds,
+        "import_timings": import_timings,
+        "waited_seconds": round(waited_seconds, 3),
+        "saved_seconds": round(startup_seconds - waited_seconds, 3)
+    }
+    try:
+        with open(stats_path, "w", encoding="utf-8") as f:
+            json.dump(stats, f, ensure_ascii=False)
+    except Exception as e:
+        print(f"시작 비용 통계 기록 실패: {e}")
+
+
+def main() -> int:
+    line = sys.stdin.readline()
+    if not line.strip():
+        return 0
+
+    job = json.loads(line)
+    received_at = time.time()
+    os.environ.update(job.get("env", {}))
+    write_startup_stats(job, received_at)
+
+    from rpa.engine import run_from_env
+    profile_mode = os.environ.get("PROFILE_MODE")
+    if profile_mode:
+        from rpa.profiler import run_profiled
+        return run_profiled(run_from_env, profile_mode, os.environ.get("EXECUTION_ID", "unknown"), import_timings)
+    return run_from_env()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
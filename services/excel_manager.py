@@ -1,6 +1,7 @@
 # excel_manager.py - Excel 데이터 관리 모듈
 import pandas as pd
 import os
+import threading
 from pathlib import Path
 from typing import Dict, List, Optional
 
@@ -17,6 +18,8 @@ class ExcelDataManager:
         self.excel_file_path = excel_file_path
         self._data_cache = {}
         self._last_modified = None
+        # 여러 요청 스레드가 동시에 파일 변경을 감지해도 한 번만 다시 읽도록 잠금 사용
+        self._cache_lock = threading.Lock()
         
     def _check_file_exists(self) -> bool:
         """Excel 파일 존재 여부 확인"""
@@ -47,8 +50,9 @@ class ExcelDataManager:
     
     def _update_cache(self):
         """캐시 업데이트"""
-        if self._is_file_modified() or not self._data_cache:
-            self._data_cache = self._load_excel_data()
+        with self._cache_lock:
+            if self._is_file_modified() or not self._data_cache:
+                self._data_cache = self._load_excel_data()
     
     def get_channels(self) -> List[Dict[str, str]]:
         """채널 데이터 반환"""
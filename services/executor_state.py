@@ -0,0 +1,344 @@
+# executor_state.py - 실행기 공유 상태 저장소 (SQLite)
+# uvicorn 워커 여러 개가 같은 실행 상태(실행 중인 작업, 프로세스 PID, 중단/제어 요청, 실행 이력, 실행 카운터)를 보도록 로컬 DB에 저장합니다.
+# 분산 실행 리스 큐(lease_queue.py)도 같은 DB를 사용합니다.
+# - 실행 시작은 BEGIN IMMEDIATE 트랜잭션에서 "실행 중인 작업(단일/분산)이 없는지 확인 + 등록"을 함께 수행 (워커 간 동시 시작 방지)
+# - 조회는 쓰기 잠금 없이 읽고, 정리할 실행이 있을 때만 쓰기 트랜잭션 사용 (다른 워커가 쓰는 동안 조회가 막히지 않도록)
+# - 프로세스 객체와 모니터링 스레드는 실행을 시작한 워커(owner_pid)에만 있고, 다른 워커는 PID로 생존 확인/강제 종료
+# - 실행을 시작한 워커와 RPA 프로세스가 모두 종료된 실행은 조회 시 failed로 정리
+# - 실행 이력 항목은 JSON으로 저장 (단계별 계측, 시작 비용 등 첨부 항목이 실행마다 다름)
+# - /metrics 단계별 히스토그램 누적값도 실행 카운터 옆(stage_metrics)에 저장 (워커 재시작/다른 워커에서도 같은 값)
+# - result_store.py와 같이 WAL 모드, 작업마다 연결을 열고 닫음
+import os
+import json
+import signal
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import psutil
+
+PROJECT_ROOT = Path(__file__).parent.parent
+DEFAULT_DB_PATH = PROJECT_ROOT / "temp_configs" / "executor_state.db"
+
+# 실행 중 상태 (중단 요청은 stop_requested_at으로 표시)
+RUNNING = "running"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS executions (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    execution_id TEXT NOT NULL UNIQUE,
+    status TEXT NOT NULL,
+    owner_pid INTEGER NOT NULL,
+    pid INTEGER,
+    stop_requested_at TEXT,
+    control TEXT,
+    status_returned INTEGER NOT NULL DEFAULT 0,
+    item TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_executions_status ON executions (status);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS stage_metrics (
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (kind, name)
+);
+CREATE TABLE IF NOT EXISTS lease_runs (
+    run_id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    plan TEXT NOT NULL,
+    config TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_lease_runs_status ON lease_runs (status);
+CREATE TABLE IF NOT EXISTS lease_batches (
+    batch_id TEXT PRIMARY KEY,
+    run_id TEXT NOT NULL,
+    state TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_lease_batches_run ON lease_batches (run_id);
+CREATE INDEX IF NOT EXISTS idx_lease_batches_state ON lease_batches (state);
+"""
+
+
+def pid_alive(pid: Optional[int]) -> bool:
+    """프로세스가 실행 중인지 (종료 후 회수되지 않은 자식 프로세스는 실행 중으로 봄)"""
+    if not pid:
+        return False
+    return psutil.pid_exists(pid)
+
+
+def kill_pid(pid: int):
+    """다른 워커가 시작한 RPA 프로세스 강제 종료 (Windows는 TerminateProcess)"""
+    os.kill(pid, getattr(signal, "SIGKILL", signal.SIGTERM))
+
+
+class ExecutorStateStore:
+    """실행기 상태 저장/조회 (여러 서버 프로세스가 공유)"""
+
+    def __init__(self, db_path=None):
+        self.db_path = Path(db_path or os.environ.get("ADMIN_CONFIRM_STATE_DB") or DEFAULT_DB_PATH)
+        self._initialized = False
+        self._init_lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._initialized:
+            with self._init_lock:
+                if not self._initialized:
+                    self.db_path.parent.mkdir(parents=True, exist_ok=True)
+                    conn = sqlite3.connect(str(self.db_path), timeout=30)
+                    try:
+                        conn.execute("PRAGMA journal_mode=WAL")
+                        conn.executescript(SCHEMA)
+                        conn.commit()
+                    finally:
+                        conn.close()
+                    self._initialized = True
+        conn = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    @contextmanager
+    def transaction(self):
+        """쓰기 잠금을 먼저 잡는 트랜잭션 (확인 후 변경 사이에 다른 워커가 끼어들지 않음)"""
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+
+    @contextmanager
+    def connection(self):
+        """쓰기 잠금 없이 조회하는 연결 (자동 커밋)"""
+        conn = self._connect()
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _row(row: Optional[sqlite3.Row]) -> Optional[Dict]:
+        if row is None:
+            return None
+        data = dict(row)
+        data["item"] = json.loads(data["item"])
+        data["control"] = json.loads(data["control"]) if data["control"] else None
+        return data
+
+    @staticmethod
+    def _increment(conn: sqlite3.Connection, name: str):
+        conn.execute("INSERT INTO counters (name, value) VALUES (?, 1) "
+                     "ON CONFLICT(name) DO UPDATE SET value = value + 1", (name,))
+
+    # ===== 실행 시작 =====
+
+    def claim_run(self, execution_id: str, item: Dict) -> Optional[Dict]:
+        """
+        실행 등록 (실행 중인 작업과 진행 중인 분산 실행이 없을 때만)
+
+        Returns:
+            등록했으면 None, 다른 실행이 있으면 그 실행 (분산 실행이면 {"execution_id", "distributed": True})
+        """
+        with self.transaction() as conn:
+            active = self.active_locked(conn)
+            if active is not None:
+                return active
+            distributed = conn.execute("SELECT run_id FROM lease_runs WHERE status = 'running' LIMIT 1").fetchone()
+            if distributed is not None:
+                return {"execution_id": distributed["run_id"], "distributed": True}
+            conn.execute("INSERT INTO executions (execution_id, status, owner_pid, item) VALUES (?, ?, ?, ?)",
+                         (execution_id, RUNNING, os.getpid(), json.dumps(item, ensure_ascii=False, default=str)))
+            self._increment(conn, "started")
+            return None
+
+    def set_process(self, execution_id: str, pid: int, updates: Dict):
+        """RPA 프로세스 시작 후 PID와 이력 항목(파일별 요약 등) 기록"""
+        with self.transaction() as conn:
+            row = conn.execute("SELECT item FROM executions WHERE execution_id = ?", (execution_id,)).fetchone()
+            item = {**json.loads(row["item"]), **updates}
+            conn.execute("UPDATE executions SET pid = ?, item = ? WHERE execution_id = ?",
+                         (pid, json.dumps(item, ensure_ascii=False, default=str), execution_id))
+
+    def release_run(self, execution_id: str):
+        """시작에 실패한 실행 제거"""
+        with self.transaction() as conn:
+            conn.execute("DELETE FROM executions WHERE execution_id = ?", (execution_id,))
+            conn.execute("UPDATE counters SET value = value - 1 WHERE name = 'started'")
+
+    # ===== 실행 중 =====
+
+    @staticmethod
+    def _select_active(conn: sqlite3.Connection) -> Optional[sqlite3.Row]:
+        return conn.execute("SELECT * FROM executions WHERE status = ? ORDER BY seq DESC LIMIT 1", (RUNNING,)).fetchone()
+
+    @staticmethod
+    def _orphaned(active: Dict) -> bool:
+        """시작한 워커와 RPA 프로세스가 모두 종료된 실행인지"""
+        return active["owner_pid"] != os.getpid() and not pid_alive(active["owner_pid"]) and not pid_alive(active["pid"])
+
+    def active_locked(self, conn: sqlite3.Connection) -> Optional[Dict]:
+        """실행 중인 작업 (쓰기 트랜잭션에서 호출, 시작한 워커와 RPA 프로세스가 모두 종료되었으면 failed로 정리)"""
+        active = self._row(self._select_active(conn))
+        if active is None or not self._orphaned(active):
+            return active
+        item = active["item"]
+        end_time = datetime.now()
+        item.update({"status": "failed", "end_time": end_time.isoformat(), "return_code": -1, "orphaned": True,
+                     "duration": str(end_time - datetime.fromisoformat(item["start_time"])).split('.')[0]})
+        conn.execute("UPDATE executions SET status = 'failed', item = ? WHERE execution_id = ?",
+                     (json.dumps(item, ensure_ascii=False, default=str), active["execution_id"]))
+        self._increment(conn, "failed")
+        print(f"실행한 서버 프로세스가 종료되어 실패로 기록: {active['execution_id']}")
+        return None
+
+    def get_active(self) -> Optional[Dict]:
+        """실행 중인 작업 (쓰기 잠금 없이 조회, 정리할 실행이 있을 때만 쓰기 트랜잭션)"""
+        with self.connection() as conn:
+            active = self._row(self._select_active(conn))
+        if active is None or not self._orphaned(active):
+            return active
+        with self.transaction() as conn:
+            return self.active_locked(conn)
+
+    def get(self, execution_id: str) -> Optional[Dict]:
+        conn = self._connect()
+        try:
+            return self._row(conn.execute("SELECT * FROM executions WHERE execution_id = ?", (execution_id,)).fetchone())
+        finally:
+            conn.close()
+
+    def request_stop(self, execution_id: str) -> bool:
+        """중단 요청 시각 기록 (이미 요청했거나 실행 중이 아니면 False)"""
+        with self.transaction() as conn:
+            cursor = conn.execute("UPDATE executions SET stop_requested_at = ? "
+                                  "WHERE execution_id = ? AND status = ? AND stop_requested_at IS NULL",
+                                  (datetime.now().isoformat(), execution_id, RUNNING))
+            return cursor.rowcount == 1
+
+    def update_control(self, execution_id: str, update: Callable[[Dict], None]) -> Optional[Dict]:
+        """실행 중인 작업의 제어 상태 변경 (update가 제어 상태를 수정, 실행 중이 아니면 None)"""
+        with self.transaction() as conn:
+            row = self._row(conn.execute("SELECT * FROM executions WHERE execution_id = ? AND status = ?",
+                                         (execution_id, RUNNING)).fetchone())
+            if row is None:
+                return None
+            control = row["control"] or {"version": 0, "paused": False, "timing": {}, "tabs": None}
+            update(control)
+            conn.execute("UPDATE executions SET control = ? WHERE execution_id = ?",
+                         (json.dumps(control, ensure_ascii=False), execution_id))
+            return {**row, "control": control}
+
+    # ===== 실행 종료 =====
+
+    def finish_run(self, execution_id: str, status: str, return_code: Optional[int],
+                   attach: Callable[[Dict], Optional[Dict]]) -> Optional[Dict]:
+        """
+        실행 종료 기록 (실행 중인 경우에만, 먼저 기록한 쪽만 적용)
+
+        Args:
+            attach: 이력 항목에 계측 결과 등을 첨부하는 함수 (트랜잭션 안에서 호출).
+                    단계 계측 snapshot을 반환하면 같은 트랜잭션에서 누적 계측에 합산
+
+        Returns:
+            기록한 이력 항목 (이미 종료로 기록된 실행이면 None)
+        """
+        with self.transaction() as conn:
+            row = conn.execute("SELECT item FROM executions WHERE execution_id = ? AND status = ?",
+                               (execution_id, RUNNING)).fetchone()
+            if row is None:
+                return None
+            item = json.loads(row["item"])
+            end_time = datetime.now()
+            item.update({"status": status, "end_time": end_time.isoformat(),
+                         "duration": str(end_time - datetime.fromisoformat(item["start_time"])).split('.')[0]})
+            if return_code is not None:
+                item["return_code"] = return_code
+            stage_snapshot = attach(item)
+            if stage_snapshot:
+                self._merge_stage_metrics(conn, stage_snapshot)
+            conn.execute("UPDATE executions SET status = ?, item = ? WHERE execution_id = ?",
+                         (status, json.dumps(item, ensure_ascii=False, default=str), execution_id))
+            if status in ("completed", "failed", "stopped"):
+                self._increment(conn, status)
+            return item
+
+    @staticmethod
+    def _merge_stage_metrics(conn: sqlite3.Connection, snapshot: Dict):
+        """실행별 단계 계측 snapshot(rpa/metrics.py)을 누적 히스토그램/이벤트 카운터에 합산"""
+        from rpa.metrics import Histogram, DEFAULT_BUCKETS
+
+        for name, data in snapshot.get("histograms", {}).items():
+            row = conn.execute("SELECT data FROM stage_metrics WHERE kind = 'histogram' AND name = ?", (name,)).fetchone()
+            histogram = Histogram(data.get("buckets", DEFAULT_BUCKETS))
+            if row is not None:
+                histogram.merge(json.loads(row["data"]))
+            histogram.merge(data)
+            conn.execute("INSERT OR REPLACE INTO stage_metrics (kind, name, data) VALUES ('histogram', ?, ?)",
+                         (name, json.dumps(histogram.to_dict())))
+        for name, value in snapshot.get("counters", {}).items():
+            conn.execute("INSERT INTO stage_metrics (kind, name, data) VALUES ('event', ?, ?) "
+                         "ON CONFLICT(kind, name) DO UPDATE SET data = CAST(data AS INTEGER) + excluded.data",
+                         (name, int(value)))
+
+    def take_finished(self) -> Optional[Dict]:
+        """가장 최근 실행이 종료되었고 아직 상태 조회로 반환하지 않았으면 그 이력 항목 (한 번만 반환)"""
+        with self.connection() as conn:
+            row = conn.execute("SELECT execution_id, status, status_returned, item FROM executions "
+                               "ORDER BY seq DESC LIMIT 1").fetchone()
+            if row is None or row["status"] == RUNNING or row["status_returned"]:
+                return None
+            # 여러 워커가 동시에 조회해도 한 번만 반환 (표시를 먼저 바꾼 쪽만 반환)
+            cursor = conn.execute("UPDATE executions SET status_returned = 1 WHERE execution_id = ? AND status_returned = 0",
+                                  (row["execution_id"],))
+            return json.loads(row["item"]) if cursor.rowcount == 1 else None
+
+    # ===== 조회 =====
+
+    def history(self, limit: int = 10) -> List[Dict]:
+        """최근 실행 이력 (오래된 순)"""
+        conn = self._connect()
+        try:
+            rows = conn.execute("SELECT item FROM executions ORDER BY seq DESC LIMIT ?", (max(0, int(limit)),)).fetchall()
+        finally:
+            conn.close()
+        return [json.loads(row["item"]) for row in reversed(rows)]
+
+    def counters(self) -> Dict[str, int]:
+        conn = self._connect()
+        try:
+            return {row["name"]: row["value"] for row in conn.execute("SELECT name, value FROM counters")}
+        finally:
+            conn.close()
+
+    def stage_metrics(self) -> Dict:
+        """종료된 실행들의 단계별 계측 누적값 (MetricsRegistry.snapshot() 형식)"""
+        conn = self._connect()
+        try:
+            rows = conn.execute("SELECT kind, name, data FROM stage_metrics").fetchall()
+        finally:
+            conn.close()
+        return {
+            "histograms": {row["name"]: json.loads(row["data"]) for row in rows if row["kind"] == "histogram"},
+            "counters": {row["name"]: int(row["data"]) for row in rows if row["kind"] == "event"}
+        }
+
+
+# 전역 인스턴스
+executor_state = ExecutorStateStore()
+
+def get_executor_state() -> ExecutorStateStore:
+    """실행기 공유 상태 저장소 인스턴스 반환"""
+    return executor_state
@@ -0,0 +1,97 @@
+# file_lock.py - 프로세스 간 파일 잠금 모듈
+# 여러 uvicorn 워커(ADMIN_CONFIRM_WORKERS)가 같은 파일/자원을 다룰 때 사용합니다 (설정 파일 수정, 업로드 파싱, warm worker 소유).
+# - Windows는 msvcrt.locking, 그 외 운영체제는 fcntl.flock 사용 (표준 라이브러리만 사용)
+# - 잠근 프로세스가 종료되면 운영체제가 잠금을 해제하므로 남은 잠금 파일을 정리할 필요가 없음
+# - 같은 FileLock 객체는 프로세스 안의 스레드끼리도 배타적으로 사용 (획득한 스레드와 다른 스레드에서 해제 가능)
+import os
+import time
+import threading
+from pathlib import Path
+from typing import Optional
+
+try:
+    import msvcrt
+except ImportError:  # Windows 외 운영체제
+    msvcrt = None
+    import fcntl
+
+# 잠금 대기 중 재시도 간격 (초)
+LOCK_POLL_INTERVAL = 0.05
+
+
+def _try_lock(fd: int) -> bool:
+    """잠금 파일 핸들을 대기 없이 잠금 (다른 프로세스가 잠갔으면 False)"""
+    try:
+        if msvcrt is not None:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        else:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return True
+    except OSError:
+        return False
+
+
+def _unlock(fd: int):
+    if msvcrt is not None:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+    else:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+class FileLock:
+    """잠금 파일 1개에 대한 프로세스 간 배타 잠금"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._thread_lock = threading.Lock()
+        self._fd = None
+
+    def acquire(self, blocking: bool = True, timeout: Optional[float] = None) -> bool:
+        """
+        잠금 획득
+
+        Args:
+            blocking: False이면 다른 곳에서 잠갔을 때 기다리지 않고 False 반환
+            timeout: 최대 대기 시간 (초, None이면 계속 대기)
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        if not self._thread_lock.acquire(blocking, -1 if timeout is None or not blocking else timeout):
+            return False
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(str(self.path), os.O_RDWR | os.O_CREAT, 0o644)
+        except BaseException:
+            self._thread_lock.release()
+            raise
+        while not _try_lock(fd):
+            if not blocking or (deadline is not None and time.monotonic() >= deadline):
+                os.close(fd)
+                self._thread_lock.release()
+                return False
+            time.sleep(LOCK_POLL_INTERVAL)
+        self._fd = fd
+        return True
+
+    def release(self):
+        fd, self._fd = self._fd, None
+        try:
+            _unlock(fd)
+        finally:
+            os.close(fd)
+            self._thread_lock.release()
+
+    def is_locked_elsewhere(self) -> bool:
+        """다른 프로세스(또는 이 객체를 쓰는 다른 스레드)가 잠갔는지 확인 (잠겨 있지 않으면 바로 해제)"""
+        if not self.acquire(blocking=False):
+            return True
+        self.release()
+        return False
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
@@ -0,0 +1,472 @@
+# lease_queue.py - 분산 실행 코디네이터 (HTTP 리스 큐) 모듈
+# 서버가 실행 계획의 주문 목록을 배치로 나누고, 워커 에이전트(rpa/agent.py)가 HTTP로 배치를 리스하여 처리합니다.
+# - 첫 배치는 확정번호 엑셀 업로드 작업이며, 업로드가 끝나야 주문 배치를 리스합니다 (단일 실행과 같은 순서)
+# - 에이전트는 처리 중 리스를 갱신하고, 주문별 최종 결과를 즉시 보고합니다
+# - 갱신이 끊긴 리스(에이전트 종료)는 만료 후 보고되지 않은 주문만 다시 리스합니다
+# - 주문별 결과는 시트 행 번호로 구분합니다 (같은 주문번호가 여러 행에 있어도 행마다 결과 기록)
+# - 실행/배치는 실행기 공유 상태 DB(executor_state.py)에 저장하여 uvicorn 워커 여러 개가 같은 큐를 사용합니다
+#   (작업마다 쓰기 트랜잭션에서 필요한 실행만 불러와 처리하고 바뀐 실행/배치만 저장 - 갱신/보고는 리스한 배치의 실행만)
+# - 분산 실행과 단일 실행(project_executor.py)은 같은 트랜잭션에서 서로 진행 중인지 확인하여 동시에 실행하지 않습니다
+import json
+import uuid
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from services.executor_state import get_executor_state
+
+# 기본값
+DEFAULT_BATCH_SIZE = 20
+DEFAULT_LEASE_SECONDS = 120
+MAX_LEASE_ATTEMPTS = 3  # 배치별 최대 리스 횟수 (만료될 때마다 1회 증가)
+
+BATCH_UPLOAD = "upload"
+BATCH_ORDERS = "orders"
+
+# 배치 상태
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+
+# 리스 만료 횟수를 초과한 주문의 결과
+LEASE_EXPIRED_RESULT = "리스만료"
+
+
+class LeaseLostError(Exception):
+    """리스가 만료되어 다른 에이전트에 재할당된 경우"""
+
+
+class LeaseQueue:
+    """분산 실행별 배치 리스 관리 (공유 DB 저장, 워커/스레드 안전)"""
+
+    def __init__(self, state=None):
+        self.state = state or get_executor_state()
+        # 이 워커 안의 스레드끼리는 잠금, 워커 간에는 DB 쓰기 트랜잭션으로 동기화
+        self._lock = threading.Lock()
+        # 작업 중 불러온 실행/배치 (작업이 끝나면 비움)
+        self.runs: Dict[str, Dict] = {}
+        self.batches: Dict[str, Dict] = {}
+        self._loaded: Dict[str, Dict[str, str]] = {"runs": {}, "batches": {}}  # 불러온 시점의 JSON (바뀐 것만 저장)
+
+    # ===== 저장 =====
+
+    @contextmanager
+    def _session(self, run_id: Optional[str] = None):
+        """
+        run_id 실행을 불러와 작업하고 바뀐 실행/배치를 저장 (한 쓰기 트랜잭션, 작업 중 _load_run으로 더 불러올 수 있음)
+
+        리스 만료 처리는 LeaseLostError가 발생해도 저장한 뒤 오류를 전달합니다.
+        """
+        lost = None
+        with self._lock:
+            try:
+                with self.state.transaction() as conn:
+                    self._loaded = {"runs": {}, "batches": {}}
+                    if run_id is not None:
+                        self._load_run(conn, run_id)
+                    try:
+                        yield conn
+                    except LeaseLostError as e:
+                        lost = e
+                    self._save(conn, self._loaded)
+            finally:
+                self.runs, self.batches = {}, {}
+        if lost is not None:
+            raise lost
+
+    def _load_run(self, conn, run_id: str) -> Optional[Dict]:
+        """실행 1개와 배치를 불러옴 (없으면 None, 이미 불러왔으면 그대로 반환)"""
+        if run_id in self.runs:
+            return self.runs[run_id]
+        row = conn.execute("SELECT * FROM lease_runs WHERE run_id = ?", (run_id,)).fetchone()
+        if row is None:
+            return None
+        run = json.loads(row["data"])
+        run["plan"] = json.loads(row["plan"])
+        run["config"] = json.loads(row["config"])
+        run["created_at"] = datetime.fromisoformat(run["created_at"])
+        run["finished_at"] = datetime.fromisoformat(run["finished_at"]) if run["finished_at"] else None
+        self.runs[run_id] = run
+        self._loaded["runs"][run_id] = row["data"]
+        for batch_row in conn.execute("SELECT data FROM lease_batches WHERE run_id = ?", (run_id,)):
+            batch = json.loads(batch_row["data"])
+            self.batches[batch["batch_id"]] = batch
+            self._loaded["batches"][batch["batch_id"]] = batch_row["data"]
+        return run
+
+    def _load_batch_run(self, conn, lease_id: str) -> Optional[Dict]:
+        """리스한 배치의 실행만 불러옴 (배치가 없으면 None)"""
+        row = conn.execute("SELECT run_id FROM lease_batches WHERE batch_id = ?", (lease_id,)).fetchone()
+        return self._load_run(conn, row["run_id"]) if row else None
+
+    @staticmethod
+    def _dump_run(run: Dict) -> str:
+        """실행 상태 JSON (실행 계획과 설정은 생성할 때만 저장)"""
+        return json.dumps({key: value for key, value in run.items() if key not in ("plan", "config")},
+                          ensure_ascii=False, default=lambda value: value.isoformat())
+
+    @staticmethod
+    def _dump_batch(batch: Dict) -> str:
+        return json.dumps(batch, ensure_ascii=False)
+
+    def _save(self, conn, loaded: Dict[str, Dict[str, str]]):
+        """불러온 뒤 바뀐 실행/배치만 저장 (새로 만든 실행은 추가)"""
+        for run_id, run in self.runs.items():
+            data = self._dump_run(run)
+            if run_id not in loaded["runs"]:
+                conn.execute("INSERT INTO lease_runs (run_id, status, plan, config, data) VALUES (?, ?, ?, ?, ?)",
+                             (run_id, run["status"], json.dumps(run["plan"], ensure_ascii=False),
+                              json.dumps(run["config"], ensure_ascii=False), data))
+            elif data != loaded["runs"][run_id]:
+                conn.execute("UPDATE lease_runs SET status = ?, data = ? WHERE run_id = ?", (run["status"], data, run_id))
+        for batch_id, batch in self.batches.items():
+            data = self._dump_batch(batch)
+            if batch_id not in loaded["batches"]:
+                conn.execute("INSERT INTO lease_batches (batch_id, run_id, state, data) VALUES (?, ?, ?, ?)",
+                             (batch_id, batch["run_id"], batch["state"], data))
+            elif data != loaded["batches"][batch_id]:
+                conn.execute("UPDATE lease_batches SET state = ?, data = ? WHERE batch_id = ?", (batch["state"], data, batch_id))
+
+    # ===== 실행 생성 =====
+    def create_run(self, plan: Dict, runtime_config: Dict, batch_size: int = DEFAULT_BATCH_SIZE,
+                   lease_seconds: float = DEFAULT_LEASE_SECONDS) -> Dict:
+        """
+        분산 실행 생성 (업로드 배치 1개 + 주문 배치 N개)
+
+        Args:
+            plan: 실행 계획 (services.run_plan.compile_run_plan 결과)
+            runtime_config: 병합된 런타임 설정 (에이전트에 전달)
+            batch_size: 배치당 주문 수
+            lease_seconds: 리스 유지 시간 (에이전트가 이 시간 안에 갱신해야 함)
+        """
+        batch_size = max(1, int(batch_size))
+        run_id = plan["execution_id"]
+        orders = plan["orders"]
+
+        batch_ids = []
+        with self._session() as conn:
+            # 단일 실행과 동시에 실행하지 않음 (단일 실행 시작도 같은 방식으로 분산 실행을 확인)
+            if self.state.active_locked(conn) is not None:
+                raise ValueError("단일 실행이 진행 중이라 분산 실행을 만들 수 없습니다")
+            if run_id in self.runs or conn.execute("SELECT 1 FROM lease_runs WHERE run_id = ?", (run_id,)).fetchone():
+                raise ValueError(f"이미 등록된 분산 실행입니다: {run_id}")
+            chunks = [[]] + [orders[i:i + batch_size] for i in range(0, len(orders), batch_size)]
+            for index, chunk in enumerate(chunks):
+                batch_id = f"{run_id}-{index:04d}"
+                self.batches[batch_id] = {
+                    "batch_id": batch_id,
+                    "run_id": run_id,
+                    "kind": BATCH_UPLOAD if index == 0 else BATCH_ORDERS,
+                    "orders": chunk,
+                    "state": PENDING,
+                    "token": None,
+                    "agent_id": None,
+                    "expires_at": None,
+                    "lease_count": 0
+                }
+                batch_ids.append(batch_id)
+
+            created_at = datetime.now()
+            self.runs[run_id] = {
+                "run_id": run_id,
+                "status": "running",
+                "created_at": created_at,
+                "finished_at": None,
+                "plan": plan,
+                "config": runtime_config,
+                "lease_seconds": float(lease_seconds),
+                "batch_ids": batch_ids,
+                "results": {},  # 시트 행 번호(문자열) -> 최종 결과
+                "agents": {},  # agent_id -> 마지막 보고 시각
+                "result_file": None
+            }
+            # 검증 오류 행은 단일 실행과 같이 처리 전에 결과 DB에 기록
+            self._store_results(self.runs[run_id], [
+                {"order_number": skipped["order_number"], "confirm_number": skipped["confirm_number"],
+                 "status_result": f"검증오류({skipped['issue']})", "lms_result": "미처리",
+                 "timestamp": created_at.strftime('%Y-%m-%d %H:%M:%S'), "attempts": 0}
+                for skipped in plan.get("skipped_rows", [])
+            ])
+            return self._run_summary(self.runs[run_id])
+
+    # ===== 리스 =====
+
+    def lease(self, agent_id: str, now: Optional[datetime] = None) -> Optional[Dict]:
+        """대기 중인 배치 1개를 리스 (없으면 None)"""
+        now = now or datetime.now()
+        with self._session() as conn:
+            for row in conn.execute("SELECT run_id FROM lease_runs WHERE status = 'running'").fetchall():
+                self._load_run(conn, row["run_id"])
+            self._expire_leases(now)
+            for run in self.runs.values():
+                if run["status"] != "running":
+                    continue
+                batch = self._next_batch(run)
+                if batch is None:
+                    continue
+
+                batch["state"] = LEASED
+                batch["token"] = uuid.uuid4().hex
+                batch["agent_id"] = agent_id
+                batch["lease_count"] += 1
+                batch["expires_at"] = now.timestamp() + run["lease_seconds"]
+                run["agents"][agent_id] = now.isoformat()
+
+                # 이전 리스에서 이미 보고된 주문은 제외
+                remaining = [order for order in batch["orders"] if self._row_key(order) not in run["results"]]
+                return {
+                    "lease_id": batch["batch_id"],
+                    "token": batch["token"],
+                    "run_id": run["run_id"],
+                    "kind": batch["kind"],
+                    "lease_seconds": run["lease_seconds"],
+                    "config": run["config"],
+                    "plan": {**run["plan"], "orders": remaining, "skipped_rows": []}
+                }
+        return None
+
+    def _next_batch(self, run: Dict) -> Optional[Dict]:
+        """리스할 배치 선택 (업로드 배치가 끝나기 전에는 주문 배치를 리스하지 않음)"""
+        batches = [self.batches[batch_id] for batch_id in run["batch_ids"]]
+        upload_batch = batches[0]
+        if upload_batch["state"] != DONE:
+            return upload_batch if upload_batch["state"] == PENDING else None
+        for batch in batches[1:]:
+            if batch["state"] == PENDING:
+                return batch
+        return None
+
+    def renew(self, lease_id: str, token: str, now: Optional[datetime] = None) -> float:
+        """리스 갱신, 새 만료까지 남은 시간(초) 반환"""
+        now = now or datetime.now()
+        with self._session() as conn:
+            self._load_batch_run(conn, lease_id)
+            self._expire_leases(now)
+            batch = self._leased_batch(lease_id, token)
+            run = self.runs[batch["run_id"]]
+            batch["expires_at"] = now.timestamp() + run["lease_seconds"]
+            run["agents"][batch["agent_id"]] = now.isoformat()
+            return run["lease_seconds"]
+
+    def report(self, lease_id: str, token: str, results: List[Dict], done: bool = False,
+               success: bool = True, now: Optional[datetime] = None) -> Dict:
+        """
+        주문별 결과 보고 (done=True이면 배치 완료)
+
+        업로드 배치는 success=False로 완료 보고하면 다시 리스합니다 (최대 MAX_LEASE_ATTEMPTS회).
+        """
+        now = now or datetime.now()
+        with self._session() as conn:
+            self._load_batch_run(conn, lease_id)
+            self._expire_leases(now)
+            batch = self._leased_batch(lease_id, token)
+            run = self.runs[batch["run_id"]]
+            batch["expires_at"] = now.timestamp() + run["lease_seconds"]  # 보고도 갱신으로 취급
+            run["agents"][batch["agent_id"]] = now.isoformat()
+
+            batch_orders = {self._row_key(order): order for order in batch["orders"]}
+            accepted = []
+            for result in results:
+                key = self._result_key(run, batch_orders, result)
+                if key is None:
+                    continue
+                if key not in run["results"]:
+                    accepted.append(result)
+                run["results"][key] = {**result, "agent_id": batch["agent_id"]}
+            self._store_results(run, accepted)
+
+            if done:
+                if batch["kind"] == BATCH_UPLOAD and not success:
+                    self._release(batch, run)
+                else:
+                    batch["state"] = DONE
+                    batch["token"] = None
+                self._check_finished(run, now)
+            return {"accepted": len(accepted), "run_status": run["status"]}
+
+    @staticmethod
+    def _row_key(order: Dict) -> str:
+        """결과 키 (시트 행 번호, JSON으로 저장하므로 문자열)"""
+        return str(order["row"])
+
+    @staticmethod
+    def _result_key(run: Dict, batch_orders: Dict[str, Dict], result: Dict) -> Optional[str]:
+        """보고된 결과의 행 키 (배치에 없는 행이면 None, 행 번호가 없는 결과는 결과가 없는 같은 주문번호의 첫 행)"""
+        if result.get("row") is not None:
+            key = str(result["row"])
+            return key if key in batch_orders else None
+        for key, order in batch_orders.items():
+            if order["order_number"] == result.get("order_number") and key not in run["results"]:
+                return key
+        return None
+
+    def _leased_batch(self, lease_id: str, token: str) -> Dict:
+        batch = self.batches.get(lease_id)
+        if batch is None or batch["state"] != LEASED or batch["token"] != token:
+            raise LeaseLostError(f"리스가 만료되었거나 다른 에이전트에 재할당되었습니다: {lease_id}")
+        return batch
+
+    def _expire_leases(self, now: datetime):
+        """만료된 리스 회수 (_session 안에서 호출)"""
+        for batch in self.batches.values():
+            if batch["state"] == LEASED and batch["expires_at"] is not None and batch["expires_at"] < now.timestamp():
+                run = self.runs[batch["run_id"]]
+                print(f"리스 만료: {batch['batch_id']} (에이전트 {batch['agent_id']})")
+                self._release(batch, run)
+                self._check_finished(run, now)
+
+    def _release(self, batch: Dict, run: Dict):
+        """배치를 다시 리스 가능하게 하거나, 리스 횟수를 초과하면 실패 처리"""
+        batch["token"] = None
+        batch["expires_at"] = None
+        if batch["lease_count"] < MAX_LEASE_ATTEMPTS:
+            batch["state"] = PENDING
+            return
+
+        batch["state"] = FAILED
+        if batch["kind"] == BATCH_UPLOAD:
+            # 업로드 실패 시 단일 실행과 같이 주문을 처리하지 않고 중단
+            run["status"] = "failed"
+            for batch_id in run["batch_ids"]:
+                if self.batches[batch_id]["state"] == PENDING:
+                    self.batches[batch_id]["state"] = FAILED
+            return
+        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        expired = []
+        for order in batch["orders"]:
+            key = self._row_key(order)
+            if key not in run["results"]:
+                expired.append(key)
+                run["results"][key] = {
+                    "row": order["row"],
+                    "order_number": order["order_number"],
+                    "confirm_number": order["confirm_number"],
+                    "status_result": LEASE_EXPIRED_RESULT,
+                    "lms_result": "미처리",
+                    "timestamp": timestamp,
+                    "attempts": 0,
+                    "agent_id": batch["agent_id"]
+                }
+        self._store_results(run, [run["results"][key] for key in expired])
+
+    def _check_finished(self, run: Dict, now: datetime):
+        """모든 배치가 끝났으면 실행 완료 처리 및 결과 파일 저장"""
+        if run["finished_at"] is not None:
+            return
+        states = [self.batches[batch_id]["state"] for batch_id in run["batch_ids"]]
+        if any(state in (PENDING, LEASED) for state in states):
+            return
+        if run["status"] == "running":
+            run["status"] = "completed"
+        run["finished_at"] = now
+        try:
+            run["result_file"] = self._write_result_file(run)
+            from services.result_store import get_result_store, result_dir_from_config
+            get_result_store(result_dir_from_config(run["config"])).set_result_file(run["run_id"], run["result_file"])
+        except Exception as e:
+            print(f"분산 실행 결과 파일 저장 실패: {e}")
+
+    def _store_results(self, run: Dict, results: List[Dict]):
+        """보고된 결과를 실행 설정의 결과 디렉토리 결과 DB에 기록 (실패해도 리스 처리는 계속)"""
+        if not results:
+            return
+        from services.result_store import get_result_store, result_dir_from_config
+        try:
+            get_result_store(result_dir_from_config(run["config"])).record_many([
+                {"execution_id": run["run_id"], "order_number": result["order_number"], "confirm_number": result.get("confirm_number"),
+                 "status_result": result.get("status_result"), "lms_result": result.get("lms_result"),
+                 "processed_at": result.get("timestamp"), "attempts": result.get("attempts", 1)}
+                for result in results
+            ])
+        except Exception as e:
+            print(f"결과 DB 기록 실패: {e}")
+
+    def _write_result_file(self, run: Dict) -> str:
+        """단일 실행과 같은 형식(TSV)으로 결과 파일 저장"""
+        from services.result_store import result_dir_from_config
+
+        result_dir = result_dir_from_config(run["config"])
+        Path(result_dir).mkdir(parents=True, exist_ok=True)
+        result_file = Path(result_dir) / f"전송여부결과_v2.0_분산_{datetime.now().strftime('%Y%m%d')}_{run['run_id'][:8]}.txt"
+        with open(result_file, 'w', encoding='utf-8') as f:
+            for line in self._result_lines(run):
+                f.write("\t".join(str(value) for value in line) + "\n")
+        return str(result_file)
+
+    def _result_lines(self, run: Dict) -> List[List]:
+        """검증 오류 행 → 주문 순서대로 결과 (주문번호, 확정번호, 상태 결과, LMS 결과, 시간, 시도 횟수)"""
+        lines = []
+        created = run["created_at"].strftime('%Y-%m-%d %H:%M:%S')
+        for skipped in run["plan"].get("skipped_rows", []):
+            lines.append([skipped["order_number"], skipped["confirm_number"], f"검증오류({skipped['issue']})", "미처리", created, 0])
+        for order in run["plan"]["orders"]:
+            result = run["results"].get(self._row_key(order))
+            if result is None:
+                lines.append([order["order_number"], order["confirm_number"], "미처리", "미처리", "", 0])
+            else:
+                lines.append([result["order_number"], result["confirm_number"], result["status_result"],
+                              result["lms_result"], result.get("timestamp", ""), result.get("attempts", 1)])
+        return lines
+
+    # ===== 조회 =====
+
+    def _run_summary(self, run: Dict) -> Dict:
+        batches = [self.batches[batch_id] for batch_id in run["batch_ids"]]
+        counts = {state: 0 for state in (PENDING, LEASED, DONE, FAILED)}
+        for batch in batches:
+            counts[batch["state"]] += 1
+        return {
+            "run_id": run["run_id"],
+            "status": run["status"],
+            "created_at": run["created_at"].isoformat(),
+            "finished_at": run["finished_at"].isoformat() if run["finished_at"] else None,
+            "orders": len(run["plan"]["orders"]),
+            "reported": len(run["results"]),
+            "batches": counts,
+            "agents": dict(run["agents"]),
+            "result_file": run["result_file"]
+        }
+
+    def get_run(self, run_id: str, include_results: bool = False) -> Optional[Dict]:
+        """분산 실행 상태 (include_results=True이면 주문 순서대로 결과 포함)"""
+        with self._session(run_id):
+            self._expire_leases(datetime.now())
+            run = self.runs.get(run_id)
+            if run is None:
+                return None
+            summary = self._run_summary(run)
+            if include_results:
+                summary["results"] = [
+                    dict(zip(["order_number", "confirm_number", "status_result", "lms_result", "timestamp", "attempts"], line))
+                    for line in self._result_lines(run)
+                ]
+            return summary
+
+    def get_excel_file(self, run_id: str) -> Optional[str]:
+        """업로드 배치를 처리하는 에이전트가 내려받을 주문 엑셀 파일 경로"""
+        with self.state.connection() as conn:
+            row = conn.execute("SELECT plan FROM lease_runs WHERE run_id = ?", (run_id,)).fetchone()
+        return json.loads(row["plan"]).get("excel_file") if row else None
+
+    def active_run_count(self) -> int:
+        with self.state.connection() as conn:
+            return conn.execute("SELECT COUNT(*) FROM lease_runs WHERE status = 'running'").fetchone()[0]
+
+    def batch_counts(self) -> Dict[str, int]:
+        """/metrics 노출용 상태별 배치 수"""
+        counts = {state: 0 for state in (PENDING, LEASED, DONE, FAILED)}
+        with self.state.connection() as conn:
+            for row in conn.execute("SELECT state, COUNT(*) AS count FROM lease_batches GROUP BY state"):
+                counts[row["state"]] = row["count"]
+        return counts
+
+
+# 전역 인스턴스
+lease_queue = LeaseQueue()
+
+def get_lease_queue() -> LeaseQueue:
+    """리스 큐 인스턴스 반환"""
+    return lease_queue
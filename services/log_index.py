@@ -0,0 +1,280 @@
+# log_index.py - 실행 로그 주문번호 색인 (SQLite)
+# RPA 로그 파일(로그_v2.0_*.txt)에서 [주문번호: …] 태그가 붙은 줄의 위치(파일, 바이트 오프셋, 길이)를 색인합니다.
+# "몇 주 전 주문 X가 어떻게 처리되었는지"를 로그 파일 전체를 검색하지 않고 바로 찾기 위해 사용합니다 (/api/orders/{n}/trace).
+# - 파일마다 색인한 바이트 수를 기록하고 늘어난 부분만 읽음 (아직 줄바꿈이 없는 마지막 줄은 다음에 색인)
+# - 파일이 줄었거나 앞부분이 바뀌었으면(잘림/교체) 그 파일을 처음부터 다시 색인, 없어진 파일은 색인에서 제거
+# - 서버의 백그라운드 스레드가 LOG_INDEX_INTERVAL초마다 갱신하고, 조회할 때도 먼저 갱신 (최근 로그 포함)
+# - 여러 uvicorn 워커가 같은 DB를 갱신하므로 파일별 갱신은 색인한 바이트 수를 다시 확인하는 트랜잭션에서 수행
+import os
+import re
+import json
+import hashlib
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).parent.parent
+DEFAULT_LOG_DIR = PROJECT_ROOT / "logs"
+DEFAULT_DB_PATH = DEFAULT_LOG_DIR / "log_index.db"
+CONFIG_PATH = PROJECT_ROOT / "admin_confirm_config.json"
+
+# rpa/engine.py prepare_output의 로그 파일명 (로그_v2.0_001_20251103.txt)
+LOG_FILE_PATTERN = "로그_v2.0_*.txt"
+
+# 백그라운드 색인 간격 (초, 0이면 조회할 때만 색인)
+LOG_INDEX_INTERVAL = float(os.environ.get("ADMIN_CONFIRM_LOG_INDEX_INTERVAL", "30"))
+# 한 번에 읽는 크기
+READ_CHUNK_SIZE = 4 * 1024 * 1024
+# 파일 교체 확인용 앞부분 크기
+FINGERPRINT_SIZE = 256
+# 조회 최대 줄 수
+MAX_TRACE_LINES = 5000
+
+# rpa/engine.py log_debug 형식: [2025-11-03 10:00:00] [주문번호: 12345] 메시지
+ORDER_LINE_PATTERN = re.compile(r"^\[([^\]\n]*)\] \[주문번호: ([^\]\n]+)\][^\n]*\n".encode("utf-8"), re.MULTILINE)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    path TEXT NOT NULL UNIQUE,
+    indexed_bytes INTEGER NOT NULL,
+    fingerprint TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entries (
+    order_number TEXT NOT NULL,
+    logged_at TEXT NOT NULL,
+    file_id INTEGER NOT NULL,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_entries_order ON entries (order_number, logged_at, offset);
+CREATE INDEX IF NOT EXISTS idx_entries_file ON entries (file_id);
+"""
+
+
+def configured_log_dirs() -> List[Path]:
+    """색인할 로그 폴더 (기본 logs/ + admin_confirm_config.json의 file_paths.log_directory)"""
+    dirs = [DEFAULT_LOG_DIR]
+    try:
+        with open(CONFIG_PATH, "r", encoding="utf-8") as f:
+            log_directory = json.load(f).get("file_paths", {}).get("log_directory")
+    except Exception:
+        log_directory = None
+    if log_directory:
+        path = Path(log_directory)
+        dirs.append(path if path.is_absolute() else PROJECT_ROOT / path)
+    unique = []
+    for path in dirs:
+        if path.resolve() not in [p.resolve() for p in unique]:
+            unique.append(path)
+    return unique
+
+
+def file_fingerprint(f, size: int) -> str:
+    """파일 앞부분 해시 (같은 경로에 다른 로그가 기록되었는지 확인)"""
+    f.seek(0)
+    return hashlib.sha1(f.read(min(size, FINGERPRINT_SIZE))).hexdigest()
+
+
+class LogIndex:
+    """로그 주문번호 색인 갱신/조회"""
+
+    def __init__(self, db_path=None, log_dirs: Optional[List[Path]] = None):
+        self.db_path = Path(db_path or os.environ.get("ADMIN_CONFIRM_LOG_INDEX_DB") or DEFAULT_DB_PATH)
+        self.log_dirs = log_dirs
+        self._initialized = False
+        self._init_lock = threading.Lock()
+        # 백그라운드 스레드와 조회 요청이 동시에 같은 파일을 읽지 않도록 (워커 간에는 트랜잭션으로 확인)
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._initialized:
+            with self._init_lock:
+                if not self._initialized:
+                    self.db_path.parent.mkdir(parents=True, exist_ok=True)
+                    conn = sqlite3.connect(str(self.db_path), timeout=30)
+                    try:
+                        conn.execute("PRAGMA journal_mode=WAL")
+                        conn.executescript(SCHEMA)
+                        conn.commit()
+                    finally:
+                        conn.close()
+                    self._initialized = True
+        conn = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    # ===== 색인 =====
+
+    def refresh(self) -> Dict[str, int]:
+        """로그 폴더의 새 파일/늘어난 부분 색인, 없어진 파일 제거 (색인한 파일 수, 추가한 줄 수)"""
+        with self._refresh_lock:
+            paths = []
+            for log_dir in (self.log_dirs or configured_log_dirs()):
+                if log_dir.is_dir():
+                    paths.extend(str(path) for path in log_dir.glob(LOG_FILE_PATTERN))
+
+            conn = self._connect()
+            try:
+                indexed = {row["path"]: row["indexed_bytes"] for row in conn.execute("SELECT path, indexed_bytes FROM files")}
+                stats = {"files": 0, "lines": 0}
+                for path in paths:
+                    try:
+                        size = os.path.getsize(path)
+                    except OSError:
+                        continue
+                    if indexed.get(path) == size:
+                        continue
+                    added = self._index_file(conn, path, indexed.get(path))
+                    if added is not None:
+                        stats["files"] += 1
+                        stats["lines"] += added
+
+                removed = set(indexed) - set(paths)
+                if removed:
+                    conn.execute("BEGIN IMMEDIATE")
+                    for path in removed:
+                        if not os.path.exists(path):
+                            conn.execute("DELETE FROM entries WHERE file_id = (SELECT id FROM files WHERE path = ?)", (path,))
+                            conn.execute("DELETE FROM files WHERE path = ?", (path,))
+                    conn.execute("COMMIT")
+                return stats
+            finally:
+                conn.close()
+
+    def _index_file(self, conn: sqlite3.Connection, path: str, indexed_bytes: Optional[int]) -> Optional[int]:
+        """파일 1개의 늘어난 부분 색인 (추가한 줄 수, 다른 워커가 먼저 색인했으면 None)"""
+        entries = []
+        with open(path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            start = indexed_bytes or 0
+            if indexed_bytes is not None:
+                row = conn.execute("SELECT fingerprint FROM files WHERE path = ?", (path,)).fetchone()
+                if size < indexed_bytes or row is None or row["fingerprint"] != file_fingerprint(f, indexed_bytes):
+                    start = 0  # 잘렸거나 다른 로그로 교체됨
+
+            offset = start
+            f.seek(offset)
+            pending = b""
+            while offset + len(pending) < size:
+                chunk = pending + f.read(min(READ_CHUNK_SIZE, size - offset - len(pending)))
+                end = chunk.rfind(b"\n") + 1
+                if end == 0:
+                    if len(chunk) >= size - offset:
+                        break  # 마지막 줄이 아직 기록 중
+                    pending = chunk
+                    continue
+                for match in ORDER_LINE_PATTERN.finditer(chunk, 0, end):
+                    entries.append((match.group(2).decode("utf-8", "replace").strip(),
+                                    match.group(1).decode("utf-8", "replace"),
+                                    offset + match.start(), match.end() - match.start()))
+                offset += end
+                pending = chunk[end:]
+            fingerprint = file_fingerprint(f, offset)
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT id, indexed_bytes FROM files WHERE path = ?", (path,)).fetchone()
+            if (row["indexed_bytes"] if row else None) != indexed_bytes:
+                conn.execute("ROLLBACK")
+                return None
+            if row is None:
+                file_id = conn.execute("INSERT INTO files (path, indexed_bytes, fingerprint) VALUES (?, ?, ?)",
+                                       (path, offset, fingerprint)).lastrowid
+            else:
+                file_id = row["id"]
+                conn.execute("UPDATE files SET indexed_bytes = ?, fingerprint = ? WHERE id = ?", (offset, fingerprint, file_id))
+                if start == 0:
+                    conn.execute("DELETE FROM entries WHERE file_id = ?", (file_id,))
+            conn.executemany("INSERT INTO entries (order_number, logged_at, file_id, offset, length) VALUES (?, ?, ?, ?, ?)",
+                             [(order, logged_at, file_id, line_offset, length) for order, logged_at, line_offset, length in entries])
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return len(entries)
+
+    # ===== 조회 =====
+
+    def trace(self, order_number: str, limit: int = MAX_TRACE_LINES) -> Dict:
+        """주문의 모든 로그 줄 (로그 시각 순, 여러 실행/파일)"""
+        order_number = order_number.strip()
+        limit = max(1, min(int(limit), MAX_TRACE_LINES))
+        self.refresh()
+        conn = self._connect()
+        try:
+            rows = conn.execute("SELECT e.logged_at, f.path, e.offset, e.length FROM entries e "
+                                "JOIN files f ON f.id = e.file_id WHERE e.order_number = ? "
+                                "ORDER BY e.logged_at, f.path, e.offset LIMIT ?",
+                                (order_number, limit + 1)).fetchall()
+        finally:
+            conn.close()
+
+        truncated = len(rows) > limit
+        rows = rows[:limit]
+        handles = {}
+        lines = []
+        try:
+            for row in rows:
+                f = handles.get(row["path"])
+                if f is None:
+                    try:
+                        f = handles[row["path"]] = open(row["path"], "rb")
+                    except OSError:
+                        continue  # 조회 사이에 삭제된 파일 (다음 갱신에서 제거)
+                f.seek(row["offset"])
+                line = f.read(row["length"]).decode("utf-8", "replace").rstrip("\r\n")
+                if f"[주문번호: {order_number}]" not in line:
+                    continue  # 색인 후 교체된 파일 (다음 갱신에서 다시 색인)
+                lines.append({"time": row["logged_at"], "file": Path(row["path"]).name, "offset": row["offset"],
+                              "line": line})
+        finally:
+            for f in handles.values():
+                f.close()
+
+        return {
+            "order_number": order_number,
+            "lines": lines,
+            "files": sorted({line["file"] for line in lines}),
+            "truncated": truncated
+        }
+
+    # ===== 백그라운드 색인 =====
+
+    def start(self, interval: float = LOG_INDEX_INTERVAL):
+        """LOG_INDEX_INTERVAL초마다 색인하는 스레드 시작 (0이면 시작하지 않음)"""
+        if interval <= 0 or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(interval,), name="log-indexer", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout=10)
+        self._thread = None
+
+    def _run(self, interval: float):
+        while True:
+            try:
+                stats = self.refresh()
+                if stats["lines"]:
+                    print(f"로그 색인: 파일 {stats['files']}개, {stats['lines']}줄 추가")
+            except Exception as e:
+                print(f"로그 색인 실패: {e}")
+            if self._stop.wait(interval):
+                break
+
+
+# 전역 인스턴스
+log_index = LogIndex()
+
+def get_log_index() -> LogIndex:
+    """로그 색인 인스턴스 반환"""
+    return log_index
@@ -0,0 +1,51 @@
+# metrics.py - 서버 계측 모듈 (/metrics Prometheus text format)
+# RPA 실행별 단계 계측 결과(rpa/metrics.py)의 누적값을 실행기/업로드 큐 상태와 함께 노출합니다.
+# 누적값은 실행 종료 기록 시 공유 상태 DB(executor_state.py)에 합산되므로 어느 워커가 응답해도 같고 재시작해도 유지됩니다.
+from typing import List
+
+from rpa.metrics import MetricsRegistry
+
+METRIC_PREFIX = "admin_confirm"
+
+
+def get_stage_metrics() -> MetricsRegistry:
+    """종료된 실행들의 단계별 소요 시간 누적 레지스트리 (공유 상태 DB에서 로드)"""
+    from services.executor_state import get_executor_state
+
+    registry = MetricsRegistry()
+    registry.merge(get_executor_state().stage_metrics())
+    return registry
+
+
+def _gauge(lines: List[str], name: str, help_text: str, value, metric_type: str = "gauge"):
+    lines.append(f"# HELP {METRIC_PREFIX}_{name} {help_text}")
+    lines.append(f"# TYPE {METRIC_PREFIX}_{name} {metric_type}")
+    lines.append(f"{METRIC_PREFIX}_{name} {value}")
+
+
+def render_prometheus() -> str:
+    """실행기 카운터, 큐 상태, 단계별 히스토그램을 Prometheus text format으로 출력"""
+    from services.project_executor import get_project_executor
+    from services.upload_manager import get_upload_manager
+    from services.lease_queue import get_lease_queue
+
+    executor_metrics = get_project_executor().get_metrics()
+    lines = []
+
+    lines.append(f"# HELP {METRIC_PREFIX}_runs_total RPA runs by result (started, completed, failed, stopped)")
+    lines.append(f"# TYPE {METRIC_PREFIX}_runs_total counter")
+    for result, value in sorted(executor_metrics["runs"].items()):
+        lines.append(f'{METRIC_PREFIX}_runs_total{{result="{result}"}} {value}')
+
+    _gauge(lines, "running", "Whether an RPA run is in progress", executor_metrics["running"])
+    _gauge(lines, "running_seconds", "Elapsed seconds of the current RPA run", f"{executor_metrics['running_seconds']:.3f}")
+    _gauge(lines, "warm_worker_ready", "Whether a pre-spawned RPA worker is waiting for a job", executor_metrics["warm_worker_ready"])
+    _gauge(lines, "upload_parse_queue", "Uploaded sheets waiting to be parsed", get_upload_manager().pending_count())
+
+    lines.append(f"# HELP {METRIC_PREFIX}_lease_batches Distributed run batches by state")
+    lines.append(f"# TYPE {METRIC_PREFIX}_lease_batches gauge")
+    for state, value in sorted(get_lease_queue().batch_counts().items()):
+        lines.append(f'{METRIC_PREFIX}_lease_batches{{state="{state}"}} {value}')
+
+    lines.extend(get_stage_metrics().to_prometheus(f"{METRIC_PREFIX}_rpa"))
+    return "\n".join(lines) + "\n"
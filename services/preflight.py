@@ -0,0 +1,241 @@
+# preflight.py - 실행 전 점검 모듈
+# 브라우저 실행/ChromeDriver 설치/로그인 전에 설정과 입력 파일을 점검하여 발견한 문제를 한 번에 반환합니다.
+# - 설정 스키마(필수 항목, 타입, 범위)는 모듈 로드 시 한 번만 검사 함수 목록으로 컴파일
+# - 변경할 상태가 상태 매핑에 있는지, 검색 기간 날짜 형식, 엑셀 파일/list 시트를 읽을 수 있는지, 처리할 주문이 있는지 확인
+# - 서버(/api/start, 분산 실행 등록)와 RPA 진입점(run_from_env) 모두 사용하므로 모듈 수준에서 pandas를 import 하지 않습니다
+import os
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+# 검색 기간 날짜 형식
+DATE_FORMAT = "%Y-%m-%d"
+
+# 설정 스키마: 항목 경로 → (값 종류, 필수 여부, 최솟값)
+# 값 종류: text(문자열), number(숫자 또는 숫자 문자열), integer(정수 또는 정수 문자열), bool
+CONFIG_SCHEMA = {
+    "login.url": ("text", True, None),
+    "login.user_id": ("text", True, None),
+    "login.password": ("text", True, None),
+    "file_paths.excel_file": ("text", True, None),
+    "status_change.change_to_status": ("text", True, None),
+    "search_settings.search_status": ("text", False, None),
+    "search_settings.startDate": ("text", False, None),
+    "search_settings.endDate": ("text", False, None),
+    "search_settings.per_page": ("integer", False, 1),
+    "excel_settings.test_mode.enabled": ("bool", False, None),
+    "excel_settings.test_mode.start_row": ("integer", False, 1),
+    "excel_settings.test_mode.end_row": ("integer", False, 1),
+    "excel_settings.canary.enabled": ("bool", False, None),
+    "excel_settings.canary.orders": ("integer", False, 1),
+    "excel_settings.canary.max_failure_rate": ("number", False, 0),
+    "excel_settings.canary.max_order_seconds": ("number", False, 0),
+    "excel_settings.canary.tabs_after": ("integer", False, 0),
+    "timing.page_load_wait": ("number", False, 0),
+    "timing.upload_wait": ("number", False, 0),
+    "timing.detail_page_wait": ("number", False, 0),
+    "timing.refresh_wait": ("number", False, 0),
+    "timing.lms_popup_wait": ("number", False, 0),
+    "retry.max_attempts": ("integer", False, 1),
+    "retry.base_delay": ("number", False, 0),
+    "retry.max_delay": ("number", False, 0),
+    "retry.multiplier": ("number", False, 1),
+    "upload.skip_uploaded": ("bool", False, None),
+    "upload.chunk_size": ("integer", False, 0),
+    "upload.ledger_days": ("number", False, 0),
+    "browser.headless": ("bool", False, None),
+    "browser.tabs": ("integer", False, 1),
+    "browser.recycle_every": ("integer", False, 0),
+    "browser.max_rss_mb": ("number", False, 0),
+    "browser.rss_check_every": ("integer", False, 1),
+}
+
+KIND_NAMES = {"text": "문자열", "number": "숫자", "integer": "정수", "bool": "true/false"}
+
+
+class PreflightError(ValueError):
+    """실행 전 점검 실패 (problems: [{"field": ..., "message": ...}])"""
+
+    def __init__(self, problems: List[Dict[str, str]]):
+        self.problems = problems
+        details = "; ".join(f"{p['field']}: {p['message']}" if p.get("field") else p["message"] for p in problems)
+        super().__init__(f"실행 전 점검 실패 ({len(problems)}건): {details}")
+
+
+def problem(field: str, message: str) -> Dict[str, str]:
+    return {"field": field, "message": message}
+
+
+def _as_number(value, integer: bool):
+    """숫자로 변환 (변환할 수 없으면 None, bool은 숫자로 보지 않음)"""
+    if isinstance(value, bool):
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    if integer and not number.is_integer():
+        return None
+    return number
+
+
+def _compile_rule(path: str, kind: str, required: bool, minimum) -> Callable[[Dict], Optional[Dict[str, str]]]:
+    """스키마 항목 1개를 검사 함수로 변환"""
+    keys = tuple(path.split("."))
+
+    def check(config: Dict) -> Optional[Dict[str, str]]:
+        value = config
+        for key in keys:
+            if not isinstance(value, dict):
+                value = None
+                break
+            value = value.get(key)
+        if value is None or value == "":
+            return problem(path, "필수 항목이 비어 있습니다") if required else None
+
+        if kind == "text":
+            if not isinstance(value, str):
+                return problem(path, f"{KIND_NAMES[kind]}이어야 합니다 (현재 값: {value!r})")
+            return None
+        if kind == "bool":
+            return None if isinstance(value, bool) else problem(path, f"{KIND_NAMES[kind]}이어야 합니다 (현재 값: {value!r})")
+
+        number = _as_number(value, integer=kind == "integer")
+        if number is None:
+            return problem(path, f"{KIND_NAMES[kind]}이어야 합니다 (현재 값: {value!r})")
+        if minimum is not None and number < minimum:
+            return problem(path, f"{minimum} 이상이어야 합니다 (현재 값: {value!r})")
+        return None
+
+    return check
+
+
+# 모듈 로드 시 한 번만 컴파일
+_COMPILED_SCHEMA = [_compile_rule(path, *rule) for path, rule in CONFIG_SCHEMA.items()]
+
+
+def check_schema(config: Dict) -> List[Dict[str, str]]:
+    """설정 스키마 검사 (모든 항목을 검사하고 문제 목록 반환)"""
+    if not isinstance(config, dict):
+        return [problem("", "설정이 JSON 객체가 아닙니다")]
+    return [result for result in (check(config) for check in _COMPILED_SCHEMA) if result is not None]
+
+
+def parse_date(value: str) -> Optional[datetime]:
+    try:
+        return datetime.strptime(value, DATE_FORMAT)
+    except (TypeError, ValueError):
+        return None
+
+
+def check_search_dates(search_settings: Dict) -> List[Dict[str, str]]:
+    """검색 기간 날짜 형식(YYYY-MM-DD)과 순서 확인 (비어 있으면 기간 조건 없음)"""
+    problems, dates = [], {}
+    for name in ("startDate", "endDate"):
+        value = search_settings.get(name)
+        if not value or not isinstance(value, str):
+            continue
+        dates[name] = parse_date(value)
+        if dates[name] is None:
+            problems.append(problem(f"search_settings.{name}", f"날짜 형식이 잘못되었습니다 (YYYY-MM-DD, 현재 값: {value})"))
+    if dates.get("startDate") and dates.get("endDate") and dates["startDate"] > dates["endDate"]:
+        problems.append(problem("search_settings.endDate", "종료일이 시작일보다 빠릅니다"))
+    return problems
+
+
+def check_statuses(config: Dict, status_mapping: Dict[str, str]) -> List[Dict[str, str]]:
+    """변경할 상태/검색 상태가 상태 매핑(master_data.xlsx order_status)에 있는지 확인"""
+    problems = []
+    change_to_status = (config.get("status_change") or {}).get("change_to_status")
+    if isinstance(change_to_status, str) and change_to_status and change_to_status not in status_mapping:
+        problems.append(problem("status_change.change_to_status", f"상태 매핑에 없는 상태입니다: {change_to_status}"))
+
+    search_settings = config.get("search_settings") or {}
+    search_status = search_settings.get("search_status") or search_settings.get("change_status")
+    if isinstance(search_status, str) and search_status and search_status not in status_mapping:
+        problems.append(problem("search_settings.search_status", f"상태 매핑에 없는 상태입니다: {search_status}"))
+    return problems
+
+
+def check_excel_file(excel_file: Optional[str]) -> List[Dict[str, str]]:
+    """엑셀 파일 존재/읽기 권한 확인"""
+    if not excel_file:
+        return []  # 스키마 검사에서 필수 항목으로 보고
+    if not os.path.isfile(excel_file):
+        return [problem("file_paths.excel_file", f"엑셀 파일을 찾을 수 없습니다: {excel_file}")]
+    if not os.access(excel_file, os.R_OK):
+        return [problem("file_paths.excel_file", f"엑셀 파일을 읽을 수 없습니다 (권한 없음): {excel_file}")]
+    return []
+
+
+def check_orders(config: Dict, order_columns: Dict[str, List]) -> List[Dict[str, str]]:
+    """list 시트에 처리할 주문이 있는지 확인 (테스트 모드 행 범위 적용)"""
+    from services.run_plan import select_orders, sheet_name_of
+
+    if not order_columns.get("row"):
+        return [problem("file_paths.excel_file", f"'{sheet_name_of(config)}' 시트에 주문이 없습니다")]
+    test_mode = (config.get("excel_settings") or {}).get("test_mode")
+    try:
+        orders, skipped = select_orders(order_columns, test_mode)
+    except (TypeError, ValueError):
+        return []  # 잘못된 행 범위는 스키마 검사에서 보고
+    if orders:
+        return []
+    if skipped:
+        return [problem("file_paths.excel_file", f"처리할 수 있는 주문이 없습니다 (검증오류 {len(skipped)}건)")]
+    return [problem("excel_settings.test_mode", "테스트 모드 행 범위에 주문이 없습니다")]
+
+
+def run_preflight(config: Dict, status_mapping: Dict[str, str],
+                  load_columns: Callable[[str], Dict[str, List]]) -> Dict[str, List]:
+    """
+    실행 전 점검 (문제가 있으면 모두 모아 PreflightError 발생)
+
+    Args:
+        config: 병합된 런타임 설정
+        status_mapping: 영문 ↔ 한글 상태 매핑
+        load_columns: 엑셀 파일 경로 → 파싱 결과(컬럼 형태) (서버는 업로드 파싱 캐시 사용)
+
+    Returns:
+        파싱된 주문 시트 (실행 계획 컴파일에 그대로 사용)
+    """
+    from services.run_plan import resolve_path
+
+    problems = check_schema(config)
+    if not isinstance(config, dict):
+        raise PreflightError(problems)
+    problems += check_search_dates(config.get("search_settings") or {})
+    problems += check_statuses(config, status_mapping)
+
+    excel_file = (config.get("file_paths") or {}).get("excel_file")
+    excel_file = resolve_path(excel_file) if isinstance(excel_file, str) else None
+    file_problems = check_excel_file(excel_file)
+    problems += file_problems
+
+    order_columns = None
+    if excel_file and not file_problems:
+        try:
+            order_columns = load_columns(excel_file)
+        except Exception as e:
+            problems.append(problem("file_paths.excel_file", f"주문 시트를 읽을 수 없습니다: {e}"))
+        else:
+            problems += check_orders(config, order_columns)
+
+    if problems:
+        raise PreflightError(problems)
+    return order_columns
+
+
+def check_run_plan(config: Dict, plan: Dict) -> List[Dict[str, str]]:
+    """서버가 컴파일한 실행 계획을 받은 RPA의 점검 (설정 스키마, 검색 기간, 처리할 주문 유무 - 배치 계획은 파일별)"""
+    from services.run_plan import batch_entries, entry_config, plan_files
+
+    entries = batch_entries(config) if isinstance(config, dict) else []
+    # 배치 실행은 file_paths.excel_file 대신 excel_files 항목을 사용 (항목마다 파일 경로만 다름)
+    problems = check_schema(entry_config(config, entries[0]) if entries else config)
+    if isinstance(config, dict):
+        problems += check_search_dates(config.get("search_settings") or {})
+    for file_plan in plan_files(plan):
+        if not file_plan.get("orders"):
+            label = file_plan.get("file_label")
+            problems.append(problem("orders", f"[{label}] 처리할 주문이 없습니다" if label else "실행 계획에 처리할 주문이 없습니다"))
+    return problems
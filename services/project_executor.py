@@ -6,16 +6,30 @@ import time
 import threading
 import subprocess
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 
+from services.executor_state import kill_pid
+
+# 중단 요청 후 RPA가 현재 주문을 마치고 종료할 때까지 기다리는 최대 시간 (초과 시 terminate → kill)
+STOP_GRACE_SECONDS = float(os.environ.get('ADMIN_CONFIRM_STOP_GRACE', '120'))
+# RPA가 중단 요청을 받고 정상 종료한 경우의 종료 코드 (rpa/engine.py EXIT_STOPPED와 같은 값)
+STOPPED_EXIT_CODE = 3
+
 class AdminConfirmExecutor:
     """예약확정처리 프로젝트 실행 관리자 v2.0"""
     
     def __init__(self):
-        self.running_process = None
-        self.execution_history = []
-        self.current_execution_id = None
+        # 실행 상태(실행 중인 작업, 실행 이력, 실행 카운터)는 uvicorn 워커끼리 공유하도록 로컬 DB에 저장
+        # 프로세스 객체와 자원 사용량 샘플러는 실행을 시작한 워커에만 있음 (다른 워커는 PID로 확인)
+        from services.executor_state import get_executor_state
+        self.state = get_executor_state()
+        self.processes = {}  # 실행 ID → Popen (이 워커가 시작한 실행)
+        # 실행별 자원 사용량 샘플러 (실행 ID → ResourceSampler, 종료 시 이력에 첨부하고 제거)
+        self.resource_samplers = {}
+        # 이 워커 안에서 API 핸들러(스레드풀)와 모니터링 스레드가 동시에 접근하므로 잠금 사용 (워커 간 동기화는 DB 트랜잭션)
+        # 주의: 프로세스 종료 대기 같은 블로킹 작업은 잠금 밖에서 수행 (상태 조회가 막히지 않도록)
+        self._lock = threading.RLock()
         self.script_path = Path(__file__).parent.parent / "admin_confirm_rpa_v2.0.py"
         self.config_path = Path(__file__).parent.parent / "admin_confirm_config.json"
         self.temp_configs_dir = Path(__file__).parent.parent / "temp_configs"
@@ -23,19 +37,26 @@ class AdminConfirmExecutor:
         # temp_configs 디렉토리 생성
         self.temp_configs_dir.mkdir(exist_ok=True)
         
+        # 무거운 모듈을 미리 import 한 RPA 워커를 대기시켜 실행 시작 시간 단축
+        # (ADMIN_CONFIRM_WARM_WORKER=0 이면 실행할 때마다 새 프로세스 생성, uvicorn 워커가 여러 개면 잠금을 얻은 1개만 대기)
+        from services.warm_worker import WarmWorkerPool
+        self.warm_workers = WarmWorkerPool(
+            self.script_path.parent,
+            enabled=os.environ.get('ADMIN_CONFIRM_WARM_WORKER', '1') != '0',
+            owner_lock_path=self.temp_configs_dir / "warm_worker.lock"
+        )
+        self.warm_workers.prespawn()
+        
         print("예약확정처리 실행기 v2.0 초기화 완료")
         print(f"스크립트 경로: {self.script_path}")
         print(f"설정 파일 경로: {self.config_path}")
+        print(f"실행 상태 DB: {self.state.db_path}")
     
     def can_start_project(self) -> bool:
-        """프로젝트 시작 가능 여부 확인"""
-        # running_process가 있지만 stopped 상태인 경우는 새 프로젝트 시작 가능
-        if self.running_process is not None:
-            # stopped 상태가 아닌 경우에만 시작 불가
-            if self.running_process.get("status") != "stopped":
-                return False
-            # stopped 상태인 경우 running_process 초기화하고 시작 가능
-            self.running_process = None
+        """프로젝트 시작 가능 여부 확인 (다른 워커가 시작한 실행, 진행 중인 분산 실행 포함)"""
+        from services.lease_queue import get_lease_queue
+        if self.state.get_active() is not None or get_lease_queue().active_run_count():
+            return False
         
         if not self.script_path.exists():
             print(f"스크립트 파일이 존재하지 않음: {self.script_path}")
@@ -43,269 +64,333 @@ class AdminConfirmExecutor:
             
         return True
     
-    def start_project(self, config_data: Dict) -> str:
-        """프로젝트 시작"""
-        if not self.can_start_project():
-            raise Exception("프로젝트 시작 불가: 이미 실행 중이거나 스크립트 파일이 없습니다")
+    def start_project(self, config_data: Dict, profile: Optional[str] = None) -> str:
+        """프로젝트 시작 (profile: sampling/deterministic이면 프로파일러로 감싸 실행, 없으면 ADMIN_CONFIRM_PROFILE 환경변수)"""
+        with self._lock:
+            return self._start_project_locked(config_data, profile)
+    
+    def _start_project_locked(self, config_data: Dict, profile: Optional[str] = None) -> str:
+        """프로젝트 시작 (잠금 획득 상태에서 호출)"""
+        from rpa.profiler import PROFILE_MODES
+        profile = profile or os.environ.get('ADMIN_CONFIRM_PROFILE') or None
+        if profile is not None and profile not in PROFILE_MODES:
+            raise ValueError(f"지원하지 않는 프로파일 모드입니다: {profile} ({', '.join(PROFILE_MODES)})")
+        
+        if not self.script_path.exists():
+            raise Exception("프로젝트 시작 불가: 스크립트 파일이 없습니다")
+        
+        # 실행 등록 (실행 중인 작업/분산 실행이 없는지 확인과 등록을 한 트랜잭션에서 수행 - 워커 간 동시 시작 방지)
+        execution_id = str(uuid.uuid4())
+        start_time = datetime.now()
+        active = self.state.claim_run(execution_id, {
+            "execution_id": execution_id,
+            "start_time": start_time.isoformat(),
+            "status": "running",
+            "config": config_data,
+            "profile_mode": profile
+        })
+        if active is not None:
+            if active.get("distributed"):
+                raise Exception("프로젝트 시작 불가: 분산 실행이 진행 중입니다")
+            raise Exception("프로젝트 시작 불가: 이미 실행 중입니다")
         
         try:
-            execution_id = str(uuid.uuid4())
-            temp_config_path = self._create_runtime_config(config_data, execution_id)
+            temp_config_path, runtime_config = self._create_runtime_config(config_data, execution_id)
+            run_plan_path, run_plan = self._create_run_plan(runtime_config, execution_id)
             
-            # 환경변수 설정
-            env = os.environ.copy()
+            # 환경변수 설정 (워커에 작업과 함께 전달)
+            env = {}
             env['CONFIG_FILE_PATH'] = str(temp_config_path)
+            env['RUN_PLAN_PATH'] = run_plan_path
             env['EXECUTION_MODE'] = 'web_interface'  # 웹 인터페이스에서 실행
             env['EXECUTION_ID'] = execution_id
+            env['METRICS_PATH'] = str(self._metrics_path(execution_id))
+            env['STOP_FILE_PATH'] = str(self._stop_file_path(execution_id))
+            env['CONTROL_FILE_PATH'] = str(self._control_file_path(execution_id))
+            env['CANARY_REPORT_PATH'] = str(self._canary_report_path(execution_id))
+            if profile:
+                env['PROFILE_MODE'] = profile
             
             print(f"프로젝트 시작: 예약확정처리")
             print(f"실행 ID: {execution_id}")
             print(f"스크립트 경로: {self.script_path}")
             print(f"임시 설정 파일: {temp_config_path}")
+            print(f"실행 계획 파일: {run_plan_path}")
             
-            # 프로세스 시작
-            process = subprocess.Popen(
-                ["python", str(self.script_path)],
-                stdout=None,  # 실시간 출력
-                stderr=None,  # 실시간 출력
-                text=True,
-                cwd=str(self.script_path.parent),
-                env=env
-            )
-            
-            # 실행 정보 저장
-            execution_info = {
-                "execution_id": execution_id,
-                "process": process,
-                "start_time": datetime.now(),
-                "status": "running",
-                "config": config_data
-            }
-            
-            self.running_process = execution_info
-            self.current_execution_id = execution_id
-            
-            # 실행 이력에 추가
-            self.execution_history.append({
-                "execution_id": execution_id,
-                "start_time": execution_info["start_time"],
-                "status": "running",
-                "config": config_data
-            })
-            
-            # 모니터링 스레드 시작
-            monitor_thread = threading.Thread(
-                target=self._monitor_execution,
-                args=(execution_id, process),
-                daemon=False
-            )
-            monitor_thread.start()
-            
-            print(f"프로젝트 시작 완료: 예약확정처리 (실행 ID: {execution_id})")
-            return execution_id
-            
+            # 프로세스 시작 (대기 중인 warm worker 재사용, 없으면 새로 생성)
+            process = self.warm_workers.launch(env, str(self._startup_stats_path(execution_id)))
         except Exception as e:
             print(f"프로젝트 시작 실패: {e}")
+            self.state.release_run(execution_id)
+            self._cleanup_temp_config(execution_id)
             raise e
+        
+        # RPA 프로세스와 하위 Chrome 프로세스의 자원 사용량 샘플링 (시작하지 못하면 이유를 실행 이력에 기록)
+        from services.resource_sampler import ResourceSampler, unavailable
+        updates = {"files": self.plan_file_summary(run_plan)}
+        sampler = ResourceSampler(process.pid)
+        if sampler.start():
+            self.resource_samplers[execution_id] = sampler
+        else:
+            print(f"⚠️ 자원 사용량 샘플링 불가: {sampler.error}")
+            updates["resources"] = unavailable(sampler.error)
+        
+        # 실행 정보 저장 (PID는 다른 워커의 상태 조회/강제 종료에 사용)
+        self.processes[execution_id] = process
+        self.state.set_process(execution_id, process.pid, updates)
+        
+        # 모니터링 스레드 시작
+        monitor_thread = threading.Thread(
+            target=self._monitor_execution,
+            args=(execution_id, process),
+            daemon=False
+        )
+        monitor_thread.start()
+        
+        print(f"프로젝트 시작 완료: 예약확정처리 (실행 ID: {execution_id})")
+        return execution_id
     
-    def stop_project(self, force: bool = False) -> bool:
-        """프로젝트 중지"""
-        if self.running_process is None:
-            return False
+    def stop_project(self, force: bool = False) -> Optional[str]:
+        """
+        프로젝트 중지 요청 (대기하지 않고 바로 반환, 다른 워커가 시작한 실행도 중지 가능)
         
-        try:
-            process = self.running_process.get("process")
-            execution_id = self.running_process.get("execution_id")  # 실행 ID 미리 저장
-            start_time = self.running_process.get("start_time")
+        - 기본: 중단 요청 파일을 만들어 RPA가 처리 중인 주문을 마친 뒤 결과를 기록하고 Lock 파일을 정리하며 종료하도록 함
+          (RPA가 종료를 확인할 때까지 상태는 "stopping", STOP_GRACE_SECONDS가 지나면 실행한 워커의 모니터링 스레드가 강제 종료)
+        - force=True: 프로세스를 바로 종료
+        
+        Returns:
+            "stopping" / "stopped", 중지할 프로젝트가 없으면 None
+        """
+        with self._lock:
+            active = self.state.get_active()
+            if active is None or not active["pid"]:
+                return None
+            execution_id = active["execution_id"]
             
-            if process:
+            try:
                 if force:
-                    # 강제 종료
-                    process.kill()
-                    print("프로젝트 강제 중지: 예약확정처리")
-                else:
-                    # 정상 종료
-                    process.terminate()
-                    try:
-                        process.wait(timeout=10)
-                        print("프로젝트 정상 중지: 예약확정처리")
-                    except subprocess.TimeoutExpired:
+                    process = self.processes.get(execution_id)
+                    if process is not None:
                         process.kill()
-                        print("프로젝트 강제 중지 (타임아웃): 예약확정처리")
-            
-            end_time = datetime.now()
-            
-            # 실행 이력 업데이트 (실행 ID를 미리 저장한 값 사용)
-            for history_item in reversed(self.execution_history):
-                if history_item["execution_id"] == execution_id and history_item["status"] == "running":
-                    history_item["status"] = "stopped"
-                    history_item["end_time"] = end_time
-                    if start_time:
-                        duration = end_time - start_time
-                        history_item["duration"] = str(duration).split('.')[0]
-                    break
-            
-            # 실행 중인 프로젝트 정보를 stopped 상태로 설정 (한 번만 반환하기 위해)
-            stopped_info = {
-                "execution_id": execution_id,
-                "start_time": start_time,
-                "end_time": end_time,
-                "status": "stopped",
-                "duration": str(end_time - start_time).split('.')[0] if start_time else "0:00:00",
-                "_returned": False  # 한 번만 반환하기 위한 플래그
-            }
-            self.running_process = stopped_info
-            self.current_execution_id = None
-            
-            return True
-            
-        except Exception as e:
-            print(f"프로젝트 중지 실패: {e}")
-            return False
+                    else:
+                        kill_pid(active["pid"])
+                    print("프로젝트 강제 중지: 예약확정처리")
+                    self._finish(execution_id, "stopped", None)
+                    return "stopped"
+                
+                if active["stop_requested_at"] is None:
+                    with open(self._stop_file_path(execution_id), 'w', encoding='utf-8') as f:
+                        json.dump({"requested_at": datetime.now().isoformat()}, f)
+                    self.state.request_stop(execution_id)
+                    print("프로젝트 중지 요청: 예약확정처리 (처리 중인 주문 완료 후 종료)")
+                return "stopping"
+            except Exception as e:
+                print(f"프로젝트 중지 실패: {e}")
+                return None
     
-    def get_status(self) -> Optional[Dict]:
-        """프로젝트 상태 반환"""
-        if self.running_process is None:
-            return None
+    def control_execution(self, execution_id: str, paused: Optional[bool] = None, timing: Optional[Dict] = None,
+                          tabs: Optional[int] = None) -> Dict:
+        """
+        실행 중인 작업 제어 요청 (대기하지 않고 바로 반환)
         
-        info = self.running_process
+        제어 파일에 원하는 상태를 기록하면 RPA가 처리 중인 주문을 마친 뒤 적용합니다 (rpa/control.py).
+        - paused: True면 일시정지, False면 재개 (일시정지 중에도 남은 주문/재시도 큐는 유지)
+        - timing: 변경할 타이밍 값 (초) - 이전에 변경한 값과 합쳐짐
+        - tabs: 동시 처리 탭 수
         
-        # stopped 상태인 경우 (stop_project에서 설정)
-        if info.get("status") == "stopped" and "process" not in info:
-            # 한 번만 반환하고 이후에는 None 반환 (새 프로젝트 시작 가능하도록)
-            if not info.get("_returned", False):
-                info["_returned"] = True
-                return {
-                    "execution_id": info["execution_id"],
-                    "start_time": info["start_time"].isoformat() if isinstance(info["start_time"], datetime) else info["start_time"],
-                    "end_time": info["end_time"].isoformat() if isinstance(info["end_time"], datetime) else info["end_time"],
-                    "status": "stopped",
-                    "duration": info.get("duration", "0:00:00")
-                }
-            else:
-                # 이미 반환했으면 None으로 설정하여 새 프로젝트 시작 가능하도록
-                self.running_process = None
-                return None
+        Returns:
+            현재 제어 상태 (RPA가 적용한 버전 포함)
         
-        process = info.get("process")
+        Raises:
+            ValueError: 실행 중인 작업이 아니거나 값이 잘못된 경우
+        """
+        from rpa.control import LIVE_TIMING_KEYS, MAX_LIVE_TABS, write_json_atomic
+        timing = timing or {}
+        problems = []
+        for name, value in timing.items():
+            if name not in LIVE_TIMING_KEYS:
+                problems.append(f"timing.{name}: 실행 중 변경할 수 없는 항목입니다 ({', '.join(LIVE_TIMING_KEYS)})")
+            elif isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+                problems.append(f"timing.{name}: 0 이상의 숫자여야 합니다 (현재 값: {value!r})")
+        if tabs is not None and (isinstance(tabs, bool) or not isinstance(tabs, int) or not 1 <= tabs <= MAX_LIVE_TABS):
+            problems.append(f"tabs: 1~{MAX_LIVE_TABS} 사이의 정수여야 합니다 (현재 값: {tabs!r})")
+        if problems:
+            raise ValueError("; ".join(problems))
         
-        if process:
-            return_code = process.poll()
-            if return_code is not None:
-                # 프로세스가 완료됨
-                info["status"] = "completed" if return_code == 0 else "failed"
-                info["end_time"] = datetime.now()
-                info["return_code"] = return_code
-                
-                # 실행 시간 계산
-                duration = info["end_time"] - info["start_time"]
-                duration_str = str(duration).split('.')[0]
-                
-                # 실행 이력 업데이트
-                for history_item in reversed(self.execution_history):
-                    if history_item["execution_id"] == info["execution_id"]:
-                        history_item["status"] = info["status"]
-                        history_item["end_time"] = info["end_time"]
-                        history_item["return_code"] = return_code
-                        history_item["duration"] = duration_str
-                        break
-                
-                # 실행 중인 프로젝트에서 제거
-                self.running_process = None
-                self.current_execution_id = None
-                
-                # 임시 설정 파일 정리
-                self._cleanup_temp_config(info["execution_id"])
-                
-                return {
-                    "execution_id": info["execution_id"],
-                    "start_time": info["start_time"].isoformat(),
-                    "end_time": info["end_time"].isoformat(),
-                    "status": info["status"],
-                    "duration": duration_str,
-                    "return_code": return_code
-                }
-            else:
-                # 프로세스가 아직 실행 중
-                return {
-                    "execution_id": info["execution_id"],
-                    "start_time": info["start_time"].isoformat(),
-                    "status": "running",
-                    "duration": str(datetime.now() - info["start_time"]).split('.')[0]
-                }
+        active = self.state.get_active()
+        if active is None or active["execution_id"] != execution_id or not active["pid"]:
+            raise ValueError(f"실행 중인 작업이 아닙니다: {execution_id}")
+        if active["stop_requested_at"] is not None:
+            raise ValueError("중지 요청된 작업입니다")
         
-        return None
+        def update(control: Dict):
+            if paused is not None:
+                control["paused"] = paused
+            control["timing"].update(timing)
+            if tabs is not None:
+                control["tabs"] = tabs
+            control["version"] += 1
+            # 같은 트랜잭션에서 파일을 기록하므로 여러 워커의 요청이 버전 순서대로 기록됨
+            write_json_atomic(self._control_file_path(execution_id), control)
+        
+        row = self.state.update_control(execution_id, update)
+        if row is None:
+            raise ValueError(f"실행 중인 작업이 아닙니다: {execution_id}")
+        control = row["control"]
+        print(f"실행 제어 요청 (버전 {control['version']}): 일시정지={control['paused']}, 타이밍={control['timing']}, 탭={control['tabs']}")
+        return self._control_status(execution_id, control)
+    
+    def _control_status(self, execution_id: str, control: Dict) -> Dict:
+        """요청한 제어 상태와 RPA가 적용한 상태"""
+        from rpa.control import read_ack
+        ack = read_ack(self._control_file_path(execution_id)) or {}
+        return {
+            "version": control["version"],
+            "applied_version": ack.get("version", 0),
+            "paused": control["paused"],
+            "applied_paused": bool(ack.get("paused", False)),
+            "timing": dict(control["timing"]),
+            "tabs": control["tabs"]
+        }
+    
+    def _finish(self, execution_id: str, status: str, return_code: Optional[int]) -> Optional[Dict]:
+        """실행 종료 기록 (계측 결과 첨부, 임시 파일 정리) - 이미 기록된 실행이면 None"""
+        with self._lock:
+            # 샘플링 스레드 종료 대기는 DB 쓰기 잠금을 잡기 전에 수행
+            sampler = self.resource_samplers.pop(execution_id, None)
+            usage = sampler.stop() if sampler is not None else None
+            history_item = self.state.finish_run(
+                execution_id, status, return_code, lambda item: self._record_finished(item, usage))
+            self.processes.pop(execution_id, None)
+            if history_item is not None:
+                self._cleanup_temp_config(execution_id)
+            return history_item
+    
+    def _finish_exited(self, execution_id: str, return_code: int, stop_requested: bool) -> Optional[Dict]:
+        """종료된 프로세스의 상태 기록 (중단 요청 후 종료되었거나 EXIT_STOPPED면 stopped)"""
+        if stop_requested or return_code == STOPPED_EXIT_CODE:
+            status = "stopped"
+        else:
+            status = "completed" if return_code == 0 else "failed"
+        return self._finish(execution_id, status, return_code)
+    
+    def get_status(self) -> Optional[Dict]:
+        """프로젝트 상태 반환 (실행 중이 아니면 마지막으로 종료된 실행을 한 번만 반환)"""
+        with self._lock:
+            active = self.state.get_active()
+            if active is not None:
+                execution_id = active["execution_id"]
+                process = self.processes.get(execution_id)
+                return_code = process.poll() if process is not None else None
+                if return_code is not None:
+                    # 모니터링 스레드보다 먼저 종료를 확인한 경우
+                    self._finish_exited(execution_id, return_code, active["stop_requested_at"] is not None)
+                else:
+                    # 프로세스가 아직 실행 중 (중단 요청 후에는 RPA가 종료할 때까지 stopping)
+                    start_time = datetime.fromisoformat(active["item"]["start_time"])
+                    status = {
+                        "execution_id": execution_id,
+                        "start_time": start_time.isoformat(),
+                        "status": "stopping" if active["stop_requested_at"] else "running",
+                        "duration": str(datetime.now() - start_time).split('.')[0]
+                    }
+                    if active["stop_requested_at"]:
+                        status["stop_requested_at"] = active["stop_requested_at"]
+                    elif active["control"]:
+                        # 일시정지 요청 후 RPA가 처리 중인 주문을 마칠 때까지 pausing
+                        control = self._control_status(execution_id, active["control"])
+                        status["control"] = control
+                        if control["paused"]:
+                            status["status"] = "paused" if control["applied_paused"] else "pausing"
+                    return status
+            
+            finished = self.state.take_finished()
+            if finished is None:
+                return None
+            status = {key: finished.get(key) for key in ("execution_id", "start_time", "end_time", "status", "duration")}
+            if "return_code" in finished:
+                status["return_code"] = finished["return_code"]
+            return status
+    
+    def get_metrics(self) -> Dict:
+        """/metrics 노출용 실행기 상태 (실행 중 여부, 실행 카운터, warm worker 대기 여부)"""
+        active = self.state.get_active()
+        counters = self.state.counters()
+        return {
+            "running": 1 if active is not None else 0,
+            "running_seconds": (datetime.now() - datetime.fromisoformat(active["item"]["start_time"])).total_seconds() if active else 0.0,
+            "runs": {name: counters.get(name, 0) for name in ("started", "completed", "failed", "stopped")},
+            "warm_worker_ready": 1 if self.warm_workers.is_ready() else 0
+        }
+    
+    def get_history(self, limit: int = 10, details: bool = False) -> List[Dict]:
+        """실행 이력 반환 (details=False이면 자원 사용량은 요약만 포함)"""
+        history = self.state.history(limit)
+        if details:
+            return history
+        return [
+            {**item, "resources": {key: value for key, value in item["resources"].items() if key != "series"}}
+            if "resources" in item else item
+            for item in history
+        ]
     
-    def get_history(self, limit: int = 10) -> List[Dict]:
-        """실행 이력 반환"""
-        return self.execution_history[-limit:]
+    def get_resource_usage(self, execution_id: str) -> Optional[Dict]:
+        """실행의 자원 사용량 요약과 시계열 (실행 중이면 현재까지 - 실행한 워커에서만, 샘플링하지 못했으면 available=False와 이유)"""
+        with self._lock:
+            sampler = self.resource_samplers.get(execution_id)
+            if sampler is not None:
+                return sampler.snapshot()
+        row = self.state.get(execution_id)
+        return row["item"].get("resources") if row else None
     
     def _monitor_execution(self, execution_id: str, process: subprocess.Popen):
-        """실행 상태 모니터링"""
+        """실행 상태 모니터링 (실행을 시작한 워커에서만 동작)"""
         try:
             print(f"모니터링 시작: {execution_id}")
             
-            # 프로세스 완료까지 대기
+            # 프로세스 완료까지 대기 (중단 요청 후 STOP_GRACE_SECONDS가 지나면 강제 종료)
+            terminated_at = None
+            stop_requested_at = None
             while True:
                 return_code = process.poll()
                 if return_code is not None:
                     print(f"프로세스 완료 감지: {execution_id}, 반환 코드: {return_code}")
                     break
                 
+                # 중단 요청은 다른 워커가 받았을 수 있으므로 공유 상태에서 확인
+                if stop_requested_at is None:
+                    stop_requested_at = self._stop_requested_at(execution_id)
+                if stop_requested_at and (datetime.now() - stop_requested_at).total_seconds() > STOP_GRACE_SECONDS:
+                    if terminated_at is None:
+                        print(f"중단 요청 후 {STOP_GRACE_SECONDS:.0f}초 내에 종료되지 않아 프로세스를 종료합니다: {execution_id}")
+                        process.terminate()
+                        terminated_at = time.time()
+                    elif time.time() - terminated_at > 10:
+                        process.kill()
+                
                 time.sleep(1)  # 1초마다 확인
             
-            # 프로세스 완료 시 상태 업데이트
-            self._update_project_status_from_monitor(execution_id, return_code)
+            # 프로세스 완료 시 상태 업데이트 (강제 중지로 이미 기록된 실행은 덮어쓰지 않음)
+            if stop_requested_at is None:
+                stop_requested_at = self._stop_requested_at(execution_id)
+            if self._finish_exited(execution_id, return_code, stop_requested_at is not None) is not None:
+                print(f"모니터링 완료: 예약확정처리 ({execution_id})")
             
         except Exception as e:
             print(f"모니터링 오류 ({execution_id}): {e}")
-            self._update_project_status_from_monitor(execution_id, -1)
+            self._finish(execution_id, "failed", -1)
     
-    def _update_project_status_from_monitor(self, execution_id: str, return_code: int):
-        """모니터링에서 프로젝트 상태 업데이트"""
-        try:
-            if self.running_process and self.running_process["execution_id"] == execution_id:
-                print(f"모니터링에서 프로젝트 상태 업데이트: {execution_id}")
-                
-                # 실행 정보 업데이트
-                self.running_process["status"] = "completed" if return_code == 0 else "failed"
-                self.running_process["end_time"] = datetime.now()
-                self.running_process["return_code"] = return_code
-                
-                # 실행 시간 계산
-                duration = self.running_process["end_time"] - self.running_process["start_time"]
-                duration_str = str(duration).split('.')[0]
-                
-                # 실행 이력 업데이트
-                for history_item in reversed(self.execution_history):
-                    if history_item["execution_id"] == execution_id:
-                        history_item["status"] = self.running_process["status"]
-                        history_item["end_time"] = self.running_process["end_time"]
-                        history_item["return_code"] = return_code
-                        history_item["duration"] = duration_str
-                        break
-                
-                # 실행 중인 프로젝트에서 제거
-                self.running_process = None
-                self.current_execution_id = None
-                
-                # 임시 설정 파일 정리
-                self._cleanup_temp_config(execution_id)
-                
-                print(f"모니터링 완료: 예약확정처리 -> {self.running_process['status'] if self.running_process else 'completed'}")
-                
-        except Exception as e:
-            print(f"상태 업데이트 실패 ({execution_id}): {e}")
+    def _stop_requested_at(self, execution_id: str) -> Optional[datetime]:
+        row = self.state.get(execution_id)
+        if row is None or row["stop_requested_at"] is None:
+            return None
+        return datetime.fromisoformat(row["stop_requested_at"])
     
-    def _create_runtime_config(self, config_data: Dict, execution_id: str) -> str:
-        """런타임 설정 파일 생성"""
+    def _create_runtime_config(self, config_data: Dict, execution_id: str) -> Tuple[str, Dict]:
+        """런타임 설정 파일 생성 (파일 경로와 병합된 설정 반환)"""
         try:
-            # 기본 설정 파일 로드
-            with open(self.config_path, 'r', encoding='utf-8') as f:
-                base_config = json.load(f)
-            
-            # 프론트엔드 설정과 병합
-            merged_config = self._merge_configs(base_config, config_data)
+            # 기본 설정 파일과 프론트엔드 설정 병합
+            merged_config = self.build_runtime_config(config_data)
             
             # 임시 설정 파일 생성
             temp_config_path = self.temp_configs_dir / f"admin_confirm_{execution_id}.json"
@@ -314,12 +399,46 @@ class AdminConfirmExecutor:
                 json.dump(merged_config, f, ensure_ascii=False, indent=2)
             
             print(f"런타임 설정 파일 생성: {temp_config_path}")
-            return str(temp_config_path)
+            return str(temp_config_path), merged_config
             
         except Exception as e:
             print(f"런타임 설정 파일 생성 실패: {e}")
             raise e
     
+    def _create_run_plan(self, runtime_config: Dict, execution_id: str) -> Tuple[str, Dict]:
+        """실행 계획 컴파일 및 파일 생성 (RPA 프로세스의 Excel 파싱/상태 매핑 작업을 서버에서 한 번만 수행)"""
+        try:
+            from services.run_plan import plan_files, write_run_plan
+            
+            plan = self.compile_plan(runtime_config, execution_id)
+            plan_path = self.temp_configs_dir / f"admin_confirm_{execution_id}_plan.json"
+            write_run_plan(plan, plan_path)
+            
+            files = plan_files(plan)
+            print(f"실행 계획 생성: {plan_path} (파일 {len(files)}개, 처리 대상 {sum(len(f['orders']) for f in files)}건, "
+                  f"건너뜀 {sum(len(f['skipped_rows']) for f in files)}건)")
+            return str(plan_path), plan
+            
+        except Exception as e:
+            print(f"실행 계획 생성 실패: {e}")
+            raise e
+    
+    def compile_plan(self, runtime_config: Dict, execution_id: str) -> Dict:
+        """병합된 런타임 설정으로 실행 계획 컴파일 (파일 생성 없음, 실행 전 점검 실패 시 PreflightError)"""
+        from services.run_plan import compile_checked_run_plan, load_status_mapping
+        from services.upload_manager import get_upload_manager
+        
+        # 업로드 시 파싱된 결과 재사용 (없으면 여기서 파싱), 상태 매핑은 서버 캐시 사용
+        # file_paths.excel_files가 있으면 파일(시트)별 계획을 묶은 배치 계획 (한 브라우저 세션에서 순서대로 처리)
+        status_mapping = load_status_mapping()
+        return compile_checked_run_plan(runtime_config, execution_id, status_mapping, get_upload_manager().get_columns)
+    
+    def build_runtime_config(self, config_data: Dict) -> Dict:
+        """기본 설정 파일과 프론트엔드 설정 병합 (파일 생성 없음)"""
+        with open(self.config_path, 'r', encoding='utf-8') as f:
+            base_config = json.load(f)
+        return self._merge_configs(base_config, config_data)
+    
     def _merge_configs(self, base_config: Dict, frontend_config: Dict) -> Dict:
         """설정 병합"""
         merged = base_config.copy()
@@ -333,10 +452,118 @@ class AdminConfirmExecutor:
         
         return merged
     
+    def plan_file_summary(self, plan: Dict) -> List[Dict]:
+        """실행 이력용 파일별 처리 대상 요약 (배치 실행은 파일마다, 결과 파일도 파일마다 따로 기록됨)"""
+        from services.run_plan import plan_files
+        return [
+            {
+                "file": file_plan.get("file_label") or Path(file_plan["excel_file"]).name,
+                "orders": len(file_plan["orders"]),
+                "skipped_rows": len(file_plan["skipped_rows"])
+            }
+            for file_plan in plan_files(plan)
+        ]
+    
+    def _startup_stats_path(self, execution_id: str) -> Path:
+        """워커 시작 비용 통계 파일 경로"""
+        return self.temp_configs_dir / f"admin_confirm_{execution_id}_startup.json"
+    
+    def _stop_file_path(self, execution_id: str) -> Path:
+        """RPA가 주문 사이에서 확인하는 중단 요청 파일 경로"""
+        return self.temp_configs_dir / f"admin_confirm_{execution_id}_stop.json"
+    
+    def _control_file_path(self, execution_id: str) -> Path:
+        """RPA가 주문 사이에서 확인하는 제어 파일 경로 (일시정지/재개, 실행 중 설정 변경)"""
+        return self.temp_configs_dir / f"admin_confirm_{execution_id}_control.json"
+    
+    def _canary_report_path(self, execution_id: str) -> Path:
+        """RPA가 기록하는 카나리 판정 보고서 경로"""
+        return self.temp_configs_dir / f"admin_confirm_{execution_id}_canary.json"
+    
+    def _metrics_path(self, execution_id: str) -> Path:
+        """RPA가 기록하는 단계별 소요 시간 계측 파일 경로"""
+        return self.temp_configs_dir / f"admin_confirm_{execution_id}_metrics.json"
+    
+    def _record_finished(self, history_item: Dict, usage: Optional[Dict] = None) -> Optional[Dict]:
+        """
+        종료된 실행의 시작 비용/단계별 계측 결과/자원 사용량을 이력에 첨부 (임시 파일 정리 전에 호출)
+        
+        Returns:
+            서버 누적 계측(/metrics)에 합산할 단계 계측 snapshot (없으면 None)
+        """
+        self._attach_startup_stats(history_item)
+        stage_snapshot = self._attach_stage_metrics(history_item)
+        self._attach_profile_summary(history_item)
+        self._attach_canary_report(history_item)
+        if usage is not None:
+            history_item["resources"] = usage
+        return stage_snapshot
+    
+    def _attach_stage_metrics(self, history_item: Dict) -> Optional[Dict]:
+        """단계별 소요 시간 요약을 실행 이력에 첨부하고 실행의 계측 snapshot 반환"""
+        if "stages" in history_item:
+            return None
+        from rpa.metrics import MetricsRegistry, load_snapshot
+        
+        snapshot = load_snapshot(str(self._metrics_path(history_item["execution_id"])))
+        if snapshot is None:
+            return None
+        run_metrics = MetricsRegistry()
+        run_metrics.merge(snapshot)
+        history_item["stages"] = run_metrics.summary()
+        counters = snapshot.get("counters", {})
+        history_item["relogins"] = counters.get("session.relogin", 0)
+        history_item["browser_restarts"] = counters.get("browser.recycle", 0) + counters.get("browser.crash", 0)
+        return snapshot
+    
+    def _attach_startup_stats(self, history_item: Dict):
+        """워커가 기록한 시작 비용 통계(import 시간, warm worker로 절약한 시간)를 실행 이력에 첨부"""
+        if "startup" in history_item:
+            return
+        try:
+            with open(self._startup_stats_path(history_item["execution_id"]), 'r', encoding='utf-8') as f:
+                history_item["startup"] = json.load(f)
+        except Exception:
+            pass
+    
+    def _attach_canary_report(self, history_item: Dict):
+        """카나리 판정 보고서(실패율, 단계별 평균 시간, 기준 초과 항목)를 실행 이력에 첨부"""
+        if "canary" in history_item:
+            return
+        try:
+            with open(self._canary_report_path(history_item["execution_id"]), 'r', encoding='utf-8') as f:
+                history_item["canary"] = json.load(f)
+        except Exception:
+            pass
+    
+    def _attach_profile_summary(self, history_item: Dict):
+        """프로파일링한 실행의 요약(상위 함수, import 시간)을 실행 이력에 첨부 (프로파일 파일은 profiles/에 유지)"""
+        if not history_item.get("profile_mode") or "profile" in history_item:
+            return
+        from rpa.profiler import summary_path
+        try:
+            with open(summary_path(history_item["execution_id"]), 'r', encoding='utf-8') as f:
+                history_item["profile"] = json.load(f)
+        except Exception:
+            pass
+    
+    def get_profile_path(self, execution_id: str) -> Optional[Path]:
+        """실행의 프로파일 파일 경로 (프로파일링하지 않았거나 아직 저장되지 않았으면 None)"""
+        from rpa.profiler import PROFILE_MODES, artifact_path
+        try:
+            execution_id = str(uuid.UUID(execution_id))  # 경로 조작 방지
+        except ValueError:
+            return None
+        for mode in PROFILE_MODES:
+            path = artifact_path(execution_id, mode)
+            if path.exists():
+                return path
+        return None
+    
     def _cleanup_temp_config(self, execution_id: str):
         """임시 설정 파일 정리"""
         try:
-            for config_file in self.temp_configs_dir.glob(f"admin_confirm_{execution_id}.json"):
+            for config_file in self.temp_configs_dir.glob(f"admin_confirm_{execution_id}*.json"):
                 config_file.unlink()
                 print(f"임시 설정 파일 삭제: {config_file}")
         except Exception as e:
@@ -0,0 +1,152 @@
+# resource_sampler.py - 실행별 자원 사용량 샘플링 모듈
+# RPA 프로세스와 하위 Chrome/chromedriver 프로세스의 CPU, 메모리(RSS), 열린 핸들 수를 일정 간격으로 기록합니다.
+# 한 서버에서 동시에 몇 개의 실행을 감당할 수 있는지 판단하는 자료로 사용합니다.
+# - 샘플은 컬럼 형태로 저장 (t, cpu_percent, rss_mb, chrome_rss_mb, handles, processes)
+# - 시계열이 MAX_SAMPLES를 넘으면 하나 걸러 버리고 시계열 간격을 두 배로 늘림 (장시간 실행도 크기가 일정)
+# - 최댓값/평균 요약은 시계열을 줄이기 전의 모든 샘플 기준
+# - psutil 필요 (requirements.txt, 서버의 실행 상태 저장소도 사용 - 샘플링하지 못한 실행은 실행 이력에 이유를 기록)
+import os
+import time
+import threading
+from typing import Dict, List, Optional
+
+try:
+    import psutil
+except ImportError:  # requirements.txt에 포함 (설치되지 않은 환경에서는 샘플링하지 않음)
+    psutil = None
+
+PSUTIL_MISSING = "psutil이 설치되지 않아 샘플링하지 않습니다 (pip install -r requirements.txt)"
+
+MB = 1024 * 1024
+
+# 샘플링 간격 (초)
+DEFAULT_INTERVAL = float(os.environ.get('ADMIN_CONFIRM_SAMPLE_INTERVAL', '5'))
+# 실행당 시계열 최대 길이 (넘으면 시계열 간격을 두 배로 늘려 절반으로 줄임)
+MAX_SAMPLES = 720
+
+SERIES_FIELDS = ("t", "cpu_percent", "rss_mb", "chrome_rss_mb", "handles", "processes")
+
+
+def sampling_available() -> bool:
+    return psutil is not None
+
+
+def unavailable(reason: str) -> Dict:
+    """샘플링하지 못한 실행의 자원 사용량 항목"""
+    return {"available": False, "reason": reason}
+
+
+def open_handles(process) -> int:
+    """열린 파일 디스크립터(POSIX) 또는 핸들(Windows) 수"""
+    if hasattr(process, "num_fds"):
+        return process.num_fds()
+    return process.num_handles()
+
+
+def summarize(totals: Dict[str, List], samples: int, interval: float) -> Dict:
+    """최댓값/평균 요약 (시계열을 줄이기 전의 모든 샘플 기준)"""
+    summary = {"samples": samples, "interval": interval}
+    for field in SERIES_FIELDS[1:]:
+        total, peak = totals[field]
+        summary[field] = {"peak": peak, "mean": round(total / samples, 1) if samples else 0}
+    return summary
+
+
+class ResourceSampler:
+    """실행 1건의 자원 사용량 샘플링 스레드 (start → stop, 실행 중에도 snapshot 조회 가능)"""
+
+    def __init__(self, pid: int, interval: float = DEFAULT_INTERVAL):
+        self.pid = pid
+        self.interval = max(0.1, interval)
+        self.series = {"interval": self.interval, **{field: [] for field in SERIES_FIELDS}}
+        self.totals = {field: [0, 0] for field in SERIES_FIELDS[1:]}  # 필드 → [합계, 최댓값]
+        self.samples = 0
+        self._processes = {}  # pid → psutil.Process (cpu_percent는 같은 객체의 이전 호출 기준)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._started_at = None
+        self.error = None  # 샘플링을 시작하지 못한 이유
+
+    def start(self) -> bool:
+        """샘플링 시작 (psutil이 없거나 프로세스를 찾을 수 없으면 error에 이유를 남기고 False)"""
+        if psutil is None:
+            self.error = PSUTIL_MISSING
+            return False
+        try:
+            self._processes[self.pid] = psutil.Process(self.pid)
+        except psutil.Error as e:
+            self.error = f"RPA 프로세스를 찾을 수 없습니다: {e}"
+            return False
+        self._started_at = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name=f"resource-sampler-{self.pid}", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self) -> Optional[Dict]:
+        """샘플링 종료 후 {"available", "summary", "series"} 반환 (샘플링하지 않았으면 None)"""
+        if self._thread is None:
+            return None
+        self._stop.set()
+        self._thread.join(timeout=self.interval + 5)
+        return self.snapshot()
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            series = {key: list(value) if isinstance(value, list) else value for key, value in self.series.items()}
+            summary = summarize(self.totals, self.samples, self.series["interval"])
+        return {"available": True, "summary": summary, "series": series}
+
+    def _run(self):
+        self.sample()  # 첫 cpu_percent는 기준점 (0.0)
+        while not self._stop.wait(self.interval):
+            if not self.sample():
+                break
+
+    def sample(self) -> bool:
+        """샘플 1개 기록 (RPA 프로세스가 종료되었으면 False)"""
+        root = self._processes[self.pid]
+        try:
+            children = root.children(recursive=True)
+        except psutil.Error:
+            return False
+
+        current = {self.pid: root}
+        for child in children:
+            current[child.pid] = self._processes.get(child.pid, child)
+        self._processes = current
+
+        cpu = rss = chrome_rss = handles = 0.0
+        alive = 0
+        for pid, process in current.items():
+            try:
+                with process.oneshot():
+                    cpu += process.cpu_percent(None)
+                    memory = process.memory_info().rss
+                    handles += open_handles(process)
+            except psutil.Error:
+                continue  # 샘플 사이에 종료된 하위 프로세스 (상세 창 렌더러 등)
+            alive += 1
+            rss += memory
+            if pid != self.pid:
+                chrome_rss += memory
+
+        with self._lock:
+            self._append(round(time.monotonic() - self._started_at, 1), round(cpu, 1), round(rss / MB, 1),
+                         round(chrome_rss / MB, 1), int(handles), alive)
+        return True
+
+    def _append(self, *values):
+        """샘플 추가 (요약은 모든 샘플 기준, 시계열은 MAX_SAMPLES를 넘으면 하나 걸러 버리고 간격 두 배)"""
+        self.samples += 1
+        for field, value in zip(SERIES_FIELDS[1:], values[1:]):
+            self.totals[field][0] += value
+            self.totals[field][1] = max(self.totals[field][1], value)
+        if len(self.series["t"]) >= MAX_SAMPLES:
+            for field in SERIES_FIELDS:
+                self.series[field] = self.series[field][::2]
+            self.series["interval"] *= 2  # 샘플링 간격은 그대로 (요약은 계속 모든 샘플 기준)
+        if self.series["t"] and values[0] - self.series["t"][-1] < self.series["interval"] * 0.5:
+            return  # 시계열 간격보다 촘촘한 샘플은 요약에만 반영
+        for field, value in zip(SERIES_FIELDS, values):
+            self.series[field].append(value)
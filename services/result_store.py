@@ -0,0 +1,244 @@
+# result_store.py - 주문별 처리 결과 저장소 (SQLite)
+# RPA 엔진이 결과 파일(전송여부결과_*.txt)에 기록할 때마다 같은 결과를 색인된 로컬 DB에도 기록합니다.
+# 서버는 이 DB로 실행/결과/기간별 조회(/api/results)와 CSV/xlsx 내보내기를 제공합니다.
+# - 여러 프로세스(서버, RPA)가 동시에 접근하므로 WAL 모드 사용, 작업마다 연결을 열고 닫음
+# - 내보내기는 커서를 일정 건수씩 읽어 스트리밍 (전체 결과를 메모리에 올리지 않음)
+# - DB는 결과 파일과 같은 결과 디렉토리(file_paths.result_directory)에 저장 (ADMIN_CONFIRM_RESULT_DB로 경로 고정 가능)
+import os
+import csv
+import io
+import sqlite3
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+PROJECT_ROOT = Path(__file__).parent.parent
+DEFAULT_RESULT_DIR = PROJECT_ROOT / "results"
+RESULT_DB_NAME = "results.db"
+DEFAULT_DB_PATH = DEFAULT_RESULT_DIR / RESULT_DB_NAME
+
+PAGE_SIZE = 50
+EXPORT_CHUNK_SIZE = 1000
+
+# 조회/내보내기 컬럼 (결과 파일 열 순서 + 실행 ID)
+COLUMNS = ["execution_id", "order_number", "confirm_number", "status_result", "lms_result", "processed_at", "attempts", "result_file"]
+EXPORT_HEADERS = ["실행ID", "주문번호", "확정번호", "상태결과", "LMS결과", "처리시간", "시도횟수", "결과파일"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    execution_id TEXT NOT NULL,
+    order_number TEXT NOT NULL,
+    confirm_number TEXT,
+    status_result TEXT,
+    lms_result TEXT,
+    processed_at TEXT,
+    attempts INTEGER,
+    result_file TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_results_execution ON results (execution_id, order_number);
+CREATE INDEX IF NOT EXISTS idx_results_order ON results (order_number);
+CREATE INDEX IF NOT EXISTS idx_results_processed_at ON results (processed_at);
+CREATE INDEX IF NOT EXISTS idx_results_outcome ON results (status_result, lms_result);
+"""
+
+
+class ResultStore:
+    """주문별 처리 결과 저장/조회"""
+
+    def __init__(self, db_path=None):
+        self.db_path = Path(db_path or os.environ.get("ADMIN_CONFIRM_RESULT_DB") or DEFAULT_DB_PATH)
+        self._initialized = False
+        self._init_lock = threading.Lock()
+
+    def _connect(self, check_same_thread: bool = True) -> sqlite3.Connection:
+        if not self._initialized:
+            with self._init_lock:
+                if not self._initialized:
+                    self.db_path.parent.mkdir(parents=True, exist_ok=True)
+                    conn = sqlite3.connect(str(self.db_path), timeout=30)
+                    try:
+                        conn.execute("PRAGMA journal_mode=WAL")
+                        conn.executescript(SCHEMA)
+                        conn.commit()
+                    finally:
+                        conn.close()
+                    self._initialized = True
+        conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=check_same_thread)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    # ===== 기록 =====
+
+    def record(self, execution_id: str, order_number: str, confirm_number: str, status_result: str, lms_result: str,
+               processed_at: str, attempts: int = 1, result_file: Optional[str] = None):
+        """결과 1건 기록 (결과 파일 1행과 같은 내용)"""
+        self.record_many([{
+            "execution_id": execution_id,
+            "order_number": order_number,
+            "confirm_number": confirm_number,
+            "status_result": status_result,
+            "lms_result": lms_result,
+            "processed_at": processed_at,
+            "attempts": attempts,
+            "result_file": result_file
+        }])
+
+    def record_many(self, rows: List[Dict]):
+        if not rows:
+            return
+        conn = self._connect()
+        try:
+            with conn:
+                conn.executemany(
+                    f"INSERT INTO results ({', '.join(COLUMNS)}) VALUES ({', '.join('?' for _ in COLUMNS)})",
+                    [tuple(row.get(column) for column in COLUMNS) for row in rows]
+                )
+        finally:
+            conn.close()
+
+    def set_result_file(self, execution_id: str, result_file: str):
+        """결과 파일이 나중에 만들어지는 실행(분산 실행)의 결과 파일 경로 기록"""
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("UPDATE results SET result_file = ? WHERE execution_id = ? AND result_file IS NULL",
+                             (result_file, execution_id))
+        finally:
+            conn.close()
+
+    # ===== 조회 =====
+
+    @staticmethod
+    def _where(filters: Dict) -> Tuple[str, List]:
+        """조회 조건 (실행 ID, 주문번호, 상태/LMS 결과, 처리 날짜 범위 YYYY-MM-DD)"""
+        clauses, params = [], []
+        for column in ("execution_id", "order_number", "status_result", "lms_result"):
+            if filters.get(column):
+                clauses.append(f"{column} = ?")
+                params.append(filters[column])
+        if filters.get("date_from"):
+            clauses.append("processed_at >= ?")
+            params.append(filters["date_from"])
+        if filters.get("date_to"):
+            clauses.append("processed_at < date(?, '+1 day')")
+            params.append(filters["date_to"])
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def query(self, filters: Optional[Dict] = None, page: int = 1, page_size: int = PAGE_SIZE) -> Dict:
+        """조건에 맞는 결과를 최신순으로 페이지 단위 조회 + 상태/LMS 결과별 건수"""
+        filters = filters or {}
+        page = max(1, page)
+        page_size = max(1, min(page_size, 500))
+        where, params = self._where(filters)
+
+        conn = self._connect()
+        try:
+            total = conn.execute(f"SELECT COUNT(*) FROM results{where}", params).fetchone()[0]
+            rows = conn.execute(
+                f"SELECT {', '.join(COLUMNS)} FROM results{where} ORDER BY processed_at DESC, id DESC LIMIT ? OFFSET ?",
+                params + [page_size, (page - 1) * page_size]
+            ).fetchall()
+            counts = {}
+            for column in ("status_result", "lms_result"):
+                counts[column] = {
+                    row[0]: row[1]
+                    for row in conn.execute(f"SELECT {column}, COUNT(*) FROM results{where} GROUP BY {column} ORDER BY 2 DESC", params)
+                }
+        finally:
+            conn.close()
+
+        return {
+            "results": [dict(row) for row in rows],
+            "counts": counts,
+            "total": total,
+            "page": page,
+            "page_size": page_size,
+            "total_pages": (total + page_size - 1) // page_size
+        }
+
+    def iter_rows(self, filters: Optional[Dict] = None) -> Iterator[Tuple]:
+        """조건에 맞는 결과를 처리 순서대로 EXPORT_CHUNK_SIZE건씩 읽어 반환"""
+        where, params = self._where(filters or {})
+        # StreamingResponse는 반복마다 다른 스레드에서 호출할 수 있음 (한 번에 한 스레드만 사용)
+        conn = self._connect(check_same_thread=False)
+        try:
+            cursor = conn.execute(f"SELECT {', '.join(COLUMNS)} FROM results{where} ORDER BY processed_at, id", params)
+            while True:
+                chunk = cursor.fetchmany(EXPORT_CHUNK_SIZE)
+                if not chunk:
+                    break
+                for row in chunk:
+                    yield tuple(row)
+        finally:
+            conn.close()
+
+    # ===== 내보내기 =====
+
+    def iter_csv(self, filters: Optional[Dict] = None) -> Iterator[bytes]:
+        """CSV 내보내기 (Excel에서 한글이 깨지지 않도록 UTF-8 BOM 포함)"""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_HEADERS)
+        yield ("\ufeff" + buffer.getvalue()).encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate(0)
+
+        count = 0
+        for row in self.iter_rows(filters):
+            writer.writerow(row)
+            count += 1
+            if count % EXPORT_CHUNK_SIZE == 0:
+                yield buffer.getvalue().encode("utf-8")
+                buffer.seek(0)
+                buffer.truncate(0)
+        if buffer.tell():
+            yield buffer.getvalue().encode("utf-8")
+
+    def export_xlsx(self, filters: Optional[Dict] = None) -> str:
+        """xlsx 내보내기 (openpyxl write-only 모드로 임시 파일에 행 단위 기록), 임시 파일 경로 반환"""
+        import openpyxl
+
+        workbook = openpyxl.Workbook(write_only=True)
+        sheet = workbook.create_sheet("results")
+        sheet.append(EXPORT_HEADERS)
+        for row in self.iter_rows(filters):
+            sheet.append(list(row))
+
+        fd, path = tempfile.mkstemp(prefix="admin_confirm_results_", suffix=".xlsx")
+        os.close(fd)
+        try:
+            workbook.save(path)
+        except BaseException:
+            os.remove(path)
+            raise
+        return path
+
+
+def result_dir_from_config(config: Dict) -> str:
+    """설정의 결과 디렉토리 (상대 경로는 프로젝트 폴더 기준, 없으면 results/)"""
+    from services.run_plan import resolve_path
+
+    return resolve_path(config.get('file_paths', {}).get('result_directory', '')) or str(DEFAULT_RESULT_DIR)
+
+
+def result_db_path(result_dir: Optional[str] = None) -> Path:
+    """결과 DB 경로 (ADMIN_CONFIRM_RESULT_DB > 결과 디렉토리/results.db > 기본 경로)"""
+    override = os.environ.get("ADMIN_CONFIRM_RESULT_DB")
+    if override:
+        return Path(override)
+    return Path(result_dir) / RESULT_DB_NAME if result_dir else DEFAULT_DB_PATH
+
+
+# 전역 인스턴스 (결과 DB 경로별로 1개)
+_result_stores: Dict[Path, ResultStore] = {}
+_result_stores_lock = threading.Lock()
+
+def get_result_store(result_dir: Optional[str] = None) -> ResultStore:
+    """결과 디렉토리의 결과 저장소 인스턴스 반환"""
+    db_path = result_db_path(result_dir)
+    with _result_stores_lock:
+        if db_path not in _result_stores:
+            _result_stores[db_path] = ResultStore(db_path)
+        return _result_stores[db_path]
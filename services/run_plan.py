@@ -0,0 +1,452 @@
+# run_plan.py - RPA 실행 계획 컴파일 모듈
+# 서버에서 한 번만 계산한 실행 계획(상태 코드, 검색 URL 템플릿, 주문 목록, 타이밍)을 RPA 프로세스에 전달합니다.
+# RPA 시작 시 pandas import / Excel 파싱 / 주문별 상태 매핑 작업을 없애기 위해 사용합니다.
+# 주의: RPA 프로세스에서도 import 되므로 모듈 수준에서 pandas를 import 하지 않습니다.
+import os
+import json
+import hashlib
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlparse
+
+PLAN_VERSION = 1
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# 검색 URL 템플릿의 주문번호 자리표시자
+ORDER_NUMBER_PLACEHOLDER = "{order_number}"
+
+# 타이밍 프로파일 기본값 (초)
+DEFAULT_TIMING = {
+    "page_load_wait": 2,
+    "upload_wait": 2,
+    "detail_page_wait": 2,
+    "refresh_wait": 2,
+    "lms_popup_wait": 2
+}
+
+# 일시적 실패 재시도 정책 기본값 (최대 시도 횟수, 첫 재시도 대기 초, 최대 대기 초, 배수)
+DEFAULT_RETRY = {
+    "max_attempts": 3,
+    "base_delay": 5,
+    "max_delay": 60,
+    "multiplier": 2
+}
+
+# 엑셀 업로드 기본값 (이미 업로드한 시트 건너뛰기, 분할 업로드 행 수, 업로드 기록 보관 일수)
+DEFAULT_UPLOAD = {
+    "skip_uploaded": True,
+    "chunk_size": 500,
+    "ledger_days": 7
+}
+
+# 카나리 실행 기본값 (앞 N건 처리 후 실패율/처리 시간 기준을 통과하면 나머지 처리 - rpa/canary.py)
+DEFAULT_CANARY = {
+    "orders": 10,
+    "max_failure_rate": 0.2,
+    "max_order_seconds": 0,  # 0이면 확인하지 않음
+    "tabs_after": 0  # 통과 후 탭 수 (0이면 그대로)
+}
+
+# 기본 상태 매핑 (master_data.xlsx를 읽을 수 없을 때 사용)
+DEFAULT_STATUS_MAPPING = {
+    # 영문 → 한글
+    "addpay": "추가결제대기중",
+    "cancel": "취소",
+    "cancelWait": "취소 확인필요",
+    "cancelWip": "취소처리중",
+    "cancelRequest": "취소요청",
+    "complete": "완료",
+    "confirm": "확정",
+    "confirmWait": "확정 확인필요",
+    "confirmWip": "확정처리중",
+    "noshow": "노쇼",
+    "fail": "결제실패",
+    "pending": "대기",
+    # 한글 → 영문 (역매핑)
+    "추가결제대기중": "addpay",
+    "취소": "cancel",
+    "취소 확인필요": "cancelWait",
+    "취소처리중": "cancelWip",
+    "취소요청": "cancelRequest",
+    "완료": "complete",
+    "확정": "confirm",
+    "확정 확인필요": "confirmWait",
+    "확정처리중": "confirmWip",
+    "노쇼": "noshow",
+    "결제실패": "fail",
+    "대기": "pending"
+}
+
+
+def resolve_path(path_str: str) -> Optional[str]:
+    """상대 경로를 절대 경로로 변환 (프로젝트 폴더 기준)"""
+    if not path_str:
+        return None
+    if os.path.isabs(path_str):
+        return path_str
+    return str(PROJECT_ROOT / Path(path_str))
+
+
+def resolve_base_url(config: Dict) -> str:
+    """login.url을 기반으로 base_url 결정 (base_url이 없거나 개발서버 URL인 경우, 포트 제거)"""
+    base_url = config.get('urls', {}).get('base_url', '')
+    login_url = config.get('login', {}).get('url')
+
+    if login_url and (not base_url or 'dev.allmytour.com' in base_url):
+        parsed = urlparse(login_url)
+        # 포트가 있는 경우와 없는 경우 모두 처리
+        if parsed.port:
+            base_url = f"{parsed.scheme}://{parsed.netloc.split(':')[0]}"
+        else:
+            base_url = f"{parsed.scheme}://{parsed.netloc}"
+
+    return base_url
+
+
+def build_status_mapping(order_statuses: List[Dict[str, str]]) -> Dict[str, str]:
+    """ExcelDataManager.get_order_statuses() 결과로 영문 ↔ 한글 양방향 매핑 생성"""
+    status_mapping = {}
+    for status in order_statuses:
+        status_en = status.get('code', '').strip()
+        status_kr = status.get('name', '').strip()
+        if status_en and status_kr:
+            status_mapping[status_en] = status_kr  # 영문 → 한글
+            status_mapping[status_kr] = status_en  # 한글 → 영문 (역매핑)
+    return status_mapping or dict(DEFAULT_STATUS_MAPPING)
+
+
+def load_status_mapping() -> Dict[str, str]:
+    """master_data.xlsx의 order_status 시트에서 상태 매핑 로드 (실패 시 기본 매핑)"""
+    try:
+        from services.excel_manager import get_excel_manager
+        return build_status_mapping(get_excel_manager().get_order_statuses())
+    except Exception as e:
+        print(f"⚠️ 경고: 상태 매핑 로드 실패: {e}")
+        print("기본 상태 매핑을 사용합니다.")
+        return dict(DEFAULT_STATUS_MAPPING)
+
+
+def resolve_target_status(change_to_status: str, status_mapping: Dict[str, str]) -> Dict[str, str]:
+    """변경할 상태(한글 또는 영문)를 영문 코드와 한글 표시명으로 변환"""
+    target_value = change_to_status
+    if change_to_status in status_mapping:
+        mapped_value = status_mapping[change_to_status]
+        # 매핑된 값이 영문 코드이면 원본이 한글이었음
+        if isinstance(mapped_value, str) and mapped_value.isascii() and not any('가' <= c <= '힣' for c in mapped_value):
+            target_value = mapped_value
+    target_text = status_mapping.get(target_value, target_value)
+    return {"target_value": target_value, "target_text": target_text}
+
+
+def build_search_url_template(base_url: str, search_settings: Dict) -> str:
+    """주문번호 검색 URL 템플릿 생성 ({order_number} 자리에 주문번호 삽입)"""
+    # search_status 지원 (하위 호환성을 위해 change_status도 지원)
+    search_status = search_settings.get('search_status') or search_settings.get('change_status', '')
+    return (
+        f"{base_url}/orders?"
+        f"appointDayType={search_settings.get('appoint_day_type', '')}&"
+        f"exChannelId=&"
+        f"nationIdx=&"
+        f"addr1Idx=&"
+        f"gradeType=&"
+        f"perPage={search_settings.get('per_page', 100)}&"
+        f"orderChannelIdx={search_settings.get('orderChannelIdx', '')}&"
+        f"ratepalnSaleType=&"
+        f"saleType={search_settings.get('saleType', '')}&"
+        f"payStatus=&"
+        f"orderProductStatus={search_status}&"
+        f"orderRateplanType=&"
+        f"dateType={search_settings.get('dateType', '')}&"
+        f"startDate={search_settings.get('startDate', '')}&"
+        f"endDate={search_settings.get('endDate', '')}&"
+        f"searchType=orderNum&"
+        f"keyword={ORDER_NUMBER_PLACEHOLDER}"
+    )
+
+
+def build_timing_profile(config: Dict) -> Dict[str, float]:
+    """timing → timing_advanced → 기본값 순서로 타이밍 값 결정"""
+    timing = config.get('timing', {}) or {}
+    timing_advanced = config.get('timing_advanced', {}) or {}
+    profile = {}
+    for name in set(DEFAULT_TIMING) | set(timing) | set(timing_advanced):
+        default = DEFAULT_TIMING.get(name, 2)
+        try:
+            profile[name] = float(timing[name] if name in timing else timing_advanced.get(name, default))
+        except (TypeError, ValueError):
+            profile[name] = float(default)
+    return profile
+
+
+def build_retry_policy(config: Dict) -> Dict[str, float]:
+    """retry 설정과 기본값 병합 (잘못된 값은 기본값 사용)"""
+    retry = config.get('retry', {}) or {}
+    policy = {}
+    for name, default in DEFAULT_RETRY.items():
+        try:
+            policy[name] = float(retry.get(name, default))
+        except (TypeError, ValueError):
+            policy[name] = float(default)
+    policy["max_attempts"] = max(1, int(policy["max_attempts"]))
+    return policy
+
+
+def build_canary_plan(config: Dict) -> Optional[Dict]:
+    """excel_settings.canary 설정과 기본값 병합 (사용하지 않으면 None, 잘못된 값은 기본값 사용)"""
+    canary = (config.get('excel_settings', {}) or {}).get('canary') or {}
+    if not canary.get('enabled', False):
+        return None
+    plan = {}
+    for name, default in DEFAULT_CANARY.items():
+        try:
+            plan[name] = float(canary.get(name, default))
+        except (TypeError, ValueError):
+            plan[name] = float(default)
+    plan["orders"] = max(1, int(plan["orders"]))
+    plan["tabs_after"] = max(0, int(plan["tabs_after"]))
+    # 단계별 평균 소요 시간 기준 (계측 이름 → 초, 예: {"search_order_by_number": 5})
+    plan["max_stage_seconds"] = {}
+    for stage, limit in (canary.get('max_stage_seconds') or {}).items():
+        try:
+            plan["max_stage_seconds"][stage] = float(limit)
+        except (TypeError, ValueError):
+            continue
+    return plan
+
+
+def rows_hash(order_numbers: List[str], confirm_numbers: List[str]) -> str:
+    """업로드할 행 내용(주문번호, 확정번호)의 SHA-256 (같은 내용을 다시 저장한 파일도 같은 값)"""
+    digest = hashlib.sha256()
+    for order_number, confirm_number in zip(order_numbers, confirm_numbers):
+        digest.update(f"{order_number}\t{confirm_number}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def build_upload_plan(config: Dict, excel_file: Optional[str], order_columns: Dict[str, List]) -> Dict:
+    """
+    엑셀 업로드 계획 (시트 내용 해시 + chunk_size보다 큰 xlsx 시트의 분할 범위)
+
+    분할 범위는 엑셀 행 번호 기준이며, RPA가 원본 시트에서 해당 행을 복사하여 분할 파일을 만듭니다.
+    """
+    from services.upload_manager import DATA_START_INDEX, ORDER_SHEET_NAME
+
+    upload = {**DEFAULT_UPLOAD, **(config.get('upload', {}) or {})}
+    try:
+        chunk_size = max(0, int(upload["chunk_size"]))
+    except (TypeError, ValueError):
+        chunk_size = DEFAULT_UPLOAD["chunk_size"]
+
+    rows = order_columns["row"]
+    sheet_name = sheet_name_of(config)
+    plan = {
+        "skip_uploaded": bool(upload["skip_uploaded"]),
+        "ledger_days": float(upload["ledger_days"]),
+        "sheet_hash": rows_hash(order_columns["order_number"], order_columns["confirm_number"]),
+        "rows": len(rows),
+        "sheet_name": sheet_name,
+        "target_sheet_name": ORDER_SHEET_NAME,
+        "header_rows": DATA_START_INDEX,
+        "chunks": []
+    }
+    is_xlsx = str(excel_file or '').lower().endswith('.xlsx')
+    # list 외 시트는 해당 시트만 복사한 파일(list 시트)로 업로드 (분할 크기보다 작아도 1개 파일로 만듦)
+    if is_xlsx and sheet_name != ORDER_SHEET_NAME and not (chunk_size and len(rows) > chunk_size):
+        chunk_size = len(rows)
+    # csv 등은 분할하지 않고 원본 그대로 업로드
+    if is_xlsx and chunk_size and (len(rows) > chunk_size or sheet_name != ORDER_SHEET_NAME):
+        for start in range(0, len(rows), chunk_size):
+            end = min(start + chunk_size, len(rows))
+            plan["chunks"].append({
+                "index": len(plan["chunks"]) + 1,
+                # 빈 행은 파싱에서 제외되므로 다음 분할의 시작 직전 행까지 포함
+                "start_row": rows[start] if start else DATA_START_INDEX + 1,
+                "end_row": rows[end] - 1 if end < len(rows) else None,
+                "rows": end - start,
+                "hash": rows_hash(order_columns["order_number"][start:end], order_columns["confirm_number"][start:end])
+            })
+    return plan
+
+
+def sheet_name_of(config: Dict) -> str:
+    """주문 시트 이름 (file_paths.sheet_name, 기본 list)"""
+    from services.upload_manager import ORDER_SHEET_NAME
+    return (config.get('file_paths', {}) or {}).get('sheet_name') or ORDER_SHEET_NAME
+
+
+def batch_entries(config: Dict) -> List[Dict[str, str]]:
+    """
+    배치 실행 파일 목록 (file_paths.excel_files, 없으면 빈 목록)
+
+    항목은 파일 경로 문자열 또는 {"file": 경로, "sheet": 시트 이름} (같은 파일의 여러 시트 지정 가능)
+    """
+    entries = []
+    for item in (config.get('file_paths', {}) or {}).get('excel_files') or []:
+        if isinstance(item, dict):
+            entries.append({"file": item.get('file', ''), "sheet": item.get('sheet') or ''})
+        else:
+            entries.append({"file": item, "sheet": ''})
+    return entries
+
+
+def entry_config(config: Dict, entry: Dict[str, str]) -> Dict:
+    """배치 항목 1개를 처리하는 설정 (file_paths.excel_file/sheet_name만 항목 값으로 변경)"""
+    file_paths = {key: value for key, value in (config.get('file_paths', {}) or {}).items() if key != 'excel_files'}
+    file_paths['excel_file'] = entry['file']
+    file_paths['sheet_name'] = entry['sheet']
+    return {**config, 'file_paths': file_paths}
+
+
+def entry_label(entry: Dict[str, str]) -> str:
+    name = Path(str(entry['file'])).name
+    return f"{name}#{entry['sheet']}" if entry['sheet'] else name
+
+
+def plan_files(plan: Dict) -> List[Dict]:
+    """실행 계획의 파일별 계획 목록 (배치 계획이 아니면 계획 자체 1개)"""
+    return plan.get('files') or [plan]
+
+
+def select_orders(columns: Dict[str, List], test_mode: Optional[Dict] = None):
+    """파싱된 주문 시트에서 처리 대상 주문과 건너뛸 행 분리 (테스트 모드 행 범위 적용, 주문번호가 없는 행만 건너뜀)"""
+    from services.upload_manager import is_processable
+
+    start_row, end_row = None, None
+    if test_mode and test_mode.get('enabled', False):
+        start_row = int(test_mode.get('start_row', 4))
+        end_row = int(test_mode['end_row']) if test_mode.get('end_row') else None
+
+    orders, skipped = [], []
+    for i, row in enumerate(columns["row"]):
+        if start_row is not None and row < start_row:
+            continue
+        if end_row is not None and row > end_row:
+            continue
+        item = {
+            "row": row,
+            "order_number": columns["order_number"][i],
+            "confirm_number": columns["confirm_number"][i]
+        }
+        if is_processable(columns["issue"][i]):
+            orders.append(item)
+        else:
+            item["issue"] = columns["issue"][i]
+            skipped.append(item)
+    return orders, skipped
+
+
+def compile_run_plan(config: Dict, execution_id: str, status_mapping: Dict[str, str], order_columns: Dict[str, List]) -> Dict:
+    """
+    실행 계획 컴파일
+
+    Args:
+        config: 병합된 런타임 설정
+        execution_id: 실행 ID
+        status_mapping: 영문 ↔ 한글 상태 매핑
+        order_columns: upload_manager.parse_order_sheet() 결과 (컬럼 형태)
+    """
+    base_url = resolve_base_url(config)
+    urls = config.get('urls', {})
+    search_settings = config.get('search_settings', {})
+    orders, skipped = select_orders(order_columns, config.get('excel_settings', {}).get('test_mode'))
+    excel_file = resolve_path(config.get('file_paths', {}).get('excel_file', ''))
+
+    # 상세페이지 드롭다운의 한글 텍스트 → 영문 코드 변환에 필요한 항목만 포함
+    text_to_code = {
+        text: code for text, code in status_mapping.items()
+        if any('가' <= c <= '힣' for c in text)
+    }
+
+    return {
+        "version": PLAN_VERSION,
+        "execution_id": execution_id,
+        "compiled_at": datetime.now().isoformat(),
+        "base_url": base_url,
+        "orders_url": base_url + urls.get('orders_page', '/orders'),
+        "upload_url": base_url + urls.get('upload_page', '/orders/uploadConfirmNumExcel'),
+        "search_url_template": build_search_url_template(base_url, search_settings),
+        "search_status": search_settings.get('search_status') or search_settings.get('change_status', ''),
+        "excel_file": excel_file,
+        "sheet_name": sheet_name_of(config),
+        "upload": build_upload_plan(config, excel_file, order_columns),
+        "status": {
+            **resolve_target_status(config.get('status_change', {}).get('change_to_status', ''), status_mapping),
+            "text_to_code": text_to_code
+        },
+        "timing": build_timing_profile(config),
+        "retry": build_retry_policy(config),
+        "canary": build_canary_plan(config),
+        "orders": orders,
+        "skipped_rows": skipped
+    }
+
+
+def compile_checked_run_plan(config: Dict, execution_id: str, status_mapping: Dict[str, str],
+                             load_columns: Callable[[str, str], Dict[str, List]]) -> Dict:
+    """
+    실행 전 점검 후 실행 계획 컴파일 (점검 실패 시 PreflightError)
+
+    file_paths.excel_files가 있으면 파일(시트)별 계획을 순서대로 묶은 배치 계획을 만듭니다.
+    RPA는 한 번 로그인한 브라우저로 파일별 계획을 차례로 업로드/처리하고 결과 파일을 파일마다 따로 기록합니다.
+    모든 파일을 점검한 뒤 문제를 한 번에 보고합니다 (문제 항목에 파일 이름 표시).
+
+    Args:
+        load_columns: (엑셀 파일 경로, 시트 이름) → 파싱 결과(컬럼 형태)
+    """
+    from services.preflight import PreflightError, run_preflight
+
+    entries = batch_entries(config)
+    if not entries:
+        sheet_name = sheet_name_of(config)
+        columns = run_preflight(config, status_mapping, lambda path: load_columns(path, sheet_name))
+        return compile_run_plan(config, execution_id, status_mapping, columns)
+
+    files, problems = [], []
+    for index, entry in enumerate(entries, 1):
+        file_config = entry_config(config, entry)
+        sheet_name = sheet_name_of(file_config)
+        try:
+            columns = run_preflight(file_config, status_mapping, lambda path: load_columns(path, sheet_name))
+        except PreflightError as e:
+            label = entry_label(entry)
+            problems += [{**item, "file": label, "message": f"[{label}] {item['message']}"} for item in e.problems]
+            continue
+        file_plan = compile_run_plan(file_config, execution_id, status_mapping, columns)
+        file_plan["file_index"] = index
+        file_plan["file_label"] = entry_label(entry)
+        files.append(file_plan)
+    if problems:
+        raise PreflightError(problems)
+
+    return {
+        "version": PLAN_VERSION,
+        "execution_id": execution_id,
+        "compiled_at": datetime.now().isoformat(),
+        "files": files
+    }
+
+
+def compile_run_plan_from_config(config: Dict, execution_id: str, status_mapping: Optional[Dict[str, str]] = None) -> Dict:
+    """설정만으로 실행 계획 컴파일 (실행 전 점검, 주문 시트 파싱 포함, 서버 없이 단독 실행할 때 사용)"""
+    from services.upload_manager import get_upload_manager
+
+    if status_mapping is None:
+        status_mapping = load_status_mapping()
+    return compile_checked_run_plan(config, execution_id, status_mapping, get_upload_manager().get_columns)
+
+
+def write_run_plan(plan: Dict, plan_path) -> str:
+    """실행 계획 파일 저장"""
+    with open(plan_path, 'w', encoding='utf-8') as f:
+        json.dump(plan, f, ensure_ascii=False, separators=(",", ":"))
+    return str(plan_path)
+
+
+def load_run_plan(plan_path) -> Dict:
+    """실행 계획 파일 로드"""
+    with open(plan_path, 'r', encoding='utf-8') as f:
+        plan = json.load(f)
+    if plan.get("version") != PLAN_VERSION:
+        raise ValueError(f"지원하지 않는 실행 계획 버전입니다: {plan.get('version')}")
+    return plan
@@ -0,0 +1,339 @@
+# upload_manager.py - 업로드 엑셀 파싱/검증 관리 모듈
+import re
+import json
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from services.file_lock import FileLock
+
+# 주문 시트 구조: 1행 제목, 2행 빈행, 3행 컬럼명, 4행부터 데이터 (RPA read_excel_data와 동일)
+ORDER_SHEET_NAME = "list"
+DATA_START_INDEX = 3
+
+# 일반적인 주문번호 형식 (검색 URL / 상세페이지 href에 그대로 사용되므로 공백/특수문자가 있으면 미리보기에 경고)
+ORDER_NUMBER_PATTERN = re.compile(r"^[A-Za-z0-9_-]+$")
+
+# 행 검증 결과 코드
+ISSUE_OK = ""
+ISSUE_DUPLICATE = "중복"
+ISSUE_MISSING_ORDER = "주문번호없음"
+ISSUE_INVALID_ORDER = "주문번호형식오류"
+ISSUE_MISSING_CONFIRM = "확정번호없음"
+
+# 처리 대상에서 제외하는 검증 결과 (주문번호가 없으면 검색할 수 없음)
+# 나머지(중복, 주문번호 형식, 확정번호 없음)는 미리보기에 경고만 표시하고 기존 RPA와 같이 처리 (확정번호는 로그용)
+SKIP_ISSUES = frozenset({ISSUE_MISSING_ORDER})
+
+
+def is_processable(issue: str) -> bool:
+    """검증 결과가 처리 대상인지 (경고가 있어도 주문번호가 있으면 처리)"""
+    return issue not in SKIP_ISSUES
+
+
+def normalize_cell(value) -> str:
+    """엑셀 셀 값을 문자열로 정규화 (NaN → '', 12345.0 → '12345')"""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    text = str(value).strip()
+    return "" if text == "nan" else text
+
+
+def file_content_hash(file_path) -> str:
+    """파일 내용 해시 (업로드 ID 및 중복 파싱 방지용)"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def parse_order_sheet(file_path, sheet_name: str = ORDER_SHEET_NAME) -> Dict[str, List]:
+    """
+    주문 엑셀 파일을 파싱하여 컬럼 형태로 반환
+
+    Returns:
+        {"row": [...], "order_number": [...], "confirm_number": [...], "issue": [...]}
+        row는 엑셀 기준 행 번호(4행부터), issue는 검증 결과 코드('' = 정상)
+    """
+    path = Path(file_path)
+    if path.suffix.lower() == ".csv":
+        df = pd.read_csv(path, header=None, dtype=object)
+    else:
+        df = pd.read_excel(path, sheet_name=sheet_name, header=None, dtype=object)
+
+    columns = {"row": [], "order_number": [], "confirm_number": [], "issue": []}
+    if len(df) <= DATA_START_INDEX or len(df.columns) == 0:
+        return columns
+
+    seen_orders = set()
+    second_column = df.columns[1] if len(df.columns) > 1 else None
+    order_values = df.iloc[DATA_START_INDEX:, 0].tolist()
+    confirm_values = df.iloc[DATA_START_INDEX:][second_column].tolist() if second_column is not None else [None] * len(order_values)
+
+    for offset, (order_raw, confirm_raw) in enumerate(zip(order_values, confirm_values)):
+        order_number = normalize_cell(order_raw)
+        confirm_number = normalize_cell(confirm_raw)
+
+        # 완전히 빈 행은 건너뜀
+        if not order_number and not confirm_number:
+            continue
+
+        if not order_number:
+            issue = ISSUE_MISSING_ORDER
+        elif not ORDER_NUMBER_PATTERN.match(order_number):
+            issue = ISSUE_INVALID_ORDER
+        elif order_number in seen_orders:
+            issue = ISSUE_DUPLICATE
+        elif not confirm_number:
+            issue = ISSUE_MISSING_CONFIRM
+        else:
+            issue = ISSUE_OK
+
+        if order_number:
+            seen_orders.add(order_number)
+
+        columns["row"].append(DATA_START_INDEX + offset + 1)
+        columns["order_number"].append(order_number)
+        columns["confirm_number"].append(confirm_number)
+        columns["issue"].append(issue)
+
+    return columns
+
+
+class UploadManager:
+    """업로드된 주문 엑셀 파일을 백그라운드에서 한 번만 파싱하고 결과를 캐시하는 클래스"""
+
+    PAGE_SIZE = 50
+
+    def __init__(self, upload_dir: Path):
+        """
+        업로드 매니저 초기화
+
+        Args:
+            upload_dir: 업로드 파일 저장 디렉토리 (파싱 결과는 하위 .parsed 폴더에 저장)
+        """
+        self.upload_dir = Path(upload_dir)
+        self.parsed_dir = self.upload_dir / ".parsed"
+        self.parsed_dir.mkdir(parents=True, exist_ok=True)
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="upload-parse")
+        self._lock = threading.Lock()
+        self._pending = {}  # upload_id -> Future (이 서버 프로세스에서 파싱 중인 업로드)
+        self._cache = {}  # upload_id -> sidecar dict (파싱에 성공한 결과)
+
+    def pending_count(self) -> int:
+        """파싱 대기/진행 중인 업로드 수"""
+        with self._lock:
+            return len(self._pending)
+
+    def _sidecar_path(self, upload_id: str) -> Path:
+        return self.parsed_dir / f"{upload_id}.json"
+
+    def _parse_lock(self, upload_id: str) -> FileLock:
+        """업로드별 파싱 잠금 (파싱하는 서버 프로세스가 보유 - 다른 uvicorn 워커는 잠금으로 파싱 중인지 확인)"""
+        return FileLock(self.parsed_dir / f"{upload_id}.lock")
+
+    def submit(self, file_path, sheet_name: str = ORDER_SHEET_NAME) -> str:
+        """
+        업로드 파일 파싱 작업 등록 후 업로드 ID 반환 (내용이 같으면 기존 결과 재사용, list 외 시트는 시트별 ID)
+
+        이전 파싱이 실패한 파일은 다시 파싱합니다 (일시적인 읽기 오류일 수 있음).
+        """
+        file_path = Path(file_path)
+        content_hash = file_content_hash(file_path)
+        if sheet_name != ORDER_SHEET_NAME:
+            content_hash = hashlib.sha256(f"{content_hash}|{sheet_name}".encode("utf-8")).hexdigest()
+        upload_id = content_hash[:16]
+
+        sidecar = self._load(upload_id)
+        if sidecar is not None and sidecar.get("status") != "failed":
+            return upload_id
+        with self._lock:
+            if upload_id in self._pending:
+                return upload_id
+            # 다른 uvicorn 워커가 같은 내용을 파싱 중이면 그 결과를 사용 (잠금은 파싱 작업이 끝날 때 해제)
+            parse_lock = self._parse_lock(upload_id)
+            if not parse_lock.acquire(blocking=False):
+                return upload_id
+            self._cache.pop(upload_id, None)
+            try:
+                self._pending[upload_id] = self._executor.submit(self._parse_job, upload_id, file_path, sheet_name, parse_lock)
+            except BaseException:
+                parse_lock.release()
+                raise
+
+        print(f"업로드 파싱 작업 등록: {file_path.name} [{sheet_name}] (upload_id: {upload_id})")
+        return upload_id
+
+    def _parse_job(self, upload_id: str, file_path: Path, sheet_name: str, parse_lock: FileLock):
+        """백그라운드 파싱 작업 (실패해도 대기 목록에서 제거하고 파싱 잠금 해제)"""
+        try:
+            sidecar = self._parse_sidecar(upload_id, file_path, sheet_name)
+        finally:
+            with self._lock:
+                self._pending.pop(upload_id, None)
+            parse_lock.release()
+        if sidecar["status"] == "ready":
+            print(f"업로드 파싱 완료 ({upload_id}): {sidecar['row_count']}개 행, 소요 {sidecar['parse_seconds']}초")
+
+    def _parse_sidecar(self, upload_id: str, file_path: Path, sheet_name: str) -> Dict:
+        """파싱 후 사이드카 저장 및 결과 캐시 (실패 결과도 다른 워커가 볼 수 있도록 저장, 다시 업로드/실행하면 재파싱)"""
+        started = datetime.now()
+        sidecar = {
+            "upload_id": upload_id,
+            "filename": file_path.name,
+            "sheet_name": sheet_name,
+            "path": str(file_path),
+            "parsed_at": None,
+            "parse_seconds": None,
+            "status": "ready",
+            "error": None,
+            "columns": {"row": [], "order_number": [], "confirm_number": [], "issue": []}
+        }
+        try:
+            sidecar["columns"] = parse_order_sheet(file_path, sheet_name)
+        except Exception as e:
+            sidecar["status"] = "failed"
+            sidecar["error"] = f"엑셀 파일 파싱 실패: {e}"
+            print(f"업로드 파싱 실패 ({upload_id}): {e}")
+
+        sidecar["parsed_at"] = datetime.now().isoformat()
+        sidecar["parse_seconds"] = round((datetime.now() - started).total_seconds(), 3)
+        sidecar.update(self._count_issues(sidecar["columns"]))
+
+        # 임시 파일에 쓴 뒤 교체 (읽는 쪽이 반쯤 쓰인 파일을 보지 않도록, 파싱 잠금으로 같은 업로드를 쓰는 프로세스는 1개)
+        sidecar_path = self._sidecar_path(upload_id)
+        temp_path = sidecar_path.with_suffix(".tmp")
+        saved = False
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(sidecar, f, ensure_ascii=False, separators=(",", ":"))
+            temp_path.replace(sidecar_path)
+            saved = True
+        except OSError as e:
+            print(f"업로드 파싱 결과 저장 실패 ({upload_id}, 메모리 캐시 사용): {e}")
+
+        # 실패 결과는 저장에 실패한 경우에만 메모리에 보관 (다른 워커가 다시 파싱해 성공할 수 있으므로 파일에서 확인)
+        if sidecar["status"] == "ready" or not saved:
+            with self._lock:
+                self._cache[upload_id] = sidecar
+        return sidecar
+
+    def _count_issues(self, columns: Dict[str, List]) -> Dict[str, int]:
+        """검증 결과 집계"""
+        issues = columns["issue"]
+        duplicate_count = sum(1 for issue in issues if issue == ISSUE_DUPLICATE)
+        valid_count = sum(1 for issue in issues if issue == ISSUE_OK)
+        processable_count = sum(1 for issue in issues if is_processable(issue))
+        return {
+            "row_count": len(issues),
+            "valid_count": valid_count,
+            "duplicate_count": duplicate_count,
+            "invalid_count": len(issues) - valid_count - duplicate_count,
+            "processable_count": processable_count,  # 경고가 있는 행 포함
+            "warning_count": processable_count - valid_count,
+            "skipped_count": len(issues) - processable_count
+        }
+
+    def _load(self, upload_id: str) -> Optional[Dict]:
+        """파싱 결과 로드 (메모리 캐시 → 사이드카 파일, 다른 uvicorn 워커가 파싱 중이면 parsing)"""
+        with self._lock:
+            if upload_id in self._cache:
+                return self._cache[upload_id]
+            if upload_id in self._pending:
+                return {"upload_id": upload_id, "status": "parsing"}
+
+        sidecar_path = self._sidecar_path(upload_id)
+        if not sidecar_path.exists():
+            if self._parse_lock(upload_id).is_locked_elsewhere():
+                return {"upload_id": upload_id, "status": "parsing"}
+            return None
+
+        with open(sidecar_path, "r", encoding="utf-8") as f:
+            sidecar = json.load(f)
+        if sidecar.get("status") == "ready":
+            sidecar.update(self._count_issues(sidecar["columns"]))  # 집계 항목이 바뀌기 전에 저장된 파일
+            with self._lock:
+                self._cache[upload_id] = sidecar
+        return sidecar
+
+    def get_summary(self, upload_id: str) -> Optional[Dict]:
+        """파싱 요약 정보 반환 (행 데이터 제외)"""
+        sidecar = self._load(upload_id)
+        if sidecar is None:
+            return None
+        return {key: value for key, value in sidecar.items() if key != "columns"}
+
+    def get_preview(self, upload_id: str, page: int = 1, page_size: int = PAGE_SIZE) -> Optional[Dict]:
+        """파싱된 행을 페이지 단위로 반환"""
+        sidecar = self._load(upload_id)
+        if sidecar is None:
+            return None
+
+        summary = {key: value for key, value in sidecar.items() if key != "columns"}
+        if sidecar.get("status") != "ready":
+            return {"summary": summary, "rows": [], "page": page, "page_size": page_size, "total_pages": 0}
+
+        columns = sidecar["columns"]
+        page = max(1, page)
+        page_size = max(1, min(page_size, 500))
+        total = len(columns["row"])
+        start = (page - 1) * page_size
+        end = min(start + page_size, total)
+
+        rows = [
+            {
+                "row": columns["row"][i],
+                "order_number": columns["order_number"][i],
+                "confirm_number": columns["confirm_number"][i],
+                "issue": columns["issue"][i]
+            }
+            for i in range(start, end)
+        ]
+
+        return {
+            "summary": summary,
+            "rows": rows,
+            "page": page,
+            "page_size": page_size,
+            "total_pages": (total + page_size - 1) // page_size
+        }
+
+    def get_columns(self, file_path, sheet_name: str = ORDER_SHEET_NAME) -> Dict[str, List]:
+        """파일(시트)의 파싱 결과(컬럼 형태) 반환 - 캐시가 없으면 파싱이 끝날 때까지 대기"""
+        upload_id = self.submit(file_path, sheet_name)
+        with self._lock:
+            future = self._pending.get(upload_id)
+        if future is not None:
+            future.result()
+        elif not self._sidecar_path(upload_id).exists():
+            # 다른 uvicorn 워커가 파싱 중이면 잠금이 해제될 때까지 대기
+            with self._parse_lock(upload_id):
+                pass
+
+        sidecar = self._load(upload_id)
+        if sidecar is None or sidecar.get("status") != "ready":
+            error = sidecar.get("error") if sidecar else None
+            raise Exception(error or f"엑셀 파일 파싱 결과가 없습니다: {file_path}")
+        return sidecar["columns"]
+
+# 전역 인스턴스 (스레드풀의 요청 핸들러가 동시에 처음 호출해도 하나만 생성)
+upload_manager = None
+_upload_manager_lock = threading.Lock()
+
+def get_upload_manager() -> UploadManager:
+    """업로드 매니저 인스턴스 반환"""
+    global upload_manager
+    if upload_manager is None:
+        with _upload_manager_lock:
+            if upload_manager is None:
+                current_dir = Path(__file__).parent.parent
+                upload_manager = UploadManager(current_dir / "uploads")
+    return upload_manager
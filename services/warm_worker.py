@@ -0,0 +1,114 @@
+# warm_worker.py - RPA warm worker 관리 모듈
+import os
+import sys
+import json
+import time
+import threading
+import subprocess
+from pathlib import Path
+from typing import Dict, Optional
+
+from services.file_lock import FileLock
+
+class WarmWorkerPool:
+    """무거운 모듈을 미리 import 한 RPA 워커 프로세스를 1개 대기시켜 두는 클래스"""
+
+    def __init__(self, project_root: Path, enabled: bool = True, owner_lock_path: Optional[Path] = None):
+        """
+        워커 풀 초기화
+
+        Args:
+            project_root: 프로젝트 루트 (워커 실행 디렉토리)
+            enabled: False이면 실행할 때마다 새 워커를 생성 (cold start)
+            owner_lock_path: 서버 프로세스 간 소유 잠금 파일 - 잠금을 얻은 서버 프로세스만 워커를 대기시킴
+                (uvicorn 워커 수만큼 대기 프로세스가 생기지 않도록, 다른 프로세스는 cold start)
+        """
+        self.project_root = Path(project_root)
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._worker = None  # {"process": Popen, "spawned_at": float}
+        self._owner_lock = FileLock(owner_lock_path) if owner_lock_path else None
+        self._owner = owner_lock_path is None
+
+    def _is_owner(self) -> bool:
+        """이 서버 프로세스가 워커를 대기시키는지 (소유 프로세스가 종료되었으면 다음 확인에서 넘겨받음)"""
+        if not self._owner:
+            self._owner = self._owner_lock.acquire(blocking=False)
+        return self._owner
+
+    def _spawn(self) -> Dict:
+        """워커 프로세스 생성 (표준입력으로 작업 대기)"""
+        process = subprocess.Popen(
+            [sys.executable, "-m", "rpa.worker"],
+            stdin=subprocess.PIPE,
+            stdout=None,  # 실시간 출력
+            stderr=None,  # 실시간 출력
+            text=True,
+            cwd=str(self.project_root),
+            env=os.environ.copy()
+        )
+        return {"process": process, "spawned_at": time.time()}
+
+    def _ensure_ready(self):
+        """대기 중인 워커가 없거나 종료되었으면 새로 생성"""
+        with self._lock:
+            if self._worker is None or self._worker["process"].poll() is not None:
+                self._worker = self._spawn()
+                print(f"warm worker 준비: PID {self._worker['process'].pid}")
+
+    def is_ready(self) -> bool:
+        """작업을 기다리는 워커가 있는지 여부"""
+        with self._lock:
+            return self._worker is not None and self._worker["process"].poll() is None
+
+    def prespawn(self):
+        """백그라운드에서 다음 실행용 워커 준비 (소유 프로세스에서만)"""
+        if self.enabled and self._is_owner():
+            threading.Thread(target=self._ensure_ready, daemon=True).start()
+
+    def launch(self, env: Dict[str, str], stats_path: Optional[str] = None) -> subprocess.Popen:
+        """
+        실행 작업을 워커에 전달하고 프로세스 반환
+
+        대기 중인 워커가 있으면 재사용하고, 없으면 새로 생성합니다.
+
+        Args:
+            env: 실행별 환경변수 (CONFIG_FILE_PATH, RUN_PLAN_PATH, EXECUTION_ID 등)
+            stats_path: 워커가 시작 비용 통계를 기록할 파일 경로
+        """
+        with self._lock:
+            worker = self._worker
+            self._worker = None
+
+        if worker is None or worker["process"].poll() is not None:
+            worker = self._spawn()
+
+        job = {
+            "env": env,
+            "stats_path": stats_path,
+            "spawned_at": worker["spawned_at"],
+            "sent_at": time.time()
+        }
+        process = worker["process"]
+        process.stdin.write(json.dumps(job, ensure_ascii=False) + "\n")
+        process.stdin.flush()
+        process.stdin.close()
+
+        # 다음 실행을 위해 새 워커 미리 준비
+        self.prespawn()
+        return process
+
+    def shutdown(self):
+        """대기 중인 워커 종료 (표준입력을 닫으면 작업 없이 종료됨)"""
+        with self._lock:
+            worker = self._worker
+            self._worker = None
+        if worker is not None and worker["process"].poll() is None:
+            try:
+                worker["process"].stdin.close()
+                worker["process"].wait(timeout=5)
+            except Exception:
+                worker["process"].kill()
+        if self._owner_lock is not None and self._owner:
+            self._owner = False
+            self._owner_lock.release()
@@ -1,54 +1,216 @@
 # sync_master_data.py - 공통 데이터 동기화 스크립트
+# 동기화 설정(master_data_sync.json)의 원본 master_data.xlsx를 대상 프로젝트들에 복사합니다.
+# - 내용 해시(SHA-256)가 원본과 같은 대상은 건너뜁니다
+# - 변경된 대상만 병렬로 복사하며, 임시 파일에 쓴 뒤 이름 바꾸기로 교체합니다 (읽는 쪽에서 반쯤 쓰인 파일을 보지 않음)
+# - --watch: 원본이 바뀔 때마다 다시 동기화 (원본이 없거나 잠겨 동기화에 실패하면 다음 확인 때 다시 시도)
+#
+# 사용법:
+#   python sync_master_data.py                          # master_data_sync.json 기준 1회 동기화
+#   python sync_master_data.py --manifest 경로.json --watch
+#   python sync_master_data.py --force                  # 해시 비교 없이 모두 복사
+import os
+import sys
+import json
+import time
 import shutil
+import hashlib
+import argparse
+import tempfile
 from pathlib import Path
-import os
+from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_MANIFEST = Path(__file__).parent / "master_data_sync.json"
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def load_manifest(manifest_path: Path) -> Dict:
+    """동기화 설정 로드 (상대 경로는 설정 파일 위치 기준)"""
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    base_dir = manifest_path.parent
+
+    def resolve(path_str):
+        path = Path(path_str)
+        return path if path.is_absolute() else (base_dir / path).resolve()
+
+    return {
+        "source": resolve(manifest["source"]),
+        "targets": [{"name": target.get("name", target["path"]), "path": resolve(target["path"])} for target in manifest.get("targets", [])],
+        "max_workers": int(manifest.get("max_workers", 4)),
+        "watch_interval": float(manifest.get("watch_interval", 2.0))
+    }
+
+
+def file_hash(path: Path) -> str:
+    """파일 내용 SHA-256"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
 
-def sync_master_data():
-    """모든 프로젝트에 master_data.xlsx 동기화"""
-    
-    # 소스 파일 경로
-    source_file = Path("C:/Users/윤성균/Documents/python_study/통합관리시스템_v2.0/data/master_data.xlsx")
-    
-    # 대상 프로젝트 목록
-    projects = [
-        "admin_예약확정처리_v2.0",
-        "취소일괄처리_v2.0", 
-        "CX클레임처리_v2.0",
-        "admin_예약상태변경_v2.0",
-        "admin_b2b채널타입변경_v2.0"
-    ]
-    
-    print("🔄 공통 데이터 동기화 시작...")
-    print(f"📁 소스 파일: {source_file}")
-    print("=" * 50)
-    
-    success_count = 0
-    error_count = 0
-    
-    for project in projects:
+
+def is_up_to_date(source: Path, source_size: int, source_hash: str, dest: Path) -> bool:
+    """대상 파일이 원본과 같은 내용인지 확인 (크기가 다르면 해시 계산 생략)"""
+    if not dest.exists() or dest.stat().st_size != source_size:
+        return False
+    return file_hash(dest) == source_hash
+
+
+def atomic_copy(source: Path, dest: Path):
+    """같은 폴더의 임시 파일에 복사한 뒤 이름 바꾸기로 교체"""
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(prefix=f".{dest.name}.", suffix=".tmp", dir=str(dest.parent))
+    try:
+        with os.fdopen(fd, 'wb') as temp_file, open(source, 'rb') as source_file:
+            shutil.copyfileobj(source_file, temp_file, HASH_CHUNK_SIZE)
+            temp_file.flush()
+            os.fsync(temp_file.fileno())
+        shutil.copystat(source, temp_path)
+        os.replace(temp_path, dest)
+    except BaseException:
         try:
-            # 대상 경로 설정
-            dest_path = Path(f"C:/Users/윤성균/Documents/python_study/{project}/data/master_data.xlsx")
-            
-            # 대상 디렉토리가 없으면 생성
-            dest_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            # 파일 복사
-            shutil.copy2(source_file, dest_path)
-            print(f"✅ 복사 완료: {project}")
-            success_count += 1
-            
-        except Exception as e:
-            print(f"❌ 복사 실패: {project} - {e}")
-            error_count += 1
-    
-    print("=" * 50)
-    print(f"📊 동기화 완료: 성공 {success_count}개, 실패 {error_count}개")
-    
-    if error_count == 0:
-        print("🎉 모든 프로젝트에 공통 데이터가 성공적으로 동기화되었습니다!")
-    else:
-        print("⚠️ 일부 프로젝트 동기화에 실패했습니다. 오류를 확인해주세요.")
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def sync_target(source: Path, source_size: int, source_hash: str, target: Dict, force: bool = False) -> Dict:
+    """대상 1개 동기화 → {"name", "path", "status": copied/skipped/failed, "seconds", "error"}"""
+    started = time.perf_counter()
+    result = {"name": target["name"], "path": str(target["path"]), "status": "skipped", "error": None}
+    try:
+        if force or not is_up_to_date(source, source_size, source_hash, target["path"]):
+            atomic_copy(source, target["path"])
+            result["status"] = "copied"
+    except Exception as e:
+        result["status"] = "failed"
+        result["error"] = str(e)
+    result["seconds"] = round(time.perf_counter() - started, 3)
+    return result
+
+
+def sync_master_data(manifest_path: Optional[Path] = None, force: bool = False, quiet: bool = False) -> Dict:
+    """
+    모든 대상 프로젝트에 master_data.xlsx 동기화
+
+    Returns:
+        {"source", "source_hash", "copied", "skipped", "failed", "seconds", "targets": [대상별 결과]}
+    """
+    manifest = load_manifest(Path(manifest_path or DEFAULT_MANIFEST))
+    source = manifest["source"]
+    targets = manifest["targets"]
+
+    if not quiet:
+        print("🔄 공통 데이터 동기화 시작...")
+        print(f"📁 소스 파일: {source}")
+        print("=" * 50)
+
+    started = time.perf_counter()
+    source_size = source.stat().st_size
+    source_hash = file_hash(source)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(manifest["max_workers"], len(targets) or 1))) as pool:
+        results: List[Dict] = list(pool.map(lambda target: sync_target(source, source_size, source_hash, target, force), targets))
+
+    report = {
+        "source": str(source),
+        "source_hash": source_hash,
+        "copied": sum(1 for r in results if r["status"] == "copied"),
+        "skipped": sum(1 for r in results if r["status"] == "skipped"),
+        "failed": sum(1 for r in results if r["status"] == "failed"),
+        "seconds": round(time.perf_counter() - started, 3),
+        "targets": results
+    }
+
+    if not quiet:
+        icons = {"copied": "✅ 복사 완료", "skipped": "⏭️ 변경 없음", "failed": "❌ 복사 실패"}
+        for r in results:
+            error = f" - {r['error']}" if r["error"] else ""
+            print(f"{icons[r['status']]}: {r['name']} ({r['seconds']:.3f}초){error}")
+        print("=" * 50)
+        print(f"📊 동기화 완료: 복사 {report['copied']}개, 건너뜀 {report['skipped']}개, 실패 {report['failed']}개 ({report['seconds']:.3f}초)")
+        if report["failed"] == 0:
+            print("🎉 모든 프로젝트의 공통 데이터가 최신 상태입니다!")
+        else:
+            print("⚠️ 일부 프로젝트 동기화에 실패했습니다. 오류를 확인해주세요.")
+
+    return report
+
+
+def _watch_sync(manifest_path: Optional[Path]) -> Optional[Dict]:
+    """감시 중 동기화 1회 (원본이 없거나 잠겨 있거나 교체 중이면 오류를 출력하고 None)"""
+    try:
+        return sync_master_data(manifest_path)
+    except Exception as e:
+        print(f"❌ 동기화 실패 (다음 확인 때 다시 시도): {e}")
+        return None
+
+
+def watch(manifest_path: Optional[Path] = None, interval: Optional[float] = None):
+    """원본 파일의 크기/수정 시각을 주기적으로 확인하고, 바뀌면 다시 동기화 (Ctrl+C로 종료)"""
+    manifest = load_manifest(Path(manifest_path or DEFAULT_MANIFEST))
+    interval = interval or manifest["watch_interval"]
+    source = manifest["source"]
+
+    report = _watch_sync(manifest_path)
+    last_signature = None
+    if report is not None:
+        try:
+            stat = source.stat()
+            last_signature = (stat.st_size, stat.st_mtime_ns)
+        except OSError:
+            pass
+    print(f"👀 변경 감시 중 ({interval}초 간격): {source}")
+
+    try:
+        while True:
+            time.sleep(interval)
+            try:
+                stat = source.stat()
+            except OSError:
+                continue  # 원본 교체 중
+            signature = (stat.st_size, stat.st_mtime_ns)
+            if signature == last_signature:
+                continue
+            # 수정 시각만 바뀐 경우는 해시 비교에서 모두 건너뜀
+            result = _watch_sync(manifest_path)
+            if result is None:
+                continue  # 원본이 그대로여도 다음 확인 때 다시 동기화
+            report = result
+            last_signature = signature
+    except KeyboardInterrupt:
+        print("동기화 감시를 종료합니다.")
+    return report
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="master_data.xlsx 공통 데이터 동기화")
+    parser.add_argument("--manifest", default=str(DEFAULT_MANIFEST), help="동기화 설정 파일 (기본: master_data_sync.json)")
+    parser.add_argument("--force", action="store_true", help="해시 비교 없이 모든 대상 복사")
+    parser.add_argument("--watch", action="store_true", help="원본이 바뀔 때마다 다시 동기화")
+    parser.add_argument("--interval", type=float, default=None, help="감시 간격 (초, 기본: 설정의 watch_interval)")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args()
+
+    manifest_path = Path(args.manifest)
+    if not manifest_path.exists():
+        print(f"❌ 동기화 설정 파일이 없습니다: {manifest_path}")
+        print("   master_data_sync.example.json을 복사하여 master_data_sync.json을 만들어주세요.")
+        return 1
+
+    if args.watch:
+        watch(manifest_path, args.interval)
+        return 0
+
+    report = sync_master_data(manifest_path, force=args.force, quiet=args.json)
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    return 1 if report["failed"] else 0
+
 
 if __name__ == "__main__":
-    sync_master_data()
+    sys.exit(main())
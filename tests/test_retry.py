@@ -0,0 +1,72 @@
+# test_retry.py - rpa/retry.py 실패 분류 및 재시도 큐 테스트
+import time
+
+from selenium.common.exceptions import (
+    InvalidSelectorException,
+    InvalidSessionIdException,
+    NoAlertPresentException,
+    NoSuchElementException,
+    TimeoutException,
+)
+
+from rpa.retry import (
+    PERMANENT, STAGE_LMS, STAGE_ORDER, TRANSIENT,
+    LmsUnconfirmedError, RetryPolicy, RetryQueue, TransientPageError, classify_exception,
+)
+
+
+def test_classify_transient_webdriver_errors():
+    assert classify_exception(TimeoutException()) == TRANSIENT
+    assert classify_exception(NoSuchElementException()) == TRANSIENT
+    assert classify_exception(NoAlertPresentException()) == TRANSIENT
+    assert classify_exception(TransientPageError("503")) == TRANSIENT
+
+
+def test_classify_permanent_errors():
+    assert classify_exception(None) == PERMANENT
+    assert classify_exception(InvalidSelectorException()) == PERMANENT
+    assert classify_exception(InvalidSessionIdException()) == PERMANENT
+    assert classify_exception(ValueError("bad")) == PERMANENT
+
+
+def test_lms_unconfirmed_is_never_retried():
+    assert classify_exception(LmsUnconfirmedError("알럿1 확인 후 실패")) == PERMANENT
+
+
+def test_policy_backoff_and_attempts():
+    policy = RetryPolicy(max_attempts=3, base_delay=5, max_delay=12, multiplier=2)
+    assert [policy.delay(attempt) for attempt in (1, 2, 3)] == [5, 10, 12]
+    assert policy.can_retry(2)
+    assert not policy.can_retry(3)
+
+
+def test_queue_orders_by_ready_time():
+    queue = RetryQueue(RetryPolicy(base_delay=0, max_delay=0))
+    queue.defer({"order_number": "1"}, 1, STAGE_ORDER, "검색오류")
+    queue.defer({"order_number": "2"}, 1, STAGE_LMS, "실패", last_result=("confirm", "실패"))
+    assert len(queue) == 2
+    first = queue.pop()
+    assert first["order"]["order_number"] == "1" and first["stage"] == STAGE_ORDER
+    second = queue.pop_ready()
+    assert second["order"]["order_number"] == "2" and second["last_result"] == ("confirm", "실패")
+    assert queue.pop_ready() is None
+    assert queue.next_ready_in() is None
+
+
+def test_queue_waits_for_backoff_and_cancel_keeps_item():
+    queue = RetryQueue(RetryPolicy(base_delay=30))
+    queue.defer({"order_number": "1"}, 1, STAGE_ORDER, "검색오류")
+    assert queue.pop_ready() is None
+    assert 29 < queue.next_ready_in() <= 30
+    assert queue.pop(cancel=lambda: True) is None
+    assert len(queue) == 1
+    assert [item["order"]["order_number"] for item in queue.drain()] == ["1"]
+    assert len(queue) == 0
+
+
+def test_queue_pop_sleeps_until_ready():
+    queue = RetryQueue(RetryPolicy(base_delay=0.2))
+    queue.defer({"order_number": "1"}, 1, STAGE_ORDER, "검색오류")
+    started = time.monotonic()
+    assert queue.pop()["order"]["order_number"] == "1"
+    assert time.monotonic() - started >= 0.15